@@ -5,7 +5,7 @@ from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import *
 # from qtpy import QtWidgets
 from search import *
-from PyQt5.QtCore import QDateTime, QPropertyAnimation, QEasingCurve, QUrl, QTimer
+from PyQt5.QtCore import QDateTime, QPropertyAnimation, QEasingCurve, QUrl, QTimer, pyqtSignal
 
 class AddSubSystemReqClass(QDialog):
     def __init__(self, parent=None):
@@ -36,6 +36,8 @@ class AddSubSystemReqClass(QDialog):
 
 
 class AddControlClass(QWidget):
+    controls_updated = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
@@ -109,6 +111,7 @@ class AddControlClass(QWidget):
             item = QTreeWidgetItem([parent_text, self.combo_box.currentText()])
             self.tree.addTopLevelItem(item)
             self.parent_text_line_edit.clear()
+            self.controls_updated.emit()
         self.control_list_widget.hide()
         self.control_hide_timer.stop()
 
@@ -120,7 +123,7 @@ class AddControlClass(QWidget):
 
         if line_edit_type == "control":
             results = search_documents(search_terms, control_inverted_index, control_documents)
-            highlighted_results = rank_and_highlight(results, search_terms, control_documents, scores)
+            highlighted_results = rank_and_highlight(results, control_documents, scores)
 
         list_widget.clear()
         if not highlighted_results:
@@ -135,12 +138,14 @@ class AddControlClass(QWidget):
             item = QTreeWidgetItem([parent_text, self.combo_box.currentText()])
             self.tree.addTopLevelItem(item)
             self.parent_text_line_edit.clear()
+            self.controls_updated.emit()
 
     def add_child_or_edit_type(self, item, column):
         if column == 1:
             dialog = AddSubSystemReqClass(self)
             if dialog.exec_():
                 item.setText(1, dialog.get_child_info()[1])
+                self.controls_updated.emit()
         else:
             dialog = AddSubSystemReqClass(self)
             if dialog.exec_():
@@ -148,4 +153,29 @@ class AddControlClass(QWidget):
                 child = QTreeWidgetItem([child_text, child_type])
                 item.addChild(child)
                 item.setExpanded(True)
-
+                self.controls_updated.emit()
+
+
+    def get_controls(self):
+        """Get the control tree as a list of {text, type, children} dicts"""
+        controls = []
+        root = self.tree.invisibleRootItem()
+        for i in range(root.childCount()):
+            item = root.child(i)
+            controls.append({
+                'text': item.text(0),
+                'type': item.text(1),
+                'children': [{'text': item.child(j).text(0), 'type': item.child(j).text(1)}
+                             for j in range(item.childCount())]
+            })
+        return controls
+
+    def set_controls(self, controls):
+        """Rebuild the control tree from a list of {text, type, children} dicts"""
+        self.tree.clear()
+        for control_data in controls:
+            parent_item = QTreeWidgetItem([control_data.get('text', ''), control_data.get('type', '')])
+            self.tree.addTopLevelItem(parent_item)
+            for child_data in control_data.get('children', []):
+                parent_item.addChild(QTreeWidgetItem([child_data.get('text', ''), child_data.get('type', '')]))
+            parent_item.setExpanded(True)
@@ -1,9 +1,11 @@
+import os
 import sys
 import requests
 import re
 import json
 import time
 import random
+from functools import lru_cache
 from PyQt5.QtGui import QColor, QIcon
 from PyQt5.QtCore import QThread, pyqtSignal, QTimer
 from PyQt5.QtWidgets import (
@@ -12,18 +14,31 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QFont
 
-# Read the API key from the file
-with open('Gemini_API.txt', 'r') as file:
-    API_KEY = file.read().strip()
+CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
+API_KEY_FILE = os.path.join(CURRENT_DIR, 'Gemini_API.txt')
+MODELS_URL = "https://generativelanguage.googleapis.com/v1beta/models"
 
 # Multiple endpoints to try
-ENDPOINTS = [
-    f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={API_KEY}",
-    f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={API_KEY}",
-    f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={API_KEY}"
-]
+ENDPOINT_MODELS = ["gemini-1.5-flash-latest", "gemini-1.5-flash-latest", "gemini-1.5-flash"]
 
-TEST_URL = f"https://generativelanguage.googleapis.com/v1beta/models?key={API_KEY}"
+
+@lru_cache(maxsize=1)
+def get_api_key():
+    """Read the API key from the file on first use rather than at import"""
+    try:
+        with open(API_KEY_FILE, 'r') as file:
+            return file.read().strip()
+    except OSError as e:
+        print(f"❌ Error reading {API_KEY_FILE}: {e}")
+        return ""
+
+
+def get_endpoints():
+    return [f"{MODELS_URL}/{model}:generateContent?key={get_api_key()}" for model in ENDPOINT_MODELS]
+
+
+def get_test_url():
+    return f"{MODELS_URL}?key={get_api_key()}"
 
 
 def markdown_to_html(text):
@@ -81,6 +96,7 @@ class ConnectionTestWorker(QThread):
 
     def run(self):
         details = {}
+        endpoints = get_endpoints()
         
         try:
             # Test 1: Basic internet
@@ -96,7 +112,7 @@ class ConnectionTestWorker(QThread):
             # Test 2: Gemini API models endpoint
             start_time = time.time()
             headers = {"Content-Type": "application/json"}
-            response = requests.get(TEST_URL, headers=headers, timeout=15)
+            response = requests.get(get_test_url(), headers=headers, timeout=15)
             details['gemini_models_latency'] = f"{(time.time() - start_time):.2f}s"
             details['gemini_models_status'] = response.status_code
             
@@ -124,18 +140,18 @@ class ConnectionTestWorker(QThread):
                             "contents": [{"parts": [{"text": "Hi"}]}],
                             "generationConfig": {"maxOutputTokens": 5}
                         }
-                        endpoint = ENDPOINTS[0]
+                        endpoint = endpoints[0]
                     elif i == 1:
                         # Different model
                         test_data = {
                             "contents": [{"parts": [{"text": "Hello"}]}],
                             "generationConfig": {"maxOutputTokens": 10, "temperature": 0.1}
                         }
-                        endpoint = ENDPOINTS[1] if len(ENDPOINTS) > 1 else ENDPOINTS[0]
+                        endpoint = endpoints[1] if len(endpoints) > 1 else endpoints[0]
                     else:
                         # Ultra minimal
                         test_data = {"contents": [{"parts": [{"text": "?"}]}]}
-                        endpoint = ENDPOINTS[0]
+                        endpoint = endpoints[0]
                     
                     test_response = requests.post(
                         endpoint,
@@ -194,6 +210,7 @@ class BulletproofGeminiWorker(QThread):
         self.should_stop = True
 
     def run(self):
+        endpoints = get_endpoints()
         # Strategy 1: Try all endpoints with exponential backoff for 503 errors
         for attempt in range(3):  # 3 main attempts
             if self.should_stop:
@@ -201,11 +218,11 @@ class BulletproofGeminiWorker(QThread):
                 
             self.progress.emit(f"Attempt {attempt + 1}/3")
             
-            for endpoint_idx, endpoint in enumerate(ENDPOINTS):
+            for endpoint_idx, endpoint in enumerate(endpoints):
                 if self.should_stop:
                     return
                     
-                self.debug.emit(f"🔄 Trying endpoint {endpoint_idx + 1}/{len(ENDPOINTS)}")
+                self.debug.emit(f"🔄 Trying endpoint {endpoint_idx + 1}/{len(endpoints)}")
                 
                 # Try different request configurations
                 configs = [
@@ -335,7 +352,7 @@ class ChatDialog(QDialog):
     def __init__(self, existing_history=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("EzChat")
-        self.setWindowIcon(QIcon("UI/icons/ezz.png"))
+        self.setWindowIcon(QIcon(os.path.join(CURRENT_DIR, "UI", "icons", "ezz.png")))
         self.setMinimumSize(700, 800)
         self.setStyleSheet("""
             QDialog {
@@ -38,10 +38,14 @@ from filter_dialog import FilterDialog
 from pdf_dialog import PDFDialog
 from DeviceSelection import DeviceSelected
 from database_manager import DatabaseManager
+from risk_storage import DATABASE_DIR
+from rpn_matrix import MATRIX_DIR, get_matrix_file
+from risk_store import Risk, RiskStore
 from user_input_dialog import UserInputDialog
 from sequence_widget import SequenceEventWidget
 from ControlAndRequirement import AddControlClass
 from risk_history_dialog import RiskHistoryDialog
+from risk_history import RiskHistoryLog
 from notification_dialog import NotificationDialog
 from traceability_dialog import TraceabilityDialog
 from Gemini_app import ChatDialog as GeminiChatDialog
@@ -54,7 +58,7 @@ from hazardous_situation_dialog import HazardousSituationDialog
 
 
 CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
-MainUI, _ = loadUiType('UI/mainWindowui.ui')
+MainUI, _ = loadUiType(os.path.join(CURRENT_DIR, 'UI', 'mainWindowui.ui'))
 
 class RiskSystem(QMainWindow, MainUI):
     def __init__(self):
@@ -62,15 +66,14 @@ class RiskSystem(QMainWindow, MainUI):
         self.setupUi(self)
         self.setGeometry(0, 0, 1900, 950)
         self.setWindowTitle("Risk Management System")   
-        self.setWindowIcon(QIcon("UI/icons/ezz.png"))
+        self.setWindowIcon(QIcon(os.path.join(CURRENT_DIR, "UI", "icons", "ezz.png")))
         
         # Initialize database manager
         self.db_manager = DatabaseManager()
         
-        # Initialize risk history storage
-        self.risk_history = {}  # Store history for each row
-        self.history_file = 'Database/risk_history.json'
-        self.load_risk_history()
+        # Initialize risk history storage, shared with the main window
+        self.risk_history = RiskHistoryLog(os.path.join(DATABASE_DIR, 'risk_history.db'),
+                                           os.path.join(DATABASE_DIR, 'risk_history.json'))
         
         # Store original table data for filtering
         self.original_table_data = []
@@ -141,7 +144,7 @@ class RiskSystem(QMainWindow, MainUI):
         self.num_unapproved_risks = 0
         self.num_rejected_risks = 0
 
-        self.matrix_file = 'Risk Matrix/matrix_state.json'
+        self.matrix_file = os.path.join(MATRIX_DIR, 'matrix_state.json')
 
         # Timer to update notification count periodically
         self.notification_timer = QTimer()
@@ -232,9 +235,6 @@ class RiskSystem(QMainWindow, MainUI):
                 self.us_counter, self.test_counter
             )
             
-            # Save risk history
-            self.save_risk_history()
-            
             return True
             
         except Exception as e:
@@ -261,25 +261,6 @@ class RiskSystem(QMainWindow, MainUI):
         else:  # Cancel
             event.ignore()
 
-    def load_risk_history(self):
-        """Load risk history from file"""
-        try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r') as f:
-                    self.risk_history = json.load(f)
-        except Exception as e:
-            print(f"Error loading risk history: {e}")
-            self.risk_history = {}
-
-    def save_risk_history(self):
-        """Save risk history to file"""
-        try:
-            os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
-            with open(self.history_file, 'w') as f:
-                json.dump(self.risk_history, f, indent=2)
-        except Exception as e:
-            print(f"Error saving risk history: {e}")
-
     def get_user_name_for_edit(self):
         """Get user name for edit tracking"""
         dialog = UserInputDialog(self, "Edit Confirmation", "Please enter your name to confirm this edit:")
@@ -296,36 +277,18 @@ class RiskSystem(QMainWindow, MainUI):
 
     def record_initial_risk_creation(self, risk_id, user_name, field_data):
         """Record all initial field values for a new risk with the same user name"""
-        if risk_id not in self.risk_history:
-            self.risk_history[risk_id] = []
-
-        # Record creation entry
-        creation_entry = {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'user': user_name,
-            'field': 'Risk Created',
-            'previous_value': '',
-            'new_value': 'New risk entry created'
-        }
-        self.risk_history[risk_id].append(creation_entry)
-
-        # Record all initial field values with the same user name
         field_names = [
             "Date", "Risk No.", "Department", "Device Affected", "Components", "Lifecycle", 
             "Hazard Category", "Hazard Source", "Hazardous Situation", "Sequence of Events", 
             "Harm Influenced", "Harm Description", "Severity", "Probability", "RPN"
         ]
 
-        for i, field_name in enumerate(field_names):
-            if i < len(field_data) and field_data[i]:
-                field_entry = {
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'user': user_name,
-                    'field': field_name,
-                    'previous_value': '',
-                    'new_value': str(field_data[i])
-                }
-                self.risk_history[risk_id].append(field_entry)
+        # The creation entry and every initial field value are written together, with one timestamp
+        with self.risk_history.transaction():
+            self.risk_history.record(risk_id, user_name, 'Risk Created', '', 'New risk entry created')
+            for i, field_name in enumerate(field_names):
+                if i < len(field_data) and field_data[i]:
+                    self.risk_history.record(risk_id, user_name, field_name, '', str(field_data[i]))
 
     def record_edit_history(self, row, column, previous_value, new_value, user_name):
         """Record edit history for a cell"""
@@ -333,22 +296,10 @@ class RiskSystem(QMainWindow, MainUI):
         if not risk_id:
             return
 
-        if risk_id not in self.risk_history:
-            self.risk_history[risk_id] = []
-
         # Get field name from column header
         field_name = self.table_widget.horizontalHeaderItem(column).text()
 
-        history_entry = {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'user': user_name,
-            'field': field_name,
-            'previous_value': previous_value,
-            'new_value': new_value
-        }
-
-        self.risk_history[risk_id].append(history_entry)
-        self.save_risk_history()
+        self.risk_history.record(risk_id, user_name, field_name, previous_value, new_value)
 
     def get_risk_id_for_row(self, row):
         """Get risk ID for a given row"""
@@ -357,6 +308,17 @@ class RiskSystem(QMainWindow, MainUI):
             return risk_no_item.text()
         return None
 
+    @property
+    def risk_store(self):
+        """Snapshot of the table as a RiskStore, for the dialogs shared with the main window
+
+        Every access scrapes the whole table, so callers read it once per refresh.
+        """
+        store = RiskStore()
+        store.set_risks(Risk.from_record(self.db_manager.build_risk_data(self.table_widget, row))
+                        for row in range(self.table_widget.rowCount()))
+        return store
+
     def show_risk_history(self, row):
         """Show history dialog for a specific risk"""
         risk_id = self.get_risk_id_for_row(row)
@@ -364,8 +326,7 @@ class RiskSystem(QMainWindow, MainUI):
             QMessageBox.information(self, "No History", "No risk ID found for this row.")
             return
 
-        history_data = self.risk_history.get(risk_id, [])
-        dialog = RiskHistoryDialog(risk_id, history_data, self)
+        dialog = RiskHistoryDialog(risk_id, self.risk_history, self)
         dialog.exec_()
 
     def apply_single_filter(self, filter_type, filter_value):
@@ -753,9 +714,6 @@ class RiskSystem(QMainWindow, MainUI):
         self.generate_and_set_id()
         self.update_rsk_number_combo()
         self.update_notification_count()
-        
-        # Save the history after adding the entry
-        self.save_risk_history()
 
         # Auto-save to database after adding new risk
         self.save_data_to_database()
@@ -811,18 +769,7 @@ class RiskSystem(QMainWindow, MainUI):
             # Record without asking for user name
             risk_id = self.get_risk_id_for_row(row)
             if risk_id:
-                history_entry = {
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'user': 'Mahmoud',  # Use 'System' for approval changes
-                    'field': field_name,
-                    'previous_value': previous_value,
-                    'new_value': new_value
-                }
-                
-                if risk_id not in self.risk_history:
-                    self.risk_history[risk_id] = []
-                self.risk_history[risk_id].append(history_entry)
-                self.save_risk_history()
+                self.risk_history.record(risk_id, 'Mahmoud', field_name, previous_value, new_value)
             
             # Handle highlighting
             if new_value:
@@ -882,15 +829,12 @@ class RiskSystem(QMainWindow, MainUI):
 
         if field_type == "Sequence of Event":
             if add_new_document(sequence_of_event_documents, content, SEQUENCE_FILE, field_type):
-                refresh_indices()
                 print(f"Added new sequence of event: {content}")
         elif field_type == "Hazardous Situation":
             if add_new_document(hazardous_situation_documents, content, HAZARDOUS_FILE, field_type):
-                refresh_indices()
                 print(f"Added new hazardous situation: {content}")
         elif field_type == "Harm Description":
             if add_new_document(harm_description_documents, content, HARM_FILE, field_type):
-                refresh_indices()
                 print(f"Added new harm description: {content}")
 
     def load_selected_webpage(self, selected_text):
@@ -1264,15 +1208,15 @@ class RiskSystem(QMainWindow, MainUI):
             return
         if line_edit_type == "harm_desc":
             results = search_documents(search_terms, harm_description_inverted_index, harm_description_documents)
-            highlighted_results = rank_and_highlight(results, search_terms, harm_description_documents, scores)
+            highlighted_results = rank_and_highlight(results, harm_description_documents, scores)
 
         elif line_edit_type == "sequence":
             results = search_documents(search_terms, sequence_of_event_inverted_index, sequence_of_event_documents)
-            highlighted_results = rank_and_highlight(results, search_terms, sequence_of_event_documents, scores)
+            highlighted_results = rank_and_highlight(results, sequence_of_event_documents, scores)
 
         elif line_edit_type == "situation":
             results = search_documents(search_terms, hazardous_situation_inverted_index, hazardous_situation_documents)
-            highlighted_results = rank_and_highlight(results, search_terms, hazardous_situation_documents, scores)
+            highlighted_results = rank_and_highlight(results, hazardous_situation_documents, scores)
 
         list_widget.clear()
         if not highlighted_results:
@@ -1430,9 +1374,8 @@ class RiskSystem(QMainWindow, MainUI):
             self.num_risks -= 1
             
             # Remove from risk history
-            if risk_id and risk_id in self.risk_history:
-                del self.risk_history[risk_id]
-                self.save_risk_history()
+            if risk_id:
+                self.risk_history.delete_history(risk_id)
             
             # Auto-save after removal
             self.save_data_to_database()
@@ -1863,7 +1806,7 @@ class RiskSystem(QMainWindow, MainUI):
     
     def get_rpn_from_matrix(self, device, severity, probability):
         """Get RPN from device-specific matrix"""
-        matrix_file = os.path.join('Risk Matrix', f"{device.replace(' ', '_')}_matrix.json")
+        matrix_file = get_matrix_file(device)
         
         try:
             if os.path.exists(matrix_file):
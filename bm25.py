@@ -0,0 +1,54 @@
+import math
+from collections import Counter, defaultdict
+
+# Standard Okapi BM25 parameters: term frequency saturation and document length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+class Bm25Stats:
+    """Term frequencies and document lengths of an inverted index, for BM25 scoring"""
+
+    def __init__(self, inverted_index=None):
+        self.term_frequencies = defaultdict(Counter)  # term -> {doc_id: occurrences}
+        self.doc_lengths = Counter()  # doc_id -> number of tokens
+        self.total_length = 0
+        # The inverted index lists a document once per occurrence of a term
+        for term, doc_ids in (inverted_index or {}).items():
+            for doc_id, count in Counter(doc_ids).items():
+                self.term_frequencies[term][doc_id] += count
+                self.doc_lengths[doc_id] += count
+                self.total_length += count
+
+    def add_document(self, doc_id, tokens):
+        for term, count in Counter(tokens).items():
+            self.term_frequencies[term][doc_id] += count
+        self.doc_lengths[doc_id] += len(tokens)
+        self.total_length += len(tokens)
+
+    def remove_document(self, doc_id, tokens):
+        for term in set(tokens):
+            frequencies = self.term_frequencies.get(term)
+            if frequencies is not None:
+                frequencies.pop(doc_id, None)
+                if not frequencies:
+                    del self.term_frequencies[term]
+        self.total_length -= self.doc_lengths.pop(doc_id, 0)
+
+    def get_idf(self, term):
+        doc_count = len(self.doc_lengths)
+        document_frequency = len(self.term_frequencies.get(term, ()))
+        return math.log(1 + (doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def score(self, doc_id, terms):
+        """BM25 score of a document for a set of query terms"""
+        if not self.doc_lengths:
+            return 0.0
+        average_length = self.total_length / len(self.doc_lengths)
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths.get(doc_id, 0) / average_length)
+        score = 0.0
+        for term in terms:
+            frequency = self.term_frequencies.get(term, {}).get(doc_id, 0)
+            if frequency:
+                score += self.get_idf(term) * frequency * (BM25_K1 + 1) / (frequency + length_norm)
+        return score
@@ -6,66 +6,88 @@ from sequence_widget import SequenceEventWidget
 from ControlAndRequirement import AddControlClass
 from hazardous_situation_widget import HazardousSituationCardWidget
 from harm_description_widget import HarmDescriptionCardWidget
+from risk_storage import RiskStorage, DATABASE_DIR
+from rpn_matrix import MATRIX_DIR
 
 class DatabaseManager:
     def __init__(self):
         # This function is same as original
-        self.database_dir = "Database"
+        self.database_dir = DATABASE_DIR
         self.risks_file = os.path.join(self.database_dir, "risks_database.json")
+        self.risks_db_file = os.path.join(self.database_dir, "risks_database.db")
         self.chat_file = os.path.join(self.database_dir, "chat_database.json")
         self.counters_file = os.path.join(self.database_dir, "counters.json")
-        self.matrix_dir = "Risk Matrix"
+        self.matrix_dir = MATRIX_DIR
         
         # Create directories if they don't exist
         os.makedirs(self.database_dir, exist_ok=True)
         os.makedirs(self.matrix_dir, exist_ok=True)
 
+        # Row-level risk store; the old JSON file is only migrated once and then used as an export format
+        self.risk_storage = RiskStorage(self.risks_db_file, self.risks_file)
+
+    def build_risk_data(self, table_widget, row):
+        """Build the stored record for a single table row"""
+        return {
+            'row_id': row,
+            'date': self.get_cell_text(table_widget, row, 0),
+            'risk_no': self.get_cell_text(table_widget, row, 1),
+            'department': self.get_cell_text(table_widget, row, 2),
+            'device_affected': self.get_cell_text(table_widget, row, 3),
+            'components': self.get_cell_text(table_widget, row, 4),
+            'lifecycle': self.get_cell_text(table_widget, row, 5),
+            'hazard_category': self.get_cell_text(table_widget, row, 6),
+            'hazard_source': self.get_cell_text(table_widget, row, 7),
+            'hazardous_situation': self.get_hazardous_situation_data(table_widget, row, 8),
+            'sequence_of_events': self.get_sequence_data(table_widget, row, 9),
+            'harm_influenced': self.get_cell_text(table_widget, row, 10),
+            'harm_description': self.get_harm_description_data(table_widget, row, 11),
+            'severity': self.get_cell_text(table_widget, row, 12),
+            'probability': self.get_cell_text(table_widget, row, 13),
+            'rpn': self.get_cell_text(table_widget, row, 14),
+            'risk_control_actions': self.get_control_data(table_widget, row, 15),
+            'approved_by': self.get_cell_text(table_widget, row, 16),
+            'created_timestamp': datetime.now().isoformat(),
+            'last_modified': datetime.now().isoformat()
+        }
+
     def save_all_risks(self, table_widget):
-        """Save all risks from the table to JSON database"""
-        risks_data = []
-        
-        for row in range(table_widget.rowCount()):
-            risk_data = {
-                'row_id': row,
-                'date': self.get_cell_text(table_widget, row, 0),
-                'risk_no': self.get_cell_text(table_widget, row, 1),
-                'department': self.get_cell_text(table_widget, row, 2),
-                'device_affected': self.get_cell_text(table_widget, row, 3),
-                'components': self.get_cell_text(table_widget, row, 4),
-                'lifecycle': self.get_cell_text(table_widget, row, 5),
-                'hazard_category': self.get_cell_text(table_widget, row, 6),
-                'hazard_source': self.get_cell_text(table_widget, row, 7),
-                'hazardous_situation': self.get_hazardous_situation_data(table_widget, row, 8),
-                'sequence_of_events': self.get_sequence_data(table_widget, row, 9),
-                'harm_influenced': self.get_cell_text(table_widget, row, 10),
-                'harm_description': self.get_harm_description_data(table_widget, row, 11),
-                'severity': self.get_cell_text(table_widget, row, 12),
-                'probability': self.get_cell_text(table_widget, row, 13),
-                'rpn': self.get_cell_text(table_widget, row, 14),
-                'risk_control_actions': self.get_control_data(table_widget, row, 15),
-                'approved_by': self.get_cell_text(table_widget, row, 16),
-                'created_timestamp': datetime.now().isoformat(),
-                'last_modified': datetime.now().isoformat()
-            }
-            risks_data.append(risk_data)
-        
-        # Save to JSON file
-        try:
-            with open(self.risks_file, 'w', encoding='utf-8') as f:
-                json.dump(risks_data, f, indent=2, ensure_ascii=False)
+        """Save all risks from the table to the risk store in one transaction"""
+        risks_data = [self.build_risk_data(table_widget, row) for row in range(table_widget.rowCount())]
+        return self.risk_storage.replace_all_risks(risks_data)
+
+    def load_risk_records(self):
+        """Load all stored risk records, in register order"""
+        return self.risk_storage.load_all_risks()
+
+    def read_risk_records(self):
+        """Load all stored risk records from a worker thread"""
+        return self.risk_storage.read_all_risks()
+
+    def save_risk_records(self, risks_data):
+        """Save several risk records in one transaction"""
+        if not risks_data:
             return True
-        except Exception as e:
-            print(f"❌ Error saving risks: {e}")
-            return False
+        return self.risk_storage.save_risks(risks_data)
+
+    def delete_risks(self, record_ids):
+        """Delete several risks from the risk store by record ID"""
+        return self.risk_storage.delete_risks(list(record_ids))
+
+    def delete_risk(self, record_id):
+        """Delete a single risk from the risk store by record ID"""
+        return self.risk_storage.delete_risk(record_id)
+
+    def export_risks_to_json(self, file_path=None):
+        """Export the whole risk register as a JSON file"""
+        return self.risk_storage.export_to_json(file_path or self.risks_file)
 
     def load_all_risks(self, table_widget):
-        """Load all risks from JSON database to table"""
-        if not os.path.exists(self.risks_file):
-            return False
-        
+        """Load all risks from the risk store to table"""
         try:
-            with open(self.risks_file, 'r', encoding='utf-8') as f:
-                risks_data = json.load(f)
+            risks_data = self.risk_storage.load_all_risks()
+            if not risks_data:
+                return False
             
             # Clear existing table
             table_widget.setRowCount(0)
@@ -245,44 +267,12 @@ class DatabaseManager:
         """Get control data from control widget"""
         widget = table_widget.cellWidget(row, col)
         if isinstance(widget, AddControlClass):
-            controls = []
-            root = widget.tree.invisibleRootItem()
-            for i in range(root.childCount()):
-                item = root.child(i)
-                control_data = {
-                    'text': item.text(0),
-                    'type': item.text(1),
-                    'children': []
-                }
-                
-                # Get children
-                for j in range(item.childCount()):
-                    child = item.child(j)
-                    control_data['children'].append({
-                        'text': child.text(0),
-                        'type': child.text(1)
-                    })
-                
-                controls.append(control_data)
-            
-            return {'controls': controls}
+            return {'controls': widget.get_controls()}
         return {}
 
     def restore_control_widget(self, control_widget, controls_data):
         """Restore control widget from saved data"""
-        from PyQt5.QtWidgets import QTreeWidgetItem
-        
-        for control_data in controls_data:
-            # Create parent item
-            parent_item = QTreeWidgetItem([control_data['text'], control_data['type']])
-            control_widget.tree.addTopLevelItem(parent_item)
-            
-            # Add children
-            for child_data in control_data.get('children', []):
-                child_item = QTreeWidgetItem([child_data['text'], child_data['type']])
-                parent_item.addChild(child_item)
-            
-            parent_item.setExpanded(True)
+        control_widget.set_controls(controls_data)
 
     def backup_database(self):
         """Create a backup of the current database"""
@@ -291,12 +281,14 @@ class DatabaseManager:
         os.makedirs(backup_dir, exist_ok=True)
         
         files_to_backup = [
-            (self.risks_file, f"risks_backup_{timestamp}.json"),
             (self.chat_file, f"chat_backup_{timestamp}.json"),
             (self.counters_file, f"counters_backup_{timestamp}.json")
         ]
         
         backup_count = 0
+        if self.risk_storage.backup_to(os.path.join(backup_dir, f"risks_backup_{timestamp}.db")):
+            backup_count += 1
+
         for source_file, backup_name in files_to_backup:
             if os.path.exists(source_file):
                 try:
@@ -320,28 +312,19 @@ class DatabaseManager:
             'risk_levels': {'High': 0, 'Medium': 0, 'Low': 0}
         }
         
-        if os.path.exists(self.risks_file):
+        if os.path.exists(self.risks_db_file):
             try:
                 # Get file size
-                stats['database_size'] = os.path.getsize(self.risks_file)
-                stats['last_modified'] = datetime.fromtimestamp(
-                    os.path.getmtime(self.risks_file)
-                ).isoformat()
-                
-                # Load and analyze data
-                with open(self.risks_file, 'r', encoding='utf-8') as f:
-                    risks_data = json.load(f)
+                stats['database_size'] = os.path.getsize(self.risks_db_file)
+                stats['last_modified'] = self.risk_storage.get_last_modified()
                 
-                stats['total_risks'] = len(risks_data)
+                # Count in SQL, so the stats don't load and parse every risk
+                stats['total_risks'] = self.risk_storage.count_risks()
+                stats['departments'] = self.risk_storage.count_by_field('department', 'Unknown')
                 
-                # Count by department and risk level
-                for risk in risks_data:
-                    dept = risk.get('department', 'Unknown')
-                    stats['departments'][dept] = stats['departments'].get(dept, 0) + 1
-                    
-                    rpn = risk.get('rpn', '')
+                for rpn, count in self.risk_storage.count_by_field('rpn', '').items():
                     if rpn in stats['risk_levels']:
-                        stats['risk_levels'][rpn] += 1
+                        stats['risk_levels'][rpn] = count
                         
             except Exception as e:
                 print(f"❌ Error getting database stats: {e}")
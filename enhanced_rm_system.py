@@ -3,64 +3,67 @@ import os
 import sys
 import json
 import random
-import pandas as pd
+from startup_timing import timed_import, mark_startup_stage, print_startup_report
 from datetime import datetime
 from collections import Counter
 
+# Data, UI and icon paths are resolved against the application folder, so the launch directory doesn't matter
+CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
+
 # PyQt5 imports
 from PyQt5 import QtCore
 from PyQt5.QtWidgets import *
-from PyQt5.uic import loadUiType
 from PyQt5.QtGui import QColor, QIcon, QFont, QPalette
 from PyQt5.QtCore import Qt, QPointF, QRectF, pyqtSignal
-from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtCore import QDateTime, QPropertyAnimation, QEasingCurve, QUrl, QTimer
 from PyQt5.QtWidgets import (QPushButton, QLabel, QApplication, QMainWindow, QWidget, QVBoxLayout, QComboBox, QListWidget,
                              QAbstractItemView, QMenu, QDialog, QHBoxLayout, QScrollArea, QTreeWidget, QTreeWidgetItem,
                              QCheckBox, QGroupBox, QMessageBox, QTableWidgetItem, QTableWidget, QLineEdit, QSpinBox, QAction, QFileDialog)
 
-# Reporting imports
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import landscape, letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Spacer
-
-# Canvas imports
-import plotly.graph_objects as go
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+# Chart, PDF, web, AI chat and NLP libraries are imported with timed_import on first use of their feature
 
 # Project Modular Classes
 from search import *
+from search_worker import DebouncedSearch
 
 from tree_sidebar import TreeSidebar
 from traceability_graph import TraceabilityGraphDialog
 
 from RiskChat import ChatDialog
 from Dashboard import Dashboard
-from pdf_dialog import PDFDialog
 from Calendar import CalendarDialog
 from matrix_dialog import MatrixDialog
 from filter_dialog import FilterDialog
 from DeviceSelection import DeviceSelected
 from database_manager import DatabaseManager
+from risk_storage import DATABASE_DIR
 from user_input_dialog import UserInputDialog
 from sequence_widget import SequenceEventWidget
 from ControlAndRequirement import AddControlClass
 from risk_history_dialog import RiskHistoryDialog
+from risk_history import RiskHistoryLog
 from notification_dialog import NotificationDialog
-from traceability_dialog import TraceabilityDialog
-from Gemini_app import ChatDialog as GeminiChatDialog
 from risk_numbering_manager import RiskNumberingManager
 from harm_description_dialog import HarmDescriptionDialog
 from harm_description_widget import HarmDescriptionCardWidget
 from hazardous_situation_dialog import HazardousSituationDialog
 from component_selection_dialog import ComponentSelectionDialog
-from enhanced_database_manager import FixedEnhancedDatabaseManager
 from hazardous_situation_widget import HazardousSituationCardWidget
-
-CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
-MainUI, _ = loadUiType('UI/mainWindowui.ui')
+from ui_loader import load_ui_class
+from risk_store import Risk, RiskStore, clean_entries
+from risk_loader import RiskLoadWorker
+from risk_search import RiskSearchIndex
+from near_duplicates import NearDuplicateIndex
+from risk_sort import RiskSortProxyModel, COMPONENT_SORT_KEYS
+from rpn_matrix import matrix_registry, get_default_rpn, recompute_rpns, MATRIX_DIR
+from risk_table_model import (RiskTableModel, RISK_TABLE_HEADERS, HAZARDOUS_SITUATION_COLUMN, SEQUENCE_OF_EVENTS_COLUMN,
+                              HARM_DESCRIPTION_COLUMN, RISK_CONTROL_COLUMN, RPN_COLUMN)
+from risk_table_delegates import (HazardousSituationDelegate, SequenceOfEventsDelegate, HarmDescriptionDelegate,
+                                  RiskControlDelegate)
+
+RISK_ROW_HEIGHT = 120
+MainUI = load_ui_class(os.path.join(CURRENT_DIR, 'UI', 'mainWindowui.ui'))
+mark_startup_stage("modules imported")
 
 class RiskManagementSystem(QMainWindow, MainUI):
     def __init__(self):
@@ -68,17 +71,20 @@ class RiskManagementSystem(QMainWindow, MainUI):
         self.setupUi(self)
         self.setGeometry(0, 0, 1900, 950)
         self.setWindowTitle("Risk Management System")   
-        self.setWindowIcon(QIcon("UI/icons/ezz.png"))
+        self.setWindowIcon(QIcon(os.path.join(CURRENT_DIR, "UI", "icons", "ezz.png")))
         
         # Initialize database manager and numbering manager
         self.db_manager = DatabaseManager()
         self.numbering_manager = RiskNumberingManager()
         
-        # Initialize risk history storage
-        self.risk_history = {}
-        self.matrix_file = 'Risk Matrix/matrix_state.json'
-        self.history_file = 'Database/risk_history.json'
-        self.load_risk_history()
+        # Initialize risk history storage; every edit is appended as it happens
+        self.matrix_file = os.path.join(MATRIX_DIR, 'matrix_state.json')
+        self.risk_history = RiskHistoryLog(os.path.join(DATABASE_DIR, 'risk_history.db'),
+                                           os.path.join(DATABASE_DIR, 'risk_history.json'))
+        
+        # Risks changed or removed since the last save, keyed by record ID
+        self.dirty_risks = set()
+        self.deleted_risks = set()
         
         # Store original table data for filtering
         self.original_table_data = []
@@ -98,13 +104,14 @@ class RiskManagementSystem(QMainWindow, MainUI):
         self.tree_sidebar = None
         self.traceability_dialog = None
         
+        # Background register load
+        self.risk_load_worker = None
+        self.load_progress_bar = None
+        
         # Load counters from database
         self.sw_counter, self.elc_counter, self.mec_counter, self.us_counter, self.test_counter = self.db_manager.load_counters()
         
-        self.table_widget.setFixedHeight(400)
-        self.table_widget.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked)
-        self.table_widget.itemChanged.connect(self.handle_item_changed)
-        self.table_widget.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.setup_risk_table()
 
         self.component_btn.setEnabled(False)
         self.selected_device = None
@@ -131,6 +138,7 @@ class RiskManagementSystem(QMainWindow, MainUI):
         self.update_notification_count()
         self.show_database_stats()
         self.update_rsk_number_combo()
+        mark_startup_stage("main window built")
         
     def buttons_signals(self):
         self.tree_bar_btn.clicked.connect(self.toggle_tree_sidebar)
@@ -158,14 +166,13 @@ class RiskManagementSystem(QMainWindow, MainUI):
         self.dectability_spin_box.valueChanged.connect(self.update_dectability_label)
         self.show_charts_button.clicked.connect(self.show_charts)
         self.pdf_gen.clicked.connect(self.open_pdf_dialog)
-        self.table_widget.customContextMenuRequested.connect(self.show_context_menu)
+        self.risk_table.customContextMenuRequested.connect(self.show_context_menu)
         self.source_combo.currentIndexChanged.connect(self.check_standards)
         self.add_source.clicked.connect(self.add_reference)
         self.sun_charts.clicked.connect(self.open_relation_chart)
         self.show_matrix.clicked.connect(self.show_rpn_matrix)
         self.modeSideBar.toggled.connect(self.toggle_side_bar)
-        self.table_widget.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.table_widget.itemDoubleClicked.connect(self.open_chat_dialog)
+        self.risk_table.doubleClicked.connect(lambda index: self.open_chat_dialog(self.risk_proxy.mapToSource(index)))
         self.dashboardbtn.clicked.connect(self.open_dashboard)
         self.calendar.clicked.connect(self.open_calendar_dialog)
         self.accept_meeting.clicked.connect(self.toggle_meeting_frame)
@@ -173,7 +180,73 @@ class RiskManagementSystem(QMainWindow, MainUI):
         self.component_btn.clicked.connect(self.open_component_selection_dialog)
         self.notification_btn.clicked.connect(self.show_notifications)
         self.trace_btn.clicked.connect(self.open_traceability_dialog)
-        self.table_widget.clicked.connect(lambda index: self.fetch_row_data(index.row()))
+        self.risk_table.clicked.connect(lambda index: self.fetch_row_data(self.get_source_row(index)))
+    
+    def setup_risk_table(self):
+        """Replace the designer table with a model/view register whose card columns are painted by delegates"""
+        self.risk_store = RiskStore()
+        self.risk_model = RiskTableModel(self.risk_store, self)
+        self.risk_proxy = RiskSortProxyModel(self)
+        self.risk_proxy.setSourceModel(self.risk_model)
+        self.risk_table = QTableView(self.table_widget.parentWidget())
+        self.risk_table.setFont(self.table_widget.font())
+        self.verticalLayout_6.replaceWidget(self.table_widget, self.risk_table)
+        self.table_widget.deleteLater()
+        del self.table_widget
+
+        self.risk_table.setModel(self.risk_proxy)
+        # The view shows the register in sort order; stored rows never move
+        self.risk_proxy.sort(0)
+        self.risk_table.setItemDelegateForColumn(HAZARDOUS_SITUATION_COLUMN, HazardousSituationDelegate(self.risk_table))
+        self.risk_table.setItemDelegateForColumn(SEQUENCE_OF_EVENTS_COLUMN, SequenceOfEventsDelegate(self.risk_table))
+        self.risk_table.setItemDelegateForColumn(HARM_DESCRIPTION_COLUMN, HarmDescriptionDelegate(self.risk_table))
+        self.risk_table.setItemDelegateForColumn(RISK_CONTROL_COLUMN, RiskControlDelegate(self.risk_table))
+        self.risk_table.verticalHeader().setDefaultSectionSize(RISK_ROW_HEIGHT)
+        self.risk_table.setFixedHeight(400)
+        self.risk_table.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.risk_model.risk_changed.connect(self.handle_risk_changed)
+        matrix_registry.matrix_changed.connect(self.recompute_matrix_rpns)
+        self.setup_risk_search()
+        self.duplicate_index = NearDuplicateIndex(self.risk_model, self)
+
+    def setup_risk_search(self):
+        """Add the register search box above the table, backed by an index kept in step with the model"""
+        self.risk_search_index = RiskSearchIndex(self.risk_model, self)
+
+        self.risk_search_box = QLineEdit(self.risk_table.parentWidget())
+        self.risk_search_box.setPlaceholderText("Search risks by number, component, situation, event, harm or control...")
+        self.risk_search_box.setClearButtonEnabled(True)
+        self.verticalLayout_6.insertWidget(self.verticalLayout_6.indexOf(self.risk_table), self.risk_search_box)
+
+        # Refilter once typing pauses; the lookup is instant but refiltering a large view is not
+        self.risk_search_timer = QTimer(self)
+        self.risk_search_timer.setSingleShot(True)
+        self.risk_search_timer.setInterval(150)
+        self.risk_search_timer.timeout.connect(self.apply_risk_search)
+        self.risk_search_box.textChanged.connect(lambda: self.risk_search_timer.start())
+
+    def apply_risk_search(self):
+        """Show only the risks matching the search box"""
+        matches = self.risk_search_index.search(self.risk_search_box.text())
+        self.risk_proxy.set_search_matches(matches)
+        if matches is not None:
+            self.statusBar().showMessage(f"🔍 {len(matches)} risks match '{self.risk_search_box.text()}'", 5000)
+
+    def get_source_row(self, index):
+        """Get the register row behind a view index"""
+        return self.risk_proxy.mapToSource(index).row()
+
+    def get_selected_row(self):
+        """Get the register row of the current table selection, or -1"""
+        indexes = self.risk_table.selectionModel().selectedIndexes()
+        return self.get_source_row(indexes[0]) if indexes else -1
+
+    def select_risk_row(self, row):
+        """Select a register row and scroll it into view"""
+        index = self.risk_proxy.mapFromSource(self.risk_model.index(row, 0))
+        if index.isValid():
+            self.risk_table.selectRow(index.row())
+            self.risk_table.scrollTo(index)
     
     def toggle_tree_sidebar(self):
         """Toggle the tree sidebar visibility"""
@@ -210,17 +283,29 @@ class RiskManagementSystem(QMainWindow, MainUI):
         self.seq_list_widget = QtWidgets.QListWidget()
         self.sit_list_widget = QtWidgets.QListWidget()
         self.harm_list_widget = QtWidgets.QListWidget()
+
+        # Type-ahead searches run in the background; only the latest query of each field is shown
+        self.seq_search = DebouncedSearch(sequence_of_event_inverted_index, sequence_of_event_documents, parent=self)
+        self.seq_search.results_ready.connect(
+            lambda results: self.show_search_results(self.seq_list_widget, self.seq_hide_timer, results))
+        self.sit_search = DebouncedSearch(hazardous_situation_inverted_index, hazardous_situation_documents, parent=self)
+        self.sit_search.results_ready.connect(
+            lambda results: self.show_search_results(self.sit_list_widget, self.sit_hide_timer, results))
+        self.harm_search = DebouncedSearch(harm_description_inverted_index, harm_description_documents, parent=self)
+        self.harm_search.results_ready.connect(
+            lambda results: self.show_search_results(self.harm_list_widget, self.harm_hide_timer, results))
+        for search in (self.seq_search, self.sit_search, self.harm_search):
+            search.search_failed.connect(self.on_search_failed)
         
     def init_axis_comboboxes(self):
         self.first_axis = QComboBox()
         self.second_axis = QComboBox()
-        self.webEngineView = QWebEngineView()
+        self.webEngineView = None  # Created by get_web_engine_view on first use; QtWebEngine is slow to load
         
     def init_timers_periodically(self):
-        # Timer to update notification count periodically
-        self.notification_timer = QTimer()
-        self.notification_timer.timeout.connect(self.update_notification_count)
-        self.notification_timer.start(5000)
+        # The notification badge follows the notification service instead of polling the file
+        notification_service.count_changed.connect(self.update_notification_count)
+        notification_service.start_watching()
 
         # Auto-save timer (save every 5 minutes)
         self.auto_save_timer = QTimer()
@@ -282,30 +367,67 @@ class RiskManagementSystem(QMainWindow, MainUI):
                 print(f"🕒 Last modified: {stats['last_modified']}")
 
     def load_data_from_database(self):
-        """Load all data from database on startup"""
+        """Start loading the risk register on a worker thread; rows arrive in batches already sorted"""
         try:
-            # Load risks with numbering manager
-            if self.db_manager.load_all_risks(self.table_widget):
-                self.num_risks = self.table_widget.rowCount()
-                print(f"✅ Loaded {self.num_risks} risks from database")
-                
-                # Update counters based on loaded data
-                self.update_counters_from_table()
-                
-                # Sort table by component number
-                self.sort_table_by_component()
-            else:
-                print("📝 No existing risks found, starting fresh")
-                
+            self.load_progress_bar = QProgressBar()
+            self.load_progress_bar.setMaximumWidth(250)
+            self.load_progress_bar.setFormat("Loading risks... %v/%m")
+            self.statusBar().addPermanentWidget(self.load_progress_bar)
+
+            self.risk_load_worker = RiskLoadWorker(self.db_manager, parent=self)
+            self.risk_load_worker.batch_loaded.connect(self.risk_model.append_risks)
+            self.risk_load_worker.progress.connect(self.on_risk_load_progress)
+            self.risk_load_worker.load_finished.connect(self.on_risk_load_finished)
+            self.risk_load_worker.load_failed.connect(self.on_risk_load_failed)
+            self.risk_load_worker.start()
         except Exception as e:
             print(f"❌ Error loading data from database: {e}")
             QMessageBox.warning(self, "Database Error", 
                               f"Error loading data from database:\n{e}\n\nStarting with empty database.")
 
+    def on_risk_load_progress(self, loaded, total):
+        """Show how much of the register has been loaded"""
+        if self.load_progress_bar:
+            self.load_progress_bar.setMaximum(total)
+            self.load_progress_bar.setValue(loaded)
+
+    def on_risk_load_finished(self, total):
+        """Update everything that depends on the whole register once the last batch is in"""
+        self.remove_load_progress_bar()
+        self.num_risks = len(self.risk_store)
+        if total:
+            print(f"✅ Loaded {total} risks from database")
+            
+            # Update counters based on loaded data
+            self.update_counters_from_table()
+        else:
+            print("📝 No existing risks found, starting fresh")
+        self.update_rsk_number_combo()
+        self.refresh_tree_views()
+
+    def on_risk_load_failed(self, error):
+        """Report a failed background load"""
+        self.remove_load_progress_bar()
+        QMessageBox.warning(self, "Database Error", 
+                          f"Error loading data from database:\n{error}\n\nStarting with empty database.")
+
+    def remove_load_progress_bar(self):
+        """Take the load progress bar out of the status bar"""
+        if self.load_progress_bar:
+            self.statusBar().removeWidget(self.load_progress_bar)
+            self.load_progress_bar.deleteLater()
+            self.load_progress_bar = None
+
+    def stop_risk_load(self):
+        """Stop a background load that is still running"""
+        if self.risk_load_worker and self.risk_load_worker.isRunning():
+            self.risk_load_worker.requestInterruption()
+            self.risk_load_worker.wait()
+
     def sort_table_by_component(self):
-        """Sort table by component number"""
+        """Sort the view by component number, then RPN, then date"""
         try:
-            self.db_manager.sort_table_by_component_number(self.table_widget, self.numbering_manager)
+            self.risk_proxy.sort_by(COMPONENT_SORT_KEYS)
         except Exception as e:
             print(f"❌ Error sorting table: {e}")
 
@@ -314,12 +436,9 @@ class RiskManagementSystem(QMainWindow, MainUI):
         dept_counts = {'Software Department': 0, 'Electrical Department': 0, 
                       'Mechanical Department': 0, 'Usability Team': 0, 'Testing Team': 0}
         
-        for row in range(self.table_widget.rowCount()):
-            dept_item = self.table_widget.item(row, 2)
-            if dept_item:
-                dept = dept_item.text()
-                if dept in dept_counts:
-                    dept_counts[dept] += 1
+        for risk in self.risk_store:
+            if risk.department in dept_counts:
+                dept_counts[risk.department] += 1
         
         # Update counters to be at least as high as existing risks
         self.sw_counter = max(self.sw_counter, dept_counts['Software Department'])
@@ -329,19 +448,29 @@ class RiskManagementSystem(QMainWindow, MainUI):
         self.test_counter = max(self.test_counter, dept_counts['Testing Team'])
 
     def auto_save_data(self):
-        """Auto-save data every 5 minutes"""
+        """Auto-save data every minute; save_dirty_risks skips the risk write when no risk changed"""
         try:
-            self.save_data_to_database()
-            print("💾 Auto-save completed")
+            if self.save_data_to_database():
+                print("💾 Auto-save completed")
         except Exception as e:
             print(f"❌ Auto-save failed: {e}")
 
     def save_data_to_database(self):
-        """Save all current data to database"""
+        """Save the risks changed since the last save, plus supporting data"""
         try:
             # Save risks
-            self.db_manager.save_all_risks(self.table_widget)
+            if not self.save_dirty_risks():
+                return False
+            
+            return self.save_supporting_data()
             
+        except Exception as e:
+            print(f"❌ Error saving data to database: {e}")
+            return False
+
+    def save_supporting_data(self):
+        """Save chat, counters, numbering and history data"""
+        try:
             # Save chat data
             self.db_manager.save_chat_data(self.chat_data)
             
@@ -354,25 +483,57 @@ class RiskManagementSystem(QMainWindow, MainUI):
             # Save numbering data
             self.numbering_manager.save_numbering_data()
             
-            # Save risk history
-            self.save_risk_history()
-            
             return True
             
         except Exception as e:
             print(f"❌ Error saving data to database: {e}")
             return False
 
+    def has_unsaved_changes(self):
+        """Check whether any risk was changed or removed since the last save"""
+        return bool(self.dirty_risks or self.deleted_risks)
+
+    def mark_row_dirty(self, row):
+        """Mark the risk in a table row as changed since the last save"""
+        risk = self.risk_store.get(row)
+        if risk is not None:
+            self.dirty_risks.add(risk.record_id)
+            self.deleted_risks.discard(risk.record_id)
+
+    def mark_risk_deleted(self, risk):
+        """Mark a removed risk so the next save deletes its record"""
+        if risk is not None:
+            self.dirty_risks.discard(risk.record_id)
+            self.deleted_risks.add(risk.record_id)
+
+    def save_dirty_risks(self):
+        """Write only the risks changed or removed since the last save"""
+        if not self.has_unsaved_changes():
+            return True
+        try:
+            dirty_risks = self.risk_store.to_records(self.dirty_risks)
+            if not self.db_manager.save_risk_records(dirty_risks):
+                return False
+            if not self.db_manager.delete_risks(self.deleted_risks):
+                return False
+            
+            print(f"💾 Saved {len(dirty_risks)} changed and removed {len(self.deleted_risks)} risks")
+            self.dirty_risks.clear()
+            self.deleted_risks.clear()
+            return True
+        except Exception as e:
+            print(f"❌ Error saving changed risks: {e}")
+            return False
+
     def add_entry(self):
         """Add new entry or edit existing entry based on edit mode"""
         if self.edit_chech_box.isChecked():
             # Edit mode - get selected row
-            selected_items = self.table_widget.selectedItems()
-            if not selected_items:
+            selected_row = self.get_selected_row()
+            if selected_row < 0:
                 QMessageBox.warning(self, "No Row Selected", 
                                   "Please select a row to edit or uncheck edit mode.")
                 return
-            selected_row = selected_items[0].row()
             self.edit_in_risk(selected_row)
         else:
             # Add new entry mode
@@ -399,20 +560,21 @@ class RiskManagementSystem(QMainWindow, MainUI):
                 self.current_session_user = None
                 return
 
+            if not self.confirm_not_duplicate():
+                self.is_initial_creation = False
+                self.current_session_user = None
+                return
+
             print(f"🔄 Adding risk for component: {component_name}")
 
             # Increment sequence counter for this component (this also assigns component number if needed)
             sequence_count = self.numbering_manager.increment_sequence_counter(component_name)
             print(f"🔢 Sequence count for {component_name}: {sequence_count}")
 
-            row_position = self.table_widget.rowCount()
-            self.table_widget.insertRow(row_position)
-
             # Collect all field data for history recording
             field_data = []
 
             current_datetime = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
-            self.table_widget.setItem(row_position, 0, QTableWidgetItem(current_datetime))
             field_data.append(current_datetime)
 
             # Generate new risk number using the numbering system
@@ -423,152 +585,91 @@ class RiskManagementSystem(QMainWindow, MainUI):
             rsk_no = self.numbering_manager.generate_risk_number(
                 department, component_name, sequence_count, hazardous_count, harm_count
             )
-            self.table_widget.setItem(row_position, 1, QTableWidgetItem(rsk_no))
             field_data.append(rsk_no)
-
-            self.table_widget.setItem(row_position, 2, QTableWidgetItem(department))
             field_data.append(department)
 
             devices_text = ', '.join(self.checked_items)
-            self.table_widget.setItem(row_position, 3, QTableWidgetItem(devices_text))
             field_data.append(devices_text)
 
             components_text = ", ".join(self.selected_components)
-            self.table_widget.setItem(row_position, 4, QTableWidgetItem(components_text))
             field_data.append(components_text)
 
             lifecycle = self.lifecycle_combo.currentText()
-            self.table_widget.setItem(row_position, 5, QTableWidgetItem(lifecycle))
             field_data.append(lifecycle)
 
             hazard_category = self.hazard_category_combo.currentText()
-            self.table_widget.setItem(row_position, 6, QTableWidgetItem(hazard_category))
             field_data.append(hazard_category)
 
             hazard_source = self.hazard_source_combo.currentText()
-            self.table_widget.setItem(row_position, 7, QTableWidgetItem(hazard_source))
             field_data.append(hazard_source)
 
-            # Use card widget for hazardous situation with numbering
+            # Hazardous situations are painted as numbered cards by the table delegate
             hazardous_situation = self.hazardous_situation_edit.text()
             initial_situations = [hazardous_situation] if hazardous_situation.strip() else []
-            
-            try:
-                hazardous_situation_widget = HazardousSituationCardWidget(
-                    initial_situations, self, self.numbering_manager, component_name
-                )
-                # FIXED: Use lambda with default arguments to avoid late binding issues
-                hazardous_situation_widget.situations_updated.connect(
-                    lambda situations, count, r=row_position, c=component_name: 
-                    self.update_situations_and_numbering(r, situations, count, c)
-                )
-                self.table_widget.setCellWidget(row_position, 8, hazardous_situation_widget)
-                print(f"✅ Created hazardous situation widget for row {row_position}")
-            except Exception as e:
-                print(f"❌ Error creating hazardous situation widget: {e}")
-                # Fallback to simple text item
-                self.table_widget.setItem(row_position, 8, QTableWidgetItem(hazardous_situation))
-            
+            self.numbering_manager.update_hazardous_situation_count(component_name, len(initial_situations))
             field_data.append(hazardous_situation)
 
             if hazardous_situation.strip():
                 self.check_and_add_new_content(hazardous_situation, "Hazardous Situation")
 
-            # Sequence of events (unchanged)
             sequence_of_event = self.sequence_of_event_edit.text()
-            try:
-                sequence_widget = SequenceEventWidget(sequence_of_event)
-                sequence_widget.sequence_updated.connect(
-                    lambda events, r=row_position: self.update_sequence_in_table(r, events)
-                )
-                self.table_widget.setCellWidget(row_position, 9, sequence_widget)
-                print(f"✅ Created sequence widget for row {row_position}")
-            except Exception as e:
-                print(f"❌ Error creating sequence widget: {e}")
-                # Fallback to simple text item
-                self.table_widget.setItem(row_position, 9, QTableWidgetItem(sequence_of_event))
-            
             field_data.append(sequence_of_event)
 
             if sequence_of_event.strip():
                 self.check_and_add_new_content(sequence_of_event, "Sequence of Event")
 
             harm_influenced = self.harm_influenced_combo.currentText()
-            self.table_widget.setItem(row_position, 10, QTableWidgetItem(harm_influenced))
             field_data.append(harm_influenced)
 
-            # Use card widget for harm description with numbering
+            # Harm descriptions are painted as numbered cards by the table delegate
             harm_desc = self.harm_desc_line.text()
             initial_harms = [harm_desc] if harm_desc.strip() else []
-            selected_device = self.checked_items[0] if self.checked_items else None
-            
-            try:
-                harm_description_widget = HarmDescriptionCardWidget(
-                    initial_harms, {}, selected_device, self, self.numbering_manager, component_name
-                )
-                # FIXED: Use lambda with default arguments to avoid late binding issues
-                harm_description_widget.harms_updated.connect(
-                    lambda harms, rpn_data, count, r=row_position, c=component_name: 
-                    self.update_harms_and_numbering(r, harms, rpn_data, count, c)
-                )
-                harm_description_widget.rpn_data_changed.connect(
-                    lambda rpn_data, r=row_position: self.update_rpn_in_table(r, rpn_data)
-                )
-                self.table_widget.setCellWidget(row_position, 11, harm_description_widget)
-                print(f"✅ Created harm description widget for row {row_position}")
-            except Exception as e:
-                print(f"❌ Error creating harm description widget: {e}")
-                # Fallback to simple text item
-                self.table_widget.setItem(row_position, 11, QTableWidgetItem(harm_desc))
-            
+            self.numbering_manager.update_harm_description_count(component_name, len(initial_harms))
             field_data.append(harm_desc)
 
             if harm_desc.strip():
                 self.check_and_add_new_content(harm_desc, "Harm Description")
 
             severity = self.severity_spinbox.value()
-            self.table_widget.setItem(row_position, 12, QTableWidgetItem(str(severity)))
             field_data.append(str(severity))
 
             probability = self.probability_spinbox.value()
-            self.table_widget.setItem(row_position, 13, QTableWidgetItem(str(probability)))
             field_data.append(str(probability))
 
             RPN = self.update_rpn_value()
-            self.table_widget.setItem(row_position, 14, QTableWidgetItem(RPN))
             field_data.append(RPN)
 
-            try:
-                tree_widget_cell = AddControlClass()
-                self.table_widget.setCellWidget(row_position, 15, tree_widget_cell)
-                print(f"✅ Created control widget for row {row_position}")
-            except Exception as e:
-                print(f"❌ Error creating control widget: {e}")
-                # Fallback to empty text item
-                self.table_widget.setItem(row_position, 15, QTableWidgetItem(""))
-            
-            self.table_widget.setRowHeight(row_position, 200)
+            row_position = self.risk_model.append_risk(Risk(
+                date=current_datetime,
+                risk_no=rsk_no,
+                department=department,
+                device_affected=devices_text,
+                components=components_text,
+                lifecycle=lifecycle,
+                hazard_category=hazard_category,
+                hazard_source=hazard_source,
+                situations=clean_entries(initial_situations),
+                events=clean_entries([sequence_of_event]),
+                harm_influenced=harm_influenced,
+                harms=clean_entries(initial_harms),
+                severity=str(severity),
+                probability=str(probability),
+                rpn=RPN
+            ))
+            print(f"✅ Added risk {rsk_no} in row {row_position}")
 
             # Record all initial field values with the same user name
             self.record_initial_risk_creation(rsk_no, user_name, field_data)
 
             self.num_risks += 1
             
-            self.highlight_missing_cells(row_position)
-            
             self.generate_and_set_id()
             self.update_rsk_number_combo()
-            self.update_notification_count()
-            
-            # Save the history after adding the entry
-            self.save_risk_history()
 
-            # Auto-save to database after adding new risk
+            # Save the new risk together with any other pending changes
+            self.mark_row_dirty(row_position)
             self.save_data_to_database()
 
-            # Sort table by component after adding new risk
-            self.sort_table_by_component()
-
             # Clear the session flags
             self.is_initial_creation = False
             self.current_session_user = None
@@ -590,6 +691,66 @@ class RiskManagementSystem(QMainWindow, MainUI):
             self.is_initial_creation = False
             self.current_session_user = None
             
+    def confirm_not_duplicate(self):
+        """Warn when the entered situation, sequence and harm look like an existing risk; False cancels the add"""
+        try:
+            matches = self.duplicate_index.find_similar([self.hazardous_situation_edit.text()],
+                                                        [self.sequence_of_event_edit.text()],
+                                                        [self.harm_desc_line.text()])
+        except Exception as e:
+            print(f"❌ Error checking for duplicate risks: {e}")
+            return True
+        if not matches:
+            return True
+
+        similar_risks = "\n".join(f"• {risk.risk_no} ({risk.components}) - {similarity:.0%} similar"
+                                  for similarity, risk in matches[:5])
+        reply = QMessageBox.question(self, "Possible Duplicate Risk",
+                                     f"This risk looks like existing risks:\n\n{similar_risks}\n\nAdd it anyway?",
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply == QMessageBox.No:
+            self.select_risk_row(self.risk_store.find_row(matches[0][1].record_id))
+            return False
+        return True
+
+    def show_duplicate_clusters(self):
+        """Show the groups of likely duplicate risks across the whole register"""
+        try:
+            clusters = self.duplicate_index.find_clusters()
+
+            dialog = QDialog(self)
+            dialog.setWindowTitle("Duplicate Risk Clusters")
+            dialog.setGeometry(200, 200, 800, 500)
+            layout = QVBoxLayout(dialog)
+
+            summary = f"🧬 {len(clusters)} clusters of likely duplicates, {sum(len(c) for c in clusters)} risks in total"
+            layout.addWidget(QLabel(summary))
+
+            tree = QTreeWidget()
+            tree.setHeaderLabels(["Risk No.", "Components", "Hazardous Situation", "Sequence of Events"])
+            for number, cluster in enumerate(clusters, 1):
+                cluster_item = QTreeWidgetItem([f"Cluster {number} ({len(cluster)} risks)"])
+                for risk in cluster:
+                    risk_item = QTreeWidgetItem([risk.risk_no, risk.components, risk.situations_text, risk.sequence_text])
+                    risk_item.setData(0, Qt.UserRole, risk.record_id)
+                    cluster_item.addChild(risk_item)
+                tree.addTopLevelItem(cluster_item)
+            tree.expandAll()
+            # Double clicking a risk shows it in the register; risk numbers may repeat, so it is found by record ID
+            tree.itemDoubleClicked.connect(
+                lambda item: item.parent() and self.select_risk_row(self.risk_store.find_row(item.data(0, Qt.UserRole))))
+            layout.addWidget(tree)
+
+            close_btn = QPushButton("Close")
+            close_btn.clicked.connect(dialog.accept)
+            layout.addWidget(close_btn)
+
+            print(f"🧬 Found {len(clusters)} duplicate risk clusters")
+            dialog.exec_()
+        except Exception as e:
+            print(f"❌ Error finding duplicate risks: {e}")
+            QMessageBox.critical(self, "Error", f"Error finding duplicate risks: {e}")
+
     def edit_in_risk(self, row):
         """Edit existing risk in the table with new field values"""
         try:
@@ -598,120 +759,57 @@ class RiskManagementSystem(QMainWindow, MainUI):
                 return
     
             print(f"🔄 Editing risk in row {row}")
+            # The model reports each changed cell with its previous value, recorded under this user
+            self.current_session_user = user_name
     
-            # Store previous values for history
-            previous_values = {}
-            for col in range(self.table_widget.columnCount()):
-                item = self.table_widget.item(row, col)
-                if item:
-                    previous_values[col] = item.text()
-    
-            # Update fields in the table
-            field_data = []
-            
-            # Keep original date
-            date_item = self.table_widget.item(row, 0)
-            field_data.append(date_item.text() if date_item else "")
-    
-            # Risk number remains the same
-            risk_no = self.table_widget.item(row, 1).text()
-            field_data.append(risk_no)
-    
-            # Update department
-            department = self.department_combo.currentText()
-            self.table_widget.setItem(row, 2, QTableWidgetItem(department))
-            field_data.append(department)
-    
-            # Update devices affected
-            devices_text = ', '.join(self.checked_items)
-            self.table_widget.setItem(row, 3, QTableWidgetItem(devices_text))
-            field_data.append(devices_text)
-    
-            # Update components
-            components_text = ", ".join(self.selected_components)
-            self.table_widget.setItem(row, 4, QTableWidgetItem(components_text))
-            field_data.append(components_text)
-    
-            # Update lifecycle
-            lifecycle = self.lifecycle_combo.currentText()
-            self.table_widget.setItem(row, 5, QTableWidgetItem(lifecycle))
-            field_data.append(lifecycle)
-    
-            # Update hazard category
-            hazard_category = self.hazard_category_combo.currentText()
-            self.table_widget.setItem(row, 6, QTableWidgetItem(hazard_category))
-            field_data.append(hazard_category)
-    
-            # Update hazard source
-            hazard_source = self.hazard_source_combo.currentText()
-            self.table_widget.setItem(row, 7, QTableWidgetItem(hazard_source))
-            field_data.append(hazard_source)
-    
-            # Update hazardous situation
-            hazardous_situation = self.hazardous_situation_edit.text()
-            try:
-                hazardous_situation_widget = self.table_widget.cellWidget(row, 8)
-                if hazardous_situation_widget:
-                    hazardous_situation_widget.add_situation(hazardous_situation)
-                else:
-                    self.table_widget.setItem(row, 8, QTableWidgetItem(hazardous_situation))
-            except Exception as e:
-                print(f"❌ Error updating hazardous situation widget: {e}")
-                self.table_widget.setItem(row, 8, QTableWidgetItem(hazardous_situation))
-            field_data.append(hazardous_situation)
+            # Risk number and date remain the same
+            risk_no = self.get_risk_id_for_row(row)
     
-            # Update sequence of events
-            sequence_of_event = self.sequence_of_event_edit.text()
-            try:
-                sequence_widget = self.table_widget.cellWidget(row, 9)
-                if sequence_widget:
-                    sequence_widget.set_sequence(sequence_of_event)
-                else:
-                    self.table_widget.setItem(row, 9, QTableWidgetItem(sequence_of_event))
-            except Exception as e:
-                print(f"❌ Error updating sequence widget: {e}")
-                self.table_widget.setItem(row, 9, QTableWidgetItem(sequence_of_event))
-            field_data.append(sequence_of_event)
-    
-            # Update harm influenced
-            harm_influenced = self.harm_influenced_combo.currentText()
-            self.table_widget.setItem(row, 10, QTableWidgetItem(harm_influenced))
-            field_data.append(harm_influenced)
+            # Every field changed by this edit is recorded in one history write
+            with self.risk_history.transaction():
+                # Update plain fields
+                self.risk_model.set_text(row, 2, self.department_combo.currentText())
+                self.risk_model.set_text(row, 3, ', '.join(self.checked_items))
+                self.risk_model.set_text(row, 4, ", ".join(self.selected_components))
+                self.risk_model.set_text(row, 5, self.lifecycle_combo.currentText())
+                self.risk_model.set_text(row, 6, self.hazard_category_combo.currentText())
+                self.risk_model.set_text(row, 7, self.hazard_source_combo.currentText())
     
-            # Update harm description
-            harm_desc = self.harm_desc_line.text()
-            try:
-                harm_widget = self.table_widget.cellWidget(row, 11)
-                if harm_widget:
-                    harm_widget.add_harm(harm_desc)
-                else:
-                    self.table_widget.setItem(row, 11, QTableWidgetItem(harm_desc))
-            except Exception as e:
-                print(f"❌ Error updating harm description widget: {e}")
-                self.table_widget.setItem(row, 11, QTableWidgetItem(harm_desc))
-            field_data.append(harm_desc)
+                # Add the entered hazardous situation to the existing ones
+                hazardous_situation = self.hazardous_situation_edit.text().strip()
+                risk = self.risk_store[row]
+                situations = risk.situations
+                if hazardous_situation and hazardous_situation not in situations:
+                    self.risk_model.set_value(row, HAZARDOUS_SITUATION_COLUMN, {'situations': situations + [hazardous_situation]})
+                    self.check_and_add_new_content(hazardous_situation, "Hazardous Situation")
     
-            # Update severity
-            severity = self.severity_spinbox.value()
-            self.table_widget.setItem(row, 12, QTableWidgetItem(str(severity)))
-            field_data.append(str(severity))
+                # Add the entered event to the end of the sequence
+                sequence_of_event = self.sequence_of_event_edit.text().strip()
+                events = risk.events
+                if sequence_of_event and sequence_of_event not in events:
+                    self.risk_model.set_value(row, SEQUENCE_OF_EVENTS_COLUMN, {'events': events + [sequence_of_event]})
+                    self.check_and_add_new_content(sequence_of_event, "Sequence of Event")
     
-            # Update probability
-            probability = self.probability_spinbox.value()
-            self.table_widget.setItem(row, 13, QTableWidgetItem(str(probability)))
-            field_data.append(str(probability))
+                # Update harm influenced
+                self.risk_model.set_text(row, 10, self.harm_influenced_combo.currentText())
     
-            # Update RPN
-            RPN = self.update_rpn_value()
-            self.table_widget.setItem(row, 14, QTableWidgetItem(RPN))
-            field_data.append(RPN)
+                # Add the entered harm description to the existing ones
+                harm_desc = self.harm_desc_line.text().strip()
+                harms = risk.harms
+                if harm_desc and harm_desc not in harms:
+                    self.risk_model.set_value(row, HARM_DESCRIPTION_COLUMN, {
+                        'harms': harms + [harm_desc],
+                        'rpn_data': risk.rpn_data
+                    })
+                    self.check_and_add_new_content(harm_desc, "Harm Description")
     
-            # Record changes in history
-            for col, new_value in enumerate(field_data):
-                if col in previous_values and previous_values[col] != new_value:
-                    self.record_edit_history(row, col, previous_values[col], new_value, user_name)
+                # Update severity, probability and RPN
+                self.risk_model.set_text(row, 12, str(self.severity_spinbox.value()))
+                self.risk_model.set_text(row, 13, str(self.probability_spinbox.value()))
+                self.risk_model.set_text(row, 14, self.update_rpn_value())
     
             # Save changes
+            self.mark_row_dirty(row)
             self.save_data_to_database()
             print(f"✅ Successfully edited risk: {risk_no}")
             
@@ -722,6 +820,8 @@ class RiskManagementSystem(QMainWindow, MainUI):
         except Exception as e:
             print(f"❌ Error editing risk: {e}")
             QMessageBox.critical(self, "Error", f"Failed to edit risk: {e}")
+        finally:
+            self.current_session_user = None
             
     def clear_risk_fields(self):
         self.department_combo.setCurrentText("  ")
@@ -736,16 +836,22 @@ class RiskManagementSystem(QMainWindow, MainUI):
         self.harm_desc_line.clear()
         self.hazardous_situation_edit.clear()    
     
-    def update_situations_and_numbering(self, row, situations_list, count, component_name):
+    def get_row_component(self, row):
+        """Get the component a row is numbered under (the first selected component)"""
+        components = self.risk_store[row].component_list
+        return components[0] if components else ''
+
+    def update_situations_and_numbering(self, row):
         """Update situations and regenerate risk number"""
         try:
+            component_name = self.get_row_component(row)
+            count = len(self.risk_store[row].situations)
             print(f"🔄 Updating situations for row {row}, component {component_name}, count: {count}")
+            self.numbering_manager.update_hazardous_situation_count(component_name, count)
+            
             # Update risk number with new hazardous situation count
             self.update_risk_number_in_row(row, component_name)
-            
-            # Auto-save after situations update
             self.refresh_tree_views()
-            self.save_data_to_database()
         except Exception as e:
             print(f"❌ Error updating situations and numbering: {e}")
 
@@ -757,71 +863,74 @@ class RiskManagementSystem(QMainWindow, MainUI):
         if self.traceability_dialog and self.traceability_dialog.isVisible():
             self.traceability_dialog.refresh_graph()
         
-    def update_harms_and_numbering(self, row, harms_list, rpn_data, count, component_name):
-        """Update harms and regenerate risk number"""
+    def update_harms_and_numbering(self, row):
+        """Update harms, regenerate risk number and refresh the combined RPN"""
         try:
+            component_name = self.get_row_component(row)
+            count = len(self.risk_store[row].harms)
             print(f"🔄 Updating harms for row {row}, component {component_name}, count: {count}")
+            self.numbering_manager.update_harm_description_count(component_name, count)
+            
             # Update risk number with new harm description count
             self.update_risk_number_in_row(row, component_name)
             
-            # Auto-save after harms update
-            self.save_data_to_database()
+            if self.risk_store[row].rpn_data:
+                self.update_rpn_in_table(row, self.get_combined_rpn_data(row))
+            self.refresh_tree_views()
         except Exception as e:
             print(f"❌ Error updating harms and numbering: {e}")
 
+    def get_combined_rpn_data(self, row):
+        """Combine the per-harm RPN data of a row using its highest severity and probability"""
+        risk = self.risk_store[row]
+        rpn_data = risk.rpn_data
+        if not rpn_data:
+            return {'severity': 1, 'probability': 1, 'rpn': 'Low'}
+
+        max_severity = max([data['severity'] for data in rpn_data.values()])
+        max_probability = max([data['probability'] for data in rpn_data.values()])
+        
+        if risk.device_list:
+            rpn = self.get_rpn_from_matrix(risk.device_list[0], max_severity, max_probability)
+        else:
+            rpn = self.get_hardcoded_rpn(max_severity, max_probability)
+        
+        return {'severity': max_severity, 'probability': max_probability, 'rpn': rpn}
+
     def update_risk_number_in_row(self, row, component_name):
         """Update the risk number in a specific row based on current counts"""
         try:
             # Get current department
-            dept_item = self.table_widget.item(row, 2)
-            department = dept_item.text() if dept_item else ""
+            risk = self.risk_store[row]
+            department = risk.department
             
             # Get current sequence count for this component
             sequence_count = self.numbering_manager.get_current_sequence_count(component_name)
             
-            # Get current hazardous situation count
-            hazardous_widget = self.table_widget.cellWidget(row, 8)
-            hazardous_count = 1
-            if hazardous_widget and hasattr(hazardous_widget, 'get_situations_count'):
-                hazardous_count = hazardous_widget.get_situations_count()
-            
-            # Get current harm description count
-            harm_widget = self.table_widget.cellWidget(row, 11)
-            harm_count = 1
-            if harm_widget and hasattr(harm_widget, 'get_harms_count'):
-                harm_count = harm_widget.get_harms_count()
+            # Get current hazardous situation and harm description counts
+            hazardous_count = len(risk.situations) or 1
+            harm_count = len(risk.harms) or 1
             
             # Generate new risk number
             new_risk_number = self.numbering_manager.generate_risk_number(
                 department, component_name, sequence_count, hazardous_count, harm_count
             )
             
-            # Update the risk number in the table
-            self.table_widget.setItem(row, 1, QTableWidgetItem(new_risk_number))
+            # Update the risk number in the table; the stored record keeps its record ID and is saved as dirty
+            self.risk_model.set_text(row, 1, new_risk_number)
             
             print(f"🔄 Updated risk number: {new_risk_number}")
             
         except Exception as e:
             print(f"❌ Error updating risk number: {e}")
 
-    def update_sequence_in_table(self, row, events_list):
-        """Update the sequence text in the table when the sequence widget is updated"""
-        try:
-            # Auto-save after sequence update
-            self.save_data_to_database()
-        except Exception as e:
-            print(f"❌ Error updating sequence: {e}")
-
     def update_rpn_in_table(self, row, combined_rpn_data):
         """Update RPN-related cells when harm descriptions change"""
         try:
             # Update severity, probability, and RPN cells
-            self.table_widget.setItem(row, 12, QTableWidgetItem(str(combined_rpn_data['severity'])))
-            self.table_widget.setItem(row, 13, QTableWidgetItem(str(combined_rpn_data['probability'])))
-            self.table_widget.setItem(row, 14, QTableWidgetItem(combined_rpn_data['rpn']))
-            
-            # Auto-save after RPN update
-            self.save_data_to_database()
+            self.risk_model.set_text(row, 12, str(combined_rpn_data['severity']))
+            self.risk_model.set_text(row, 13, str(combined_rpn_data['probability']))
+            self.risk_model.set_text(row, 14, combined_rpn_data['rpn'])
         except Exception as e:
             print(f"❌ Error updating RPN: {e}")
         
@@ -832,17 +941,18 @@ class RiskManagementSystem(QMainWindow, MainUI):
         
     def fetch_row_data(self, row):
         try:
-            # Get data from table cells
-            risk_number = self.table_widget.item(row, 1).text() if self.table_widget.item(row, 1) else ""
-            department = self.table_widget.item(row, 2).text() if self.table_widget.item(row, 2) else ""
-            lifecycle = self.table_widget.item(row, 5).text() if self.table_widget.item(row, 5) else ""
-            hazard_category = self.table_widget.item(row, 6).text() if self.table_widget.item(row, 6) else ""
-            hazard_source = self.table_widget.item(row, 7).text() if self.table_widget.item(row, 7) else ""
-            harm_influenced = self.table_widget.item(row, 10).text() if self.table_widget.item(row, 10) else ""
+            # Get data from the risk store
+            risk = self.risk_store[row]
+            risk_number = risk.risk_no
+            department = risk.department
+            lifecycle = risk.lifecycle
+            hazard_category = risk.hazard_category
+            hazard_source = risk.hazard_source
+            harm_influenced = risk.harm_influenced
             
             # Get severity and probability values
-            severity = self.table_widget.item(row, 12).text() if self.table_widget.item(row, 12) else "1"
-            probability = self.table_widget.item(row, 13).text() if self.table_widget.item(row, 13) else "1"
+            severity = risk.severity or "1"
+            probability = risk.probability or "1"
 
             # Update combo boxes
             self.department_combo.setCurrentText(department)
@@ -893,19 +1003,18 @@ class RiskManagementSystem(QMainWindow, MainUI):
         history_action = menu.addAction("See History")
         filter_action = menu.addAction("Filter Risks")
         save_action = menu.addAction("💾 Save to Database")
+        export_action = menu.addAction("📤 Export to JSON")
         backup_action = menu.addAction("🔄 Create Backup")
         sort_component_action = menu.addAction("🔢 Sort by Component")
         numbering_stats_action = menu.addAction("📊 Numbering Statistics")
+        duplicates_action = menu.addAction("🧬 Find Duplicate Risks")
 
-        action = menu.exec_(self.table_widget.mapToGlobal(position))
+        action = menu.exec_(self.risk_table.viewport().mapToGlobal(position))
         if action == edit_action:
-            index = self.table_widget.indexAt(position)
+            index = self.risk_table.indexAt(position)
             if index.isValid():
-                # Store previous value before editing
-                item = self.table_widget.item(index.row(), index.column())
-                if item:
-                    item._previous_value = item.text()
-                self.table_widget.editItem(item)
+                # The model keeps the previous value itself; card columns open their editor widget here
+                self.risk_table.edit(index)
         elif action == extract_action:
             self.extract_row()
         elif action == remove_action:
@@ -915,9 +1024,9 @@ class RiskManagementSystem(QMainWindow, MainUI):
         elif action == reject_by:
             self.reject_process()
         elif action == history_action:
-            index = self.table_widget.indexAt(position)
+            index = self.risk_table.indexAt(position)
             if index.isValid():
-                self.show_risk_history(index.row())
+                self.show_risk_history(self.get_source_row(index))
         elif action == filter_action:
             self.open_filter_dialog()
         elif action == save_action:
@@ -925,6 +1034,8 @@ class RiskManagementSystem(QMainWindow, MainUI):
                 QMessageBox.information(self, "Saved", "All data has been saved to database!")
             else:
                 QMessageBox.critical(self, "Save Error", "Failed to save data to database!")
+        elif action == export_action:
+            self.export_risks_to_json()
         elif action == backup_action:
             if self.db_manager.backup_database():
                 QMessageBox.information(self, "Backup Created", "Database backup has been created successfully!")
@@ -935,6 +1046,18 @@ class RiskManagementSystem(QMainWindow, MainUI):
             QMessageBox.information(self, "Sorted", "Table has been sorted by component number!")
         elif action == numbering_stats_action:
             self.show_numbering_statistics()
+        elif action == duplicates_action:
+            self.show_duplicate_clusters()
+
+    def export_risks_to_json(self):
+        """Export the whole risk register to a JSON file"""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Risks", "risks_database.json", "JSON Files (*.json)")
+        if not file_path:
+            return
+        if self.save_data_to_database() and self.db_manager.export_risks_to_json(file_path):
+            QMessageBox.information(self, "Exported", f"Risk register exported to:\n{file_path}")
+        else:
+            QMessageBox.critical(self, "Export Error", "Failed to export the risk register!")
 
     def show_numbering_statistics(self):
         """Show numbering system statistics"""
@@ -999,6 +1122,11 @@ class RiskManagementSystem(QMainWindow, MainUI):
                                    QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel,
                                    QMessageBox.Yes)
         
+        if reply != QMessageBox.Cancel:
+            self.stop_risk_load()
+            for search in (self.seq_search, self.sit_search, self.harm_search):
+                search.cancel()
+        
         if reply == QMessageBox.Yes:
             if self.save_data_to_database():
                 QMessageBox.information(self, "Saved", "All data has been saved successfully!")
@@ -1012,25 +1140,6 @@ class RiskManagementSystem(QMainWindow, MainUI):
             event.ignore()
 
     # Include all other functions from the original system...
-    def load_risk_history(self):
-        """Load risk history from file"""
-        try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r') as f:
-                    self.risk_history = json.load(f)
-        except Exception as e:
-            print(f"Error loading risk history: {e}")
-            self.risk_history = {}
-
-    def save_risk_history(self):
-        """Save risk history to file"""
-        try:
-            os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
-            with open(self.history_file, 'w') as f:
-                json.dump(self.risk_history, f, indent=2)
-        except Exception as e:
-            print(f"Error saving risk history: {e}")
-
     def get_user_name_for_edit(self):
         """Get user name for edit tracking"""
         dialog = UserInputDialog(self, "Edit Confirmation", "Please enter your name to confirm this edit:")
@@ -1047,36 +1156,18 @@ class RiskManagementSystem(QMainWindow, MainUI):
 
     def record_initial_risk_creation(self, risk_id, user_name, field_data):
         """Record all initial field values for a new risk with the same user name"""
-        if risk_id not in self.risk_history:
-            self.risk_history[risk_id] = []
-
-        # Record creation entry
-        creation_entry = {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'user': user_name,
-            'field': 'Risk Created',
-            'previous_value': '',
-            'new_value': 'New risk entry created'
-        }
-        self.risk_history[risk_id].append(creation_entry)
-
-        # Record all initial field values with the same user name
         field_names = [
             "Date", "Risk No.", "Department", "Device Affected", "Components", "Lifecycle", 
             "Hazard Category", "Hazard Source", "Hazardous Situation", "Sequence of Events", 
             "Harm Influenced", "Harm Description", "Severity", "Probability", "RPN"
         ]
 
-        for i, field_name in enumerate(field_names):
-            if i < len(field_data) and field_data[i]:
-                field_entry = {
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'user': user_name,
-                    'field': field_name,
-                    'previous_value': '',
-                    'new_value': str(field_data[i])
-                }
-                self.risk_history[risk_id].append(field_entry)
+        # The creation entry and every initial field value are written together, with one timestamp
+        with self.risk_history.transaction():
+            self.risk_history.record(risk_id, user_name, 'Risk Created', '', 'New risk entry created')
+            for i, field_name in enumerate(field_names):
+                if i < len(field_data) and field_data[i]:
+                    self.risk_history.record(risk_id, user_name, field_name, '', str(field_data[i]))
 
     def record_edit_history(self, row, column, previous_value, new_value, user_name):
         """Record edit history for a cell"""
@@ -1084,29 +1175,15 @@ class RiskManagementSystem(QMainWindow, MainUI):
         if not risk_id:
             return
 
-        if risk_id not in self.risk_history:
-            self.risk_history[risk_id] = []
-
         # Get field name from column header
-        field_name = self.table_widget.horizontalHeaderItem(column).text()
-
-        history_entry = {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'user': user_name,
-            'field': field_name,
-            'previous_value': previous_value,
-            'new_value': new_value
-        }
+        field_name = RISK_TABLE_HEADERS[column]
 
-        self.risk_history[risk_id].append(history_entry)
-        self.save_risk_history()
+        self.risk_history.record(risk_id, user_name, field_name, previous_value, new_value)
 
     def get_risk_id_for_row(self, row):
         """Get risk ID for a given row"""
-        risk_no_item = self.table_widget.item(row, 1)  # Risk No. is in column 1
-        if risk_no_item:
-            return risk_no_item.text()
-        return None
+        risk = self.risk_store.get(row)
+        return (risk.risk_no or None) if risk else None
 
     def show_risk_history(self, row):
         """Show history dialog for a specific risk"""
@@ -1115,81 +1192,46 @@ class RiskManagementSystem(QMainWindow, MainUI):
             QMessageBox.information(self, "No History", "No risk ID found for this row.")
             return
 
-        history_data = self.risk_history.get(risk_id, [])
-        dialog = RiskHistoryDialog(risk_id, history_data, self)
+        dialog = RiskHistoryDialog(risk_id, self.risk_history, self)
         dialog.exec_()
 
-    def handle_item_changed(self, item):
-        """Handle item changes in table"""
-        row = item.row()
-        column = item.column()
-        
+    def handle_risk_changed(self, row, column, previous_value, new_value):
+        """Handle cell changes reported by the risk model"""
         # Get field name from column header
-        field_name = self.table_widget.horizontalHeaderItem(column).text()
+        field_name = RISK_TABLE_HEADERS[column]
         
         # Special handling for "Approved By" column - don't ask for user name
         if field_name == "Approved By":
-            previous_value = getattr(item, '_previous_value', '')
-            new_value = item.text().strip()
-            
             # Record without asking for user name
             risk_id = self.get_risk_id_for_row(row)
             if risk_id:
-                history_entry = {
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'user': 'System',  # Use 'System' for approval changes
-                    'field': field_name,
-                    'previous_value': previous_value,
-                    'new_value': new_value
-                }
-                
-                if risk_id not in self.risk_history:
-                    self.risk_history[risk_id] = []
-                self.risk_history[risk_id].append(history_entry)
-                self.save_risk_history()
+                # Use 'System' for approval changes
+                self.risk_history.record(risk_id, 'System', field_name, previous_value, new_value)
             
-            # Handle highlighting
-            if new_value:
-                item.setBackground(QColor('white'))
-            else:
-                item.setBackground(QColor('yellow'))
+            self.mark_row_dirty(row)
             return
 
         # For all other fields during editing (not initial creation)
         if not getattr(self, 'is_initial_creation', False):
-            # Hardcoded user name for testing purposes
-            user_name = "Eng. Mahmoud"  # For testing purposes, use a fixed name   
-            if not user_name:
-                # If user cancels, revert the change
-                item.setText(getattr(item, '_previous_value', ''))
-                return
-
-            # Get previous value if stored
-            previous_value = getattr(item, '_previous_value', '')
-            new_value = item.text().strip()
+            # Hardcoded user name for testing purposes, unless an edit session asked for one
+            user_name = self.current_session_user or "Eng. Mahmoud"
 
             # Record the edit in history
             self.record_edit_history(row, column, previous_value, new_value, user_name)
 
-        # Handle highlighting
-        new_value = item.text().strip()
-        if new_value:
-            item.setBackground(QColor('white'))
-        else:
-            item.setBackground(QColor('yellow'))
+        # Situation and harm counts are part of the risk number
+        if column == HAZARDOUS_SITUATION_COLUMN:
+            self.update_situations_and_numbering(row)
+        elif column == HARM_DESCRIPTION_COLUMN:
+            self.update_harms_and_numbering(row)
 
-        # Auto-save after edit
-        self.save_data_to_database()
+        # The edited risk is written on the next save
+        self.mark_row_dirty(row)
 
-    def highlight_missing_cells(self, row):
-        """Highlight missing cells"""
-        for col in range(self.table_widget.columnCount()):
-            item = self.table_widget.item(row, col)
-            if (item is None or not item.text().strip()) and self.table_widget.cellWidget(row, col) is None:
-                if item is None:
-                    item = QTableWidgetItem("")
-                    self.table_widget.setItem(row, col, item)
-                item.setBackground(QColor('yellow'))
+    def on_search_failed(self, message):
+        """Report a type-ahead search that failed in the background"""
+        print(f"❌ Error in background search: {message}")
+        self.statusBar().showMessage(f"❌ Search failed: {message}", 5000)
 
     def check_and_add_new_content(self, content, field_type):
         """Check if content is new and add it to the appropriate dynamic list"""
@@ -1197,15 +1239,12 @@ class RiskManagementSystem(QMainWindow, MainUI):
 
         if field_type == "Sequence of Event":
             if add_new_document(sequence_of_event_documents, content, SEQUENCE_FILE, field_type):
-                refresh_indices()
                 print(f"Added new sequence of event: {content}")
         elif field_type == "Hazardous Situation":
             if add_new_document(hazardous_situation_documents, content, HAZARDOUS_FILE, field_type):
-                refresh_indices()
                 print(f"Added new hazardous situation: {content}")
         elif field_type == "Harm Description":
             if add_new_document(harm_description_documents, content, HARM_FILE, field_type):
-                refresh_indices()
                 print(f"Added new harm description: {content}")
 
     # Include all remaining functions from original system...
@@ -1259,15 +1298,9 @@ class RiskManagementSystem(QMainWindow, MainUI):
         ])
         self.standards_combo.hide()
 
-        self.table_widget.setColumnCount(17)
-        self.table_widget.setHorizontalHeaderLabels([
-            "Date", "Risk No.", "Department", "Device Affected", "Components", "Lifecycle", "Hazard Category",
-            "Hazard Source", "Hazardous Situation", "Sequence of Events", "Harm Influenced", "Harm Description",
-            "Severity", "Probability", "RPN", "Risk Control Actions",  "Approved By"
-        ])
-        self.table_widget.setColumnWidth(15, 800)
+        self.risk_table.setColumnWidth(15, 800)
         
-        self.table_widget.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.risk_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         
         self.dectability_spin_box.setMinimum(1)
         self.dectability_spin_box.setMaximum(10)
@@ -1285,7 +1318,7 @@ class RiskManagementSystem(QMainWindow, MainUI):
         self.probability_description_label.setText('Improbable')
 
         self.rpn_value_label.setStyleSheet("background-color: light gray;")
-        self.table_widget.horizontalHeader().setMinimumSectionSize(350)
+        self.risk_table.horizontalHeader().setMinimumSectionSize(350)
         self.update_rpn_value()
         self.generate_and_set_id()
 
@@ -1330,14 +1363,11 @@ class RiskManagementSystem(QMainWindow, MainUI):
         # Clear the combo box first to avoid duplication
         self.rsk_no_combo.clear()
 
-        # Iterate over all rows in the table and collect Risk No. values from column 1
+        # Collect the Risk No. values of every stored risk
         risk_numbers = set()  # Use a set to avoid duplicates
-        for row in range(self.table_widget.rowCount()):
-            item = self.table_widget.item(row, 1)  # Column 1 is "Risk No."
-            if item:
-                risk_no = item.text().strip()
-                if risk_no:
-                    risk_numbers.add(risk_no)
+        for risk in self.risk_store:
+            if risk.risk_no.strip():
+                risk_numbers.add(risk.risk_no.strip())
 
         # Add sorted list of unique risk numbers to the combo box
         self.rsk_no_combo.addItems(sorted(risk_numbers))
@@ -1350,51 +1380,36 @@ class RiskManagementSystem(QMainWindow, MainUI):
 
     def update_seq_ver_layout(self):
         """Update sequence layout"""
-        self.seq_list_widget.show()
-        line_edit_type = "sequence"
-        self.update_layout(self.sequence_of_event_edit, self.seq_list_widget, line_edit_type)
-        self.start_hide_timer(self.seq_hide_timer, self.seq_list_widget)
+        self.update_layout(self.sequence_of_event_edit, self.seq_list_widget, self.seq_search)
 
     def update_sit_ver_layout(self):
         """Update situation layout"""
-        self.sit_list_widget.show()
-        line_edit_type = "situation"
-        self.update_layout(self.hazardous_situation_edit, self.sit_list_widget, line_edit_type)
-        self.start_hide_timer(self.sit_hide_timer, self.sit_list_widget)
+        self.update_layout(self.hazardous_situation_edit, self.sit_list_widget, self.sit_search)
 
     def update_harm_vec_layout(self):
         """Update harm layout"""
-        self.harm_list_widget.show()
-        line_edit_type = "harm_desc"
-        self.update_layout(self.harm_desc_line, self.harm_list_widget, line_edit_type)
-        self.start_hide_timer(self.harm_hide_timer, self.harm_list_widget)
+        self.update_layout(self.harm_desc_line, self.harm_list_widget, self.harm_search)
 
-    def update_layout(self, line_edit, list_widget, line_edit_type):
-        """Update layout"""
+    def update_layout(self, line_edit, list_widget, search):
+        """Queue a background search for the line edit's text"""
         search_terms = line_edit.text()
-        highlighted_results = []
         if not search_terms:
+            search.cancel()
             list_widget.clear()
             list_widget.hide()
             return
-        if line_edit_type == "harm_desc":
-            results = search_documents(search_terms, harm_description_inverted_index, harm_description_documents)
-            highlighted_results = rank_and_highlight(results, search_terms, harm_description_documents, scores)
-
-        elif line_edit_type == "sequence":
-            results = search_documents(search_terms, sequence_of_event_inverted_index, sequence_of_event_documents)
-            highlighted_results = rank_and_highlight(results, search_terms, sequence_of_event_documents, scores)
-
-        elif line_edit_type == "situation":
-            results = search_documents(search_terms, hazardous_situation_inverted_index, hazardous_situation_documents)
-            highlighted_results = rank_and_highlight(results, search_terms, hazardous_situation_documents, scores)
+        search.request(search_terms)
 
+    def show_search_results(self, list_widget, hide_timer, highlighted_results):
+        """Show the results of the latest search of a field"""
+        list_widget.show()
         list_widget.clear()
         if not highlighted_results:
             list_widget.addItem("No results found")
         else:
             for doc_id, content, score in highlighted_results:
                 list_widget.addItem(f"ID: {doc_id} \n{content}")
+        self.start_hide_timer(hide_timer, list_widget)
 
     def add_to_sequence_of_event_edit(self, item):
         """Add to sequence edit"""
@@ -1481,41 +1496,11 @@ class RiskManagementSystem(QMainWindow, MainUI):
     
     def get_rpn_from_matrix(self, device, severity, probability):
         """Get RPN from device-specific matrix"""
-        matrix_file = os.path.join('Risk Matrix', f"{device.replace(' ', '_')}_matrix.json")
-        
-        try:
-            if os.path.exists(matrix_file):
-                with open(matrix_file, 'r') as f:
-                    matrix_data = json.load(f)
-                
-                # Convert to 0-based indices
-                row = severity - 1
-                col = probability - 1
-                
-                if 0 <= row <= 4 and 0 <= col <= 4:
-                    key = f"{row},{col}"
-                    if key in matrix_data:
-                        return matrix_data[key]["text"]
-            
-            # If file doesn't exist or key not found, return default
-            return self.get_hardcoded_rpn(severity, probability)
-            
-        except Exception as e:
-            print(f"Error reading matrix for {device}: {e}")
-            return self.get_hardcoded_rpn(severity, probability)
+        return matrix_registry.get_rpn(device, severity, probability)
 
     def get_hardcoded_rpn(self, severity, probability):
         """Fallback hardcoded RPN calculation"""
-        if (severity >= 4 and probability >= 3) or (severity == 3 and probability >= 4):
-            return 'High'
-        elif ((severity >= 4 and probability <= 3) or (severity < 3 and probability == 5)
-              or (severity == 2 and probability >= 3) or (severity == 3 and probability in [2, 3])):
-            return 'Medium'
-        elif ((severity == 1 and probability <= 4) or (severity == 2 and probability in [1, 2]) or
-              (severity == 3 and probability == 1)):
-            return 'Low'
-        else:
-            return 'Unknown'
+        return get_default_rpn(severity, probability)
 
     # Include all other functions from the original system...
     def open_chat(self):
@@ -1530,6 +1515,7 @@ class RiskManagementSystem(QMainWindow, MainUI):
             if choice == QMessageBox.No:
                 self.chat_history = ""
 
+        GeminiChatDialog = timed_import('Gemini_app').ChatDialog
         self.chat_dialog = GeminiChatDialog(existing_history=self.chat_history, parent=self)
         self.chat_dialog.finished.connect(self.save_chat_history)
         self.chat_dialog.show()
@@ -1543,7 +1529,6 @@ class RiskManagementSystem(QMainWindow, MainUI):
         """Show the notifications dialog"""
         dialog = NotificationDialog(self)
         dialog.exec_()
-        self.update_notification_count()
 
     def select_devices_widget(self):
         """Select devices widget"""
@@ -1623,10 +1608,11 @@ class RiskManagementSystem(QMainWindow, MainUI):
                     self.notification_counter_label.move(counter_x, counter_y)
         return super().eventFilter(obj, event)
 
-    def update_notification_count(self):
+    def update_notification_count(self, count=None):
         """Update the notification counter display"""
         try:
-            count = get_notification_count()
+            if count is None:
+                count = get_notification_count()
             if self.notification_counter_label:
                 if count > 0:
                     self.notification_counter_label.setText(str(count))
@@ -1667,13 +1653,13 @@ class RiskManagementSystem(QMainWindow, MainUI):
         self.web_combo.MaximumWidth = 150
         self.web_combo.currentTextChanged.connect(self.load_selected_webpage)
         
-        web_layout = QVBoxLayout()
-        web_layout.addWidget(self.web_combo)
-        web_layout.addWidget(self.webEngineView)
+        # The page view itself is only created when the side bar is first opened
+        self.web_layout = QVBoxLayout()
+        self.web_layout.addWidget(self.web_combo)
 
         container = QWidget()
         
-        container.setLayout(web_layout)
+        container.setLayout(self.web_layout)
         self.sideBarFrame.layout().addWidget(container)
         
         self.web_combo.setCurrentText("ISO 14971")
@@ -1681,13 +1667,25 @@ class RiskManagementSystem(QMainWindow, MainUI):
     def load_selected_webpage(self, selected_text):
         """Load selected webpage"""
         url = self.web_links.get(selected_text)
-        if url:
+        if url and self.webEngineView is not None:
             self.webEngineView.setUrl(QUrl(url))
 
+    def get_web_engine_view(self):
+        """Get the shared web view, loading QtWebEngine the first time a page or chart is shown"""
+        if self.webEngineView is None:
+            QWebEngineView = timed_import('PyQt5.QtWebEngineWidgets').QWebEngineView
+            self.webEngineView = QWebEngineView()
+        return self.webEngineView
+
     def toggle_side_bar(self):
         """Toggle side bar"""
         if self.modeSideBar.isChecked():
             new_width = 1000
+            # The shared view may already exist (e.g. from the sunburst chart) without being in the side bar
+            web_view = self.get_web_engine_view()
+            if self.web_layout.indexOf(web_view) == -1:
+                self.web_layout.addWidget(web_view)
+                self.load_selected_webpage(self.web_combo.currentText())
         else:
             new_width = 0
         self.animation = QPropertyAnimation(self.sideBarFrame, b"minimumWidth")
@@ -1753,13 +1751,11 @@ class RiskManagementSystem(QMainWindow, MainUI):
 
     def extract_row(self):
         """Extract row"""
-        selected_items = self.table_widget.selectedItems()
-        if not selected_items:
+        row = self.get_selected_row()
+        if row < 0:
             return
 
-        row = selected_items[0].row()
-        row_data = [self.table_widget.item(row, col).text() if self.table_widget.item(row, col) else "" for col in
-                    range(self.table_widget.columnCount())]
+        row_data = [self.risk_model.get_text(row, col) for col in range(self.risk_model.columnCount())]
 
         options = QFileDialog.Options()
         file_path, _ = QFileDialog.getSaveFileName(self, "Save PDF", "", "PDF Files (*.pdf)", options=options)
@@ -1768,6 +1764,8 @@ class RiskManagementSystem(QMainWindow, MainUI):
 
     def save_to_pdf(self, row_data, file_path):
         """Save to PDF"""
+        canvas = timed_import('reportlab.pdfgen.canvas')
+        letter = timed_import('reportlab.lib.pagesizes').letter
         c = canvas.Canvas(file_path, pagesize=letter)
         width, height = letter
 
@@ -1787,11 +1785,9 @@ class RiskManagementSystem(QMainWindow, MainUI):
 
     def remove_row(self):
         """Remove row"""
-        selected_items = self.table_widget.selectedItems()
-        if not selected_items:
+        row = self.get_selected_row()
+        if row < 0:
             return
-
-        row = selected_items[0].row()
         
         # Get risk ID before removing
         risk_id = self.get_risk_id_for_row(row)
@@ -1803,45 +1799,41 @@ class RiskManagementSystem(QMainWindow, MainUI):
                                    QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            self.table_widget.removeRow(row)
+            risk = self.risk_model.remove_risk(row)
             self.num_risks -= 1
             
+            # Remove the stored record on the next save
+            self.mark_risk_deleted(risk)
+            
             # Remove from risk history
-            if risk_id and risk_id in self.risk_history:
-                del self.risk_history[risk_id]
-                self.save_risk_history()
+            if risk_id:
+                self.risk_history.delete_history(risk_id)
                 
         if self.tree_sidebar and self.tree_sidebar.isVisible():
             self.tree_sidebar.refresh_tree()
     
         if self.traceability_dialog and self.traceability_dialog.isVisible():
             self.traceability_dialog.refresh_graph()
-            
-            # Auto-save after removal
-            self.save_data_to_database()
 
     def open_pdf_dialog(self):
         """Open PDF generation dialog"""
+        PDFDialog = timed_import('pdf_dialog').PDFDialog
         dialog = PDFDialog(self)
         dialog.exec_()
 
     def reject_process(self):
         """Reject process"""
-        selected_items = self.table_widget.selectedItems()
-        if not selected_items:
+        row = self.get_selected_row()
+        if row < 0:
             return
 
-        row = selected_items[0].row()
-
         def reject_action():
             reason = "The process rejected because : " + reason_edit.text()
             if reason:
-                reason_item = QTableWidgetItem(reason)
-                reason_item.setBackground(QColor('black'))
-                self.table_widget.setItem(row, 16, QTableWidgetItem(reason_item))
+                self.risk_model.set_text(row, 16, reason)
                 dialog.accept()
-                # Auto-save after rejection
-                self.save_data_to_database()
+                # Mark the row for the next auto-save
+                self.mark_row_dirty(row)
 
         dialog = QDialog(self)
         dialog.setWindowTitle("Reject the process")
@@ -1904,32 +1896,25 @@ class RiskManagementSystem(QMainWindow, MainUI):
     def add_approval(self, dialog):
         """Add approval"""
         dialog.close()
-        selected_items = self.table_widget.selectedItems()
-        if not selected_items:
+        row = self.get_selected_row()
+        if row < 0:
             return
-        row = selected_items[0].row()
-        self.table_widget.setItem(row, 16, QTableWidgetItem(self.name_of_the_approval))
-        # Auto-save after approval
-        self.save_data_to_database()
+        self.risk_model.set_text(row, 16, self.name_of_the_approval)
+        # Mark the row for the next auto-save
+        self.mark_row_dirty(row)
 
     def show_charts(self):
         """Show charts"""
-        row_count = self.table_widget.rowCount()
-        hazards = []
-        rpn_values = []
-
-        for row in range(row_count):
-            hazard_source_item = self.table_widget.item(row, 7)
-            rpn_item = self.table_widget.item(row, 14)
-
-            if hazard_source_item and rpn_item:
-                hazards.append(hazard_source_item.text())
-                rpn_values.append(rpn_item.text().strip().upper())
+        hazards = [risk.hazard_source for risk in self.risk_store]
+        rpn_values = [risk.rpn.strip().upper() for risk in self.risk_store]
 
         hazard_counts = Counter(hazards)
         sorted_hazard_counts = sorted(hazard_counts.items(), key=lambda x: x[1], reverse=True)
         hazard_labels, hazard_values = zip(*sorted_hazard_counts) if sorted_hazard_counts else ([], [])
 
+        Figure = timed_import('matplotlib.figure').Figure
+        FigureCanvas = timed_import('matplotlib.backends.backend_qtagg').FigureCanvasQTAgg
+
         fig_hazard = Figure()
         canvas_hazard = FigureCanvas(fig_hazard)
         ax_hazard = fig_hazard.add_subplot(111)
@@ -1990,7 +1975,7 @@ class RiskManagementSystem(QMainWindow, MainUI):
 
         layout.addLayout(comboLayout)
         layout.addWidget(showButton)
-        layout.addWidget(self.webEngineView)
+        layout.addWidget(self.get_web_engine_view())
         dialog.setWindowTitle("Sunburst Chart")
         dialog.resize(1300, 1000)
         dialog.exec_()
@@ -2013,16 +1998,18 @@ class RiskManagementSystem(QMainWindow, MainUI):
             'RPN': [],
         }
 
-        for row in range(self.table_widget.rowCount()):
-            data['Department'].append(self.table_widget.item(row, 2).text())
-            data['Device affected'].append(self.table_widget.item(row, 3).text())
-            data['Components'].append(self.table_widget.item(row, 4).text())
-            data['Lifecycle'].append(self.table_widget.item(row, 5).text())
-            data['Hazard Category'].append(self.table_widget.item(row, 6).text())
-            data['Hazard Source'].append(self.table_widget.item(row, 7).text())
-            data['Harm Influenced'].append(self.table_widget.item(row, 10).text())
-            data['RPN'].append(self.table_widget.item(row, 14).text())
-
+        for risk in self.risk_store:
+            data['Department'].append(risk.department)
+            data['Device affected'].append(risk.device_affected)
+            data['Components'].append(risk.components)
+            data['Lifecycle'].append(risk.lifecycle)
+            data['Hazard Category'].append(risk.hazard_category)
+            data['Hazard Source'].append(risk.hazard_source)
+            data['Harm Influenced'].append(risk.harm_influenced)
+            data['RPN'].append(risk.rpn)
+
+        pd = timed_import('pandas')
+        go = timed_import('plotly.graph_objects')
         df = pd.DataFrame(data)
         key1 = self.first_axis.currentText()
         key2 = self.second_axis.currentText()
@@ -2080,50 +2067,77 @@ class RiskManagementSystem(QMainWindow, MainUI):
         if self.checked_items and device in self.checked_items:
             self.update_rpn_value()
 
+    def recompute_matrix_rpns(self, device):
+        """Re-evaluate stored RPNs after a device matrix changed (every device when none is given)"""
+        try:
+            if device:
+                devices = [device]
+            else:
+                devices = {risk.device_list[0] for risk in self.risk_store if risk.device_list}
+            
+            updates = {}
+            level_changes = 0
+            for device_name in devices:
+                device_updates, changed = recompute_rpns(self.risk_store.risks, device_name)
+                updates.update(device_updates)
+                level_changes += changed
+            
+            # Recomputed levels are recorded in history, all of them in one write
+            history_columns = (RPN_COLUMN, HARM_DESCRIPTION_COLUMN)
+            previous_texts = {row: [self.risk_model.get_text(row, column) for column in history_columns]
+                              for row in updates}
+            changed_rows = self.risk_model.update_risks(updates)
+            with self.risk_history.transaction():
+                for row in changed_rows:
+                    self.mark_row_dirty(row)
+                    for column, previous_text in zip(history_columns, previous_texts[row]):
+                        new_text = self.risk_model.get_text(row, column)
+                        if new_text != previous_text:
+                            self.record_edit_history(row, column, previous_text, new_text, 'System')
+            if changed_rows:
+                self.save_data_to_database()
+                self.refresh_tree_views()
+            
+            message = f"🔄 Matrix updated: {level_changes} risks changed RPN level, {len(changed_rows)} risks updated"
+            print(message)
+            self.statusBar().showMessage(message, 10000)
+            return level_changes
+        except Exception as e:
+            print(f"❌ Error recomputing RPNs: {e}")
+            return 0
+
     def apply_single_filter(self, filter_type, filter_value):
         """Apply single filter to the table"""
-        # Hide all rows first
-        for row in range(self.table_widget.rowCount()):
-            self.table_widget.setRowHidden(row, True)
-
-        # Show rows that match the filter criteria
-        for row in range(self.table_widget.rowCount()):
-            show_row = False
-
-            if filter_type == "Device":
-                device_item = self.table_widget.item(row, 3)  # Device Affected column
-                if device_item and filter_value in device_item.text():
-                    show_row = True
-
-            elif filter_type == "Risk Level":
-                risk_item = self.table_widget.item(row, 14)  # RPN column
-                if risk_item and risk_item.text() == filter_value:
-                    show_row = True
-
-            elif filter_type == "Approval Status":
-                approval_item = self.table_widget.item(row, 16)  # Approved By column
-                approval_status = "Pending"  # Default status
-                if approval_item and approval_item.text().strip():
-                    if "rejected" in approval_item.text().lower():
-                        approval_status = "Rejected"
-                    else:
-                        approval_status = "Approved"
-                
-                if approval_status == filter_value:
-                    show_row = True
+        # The proxy hides rows that don't match the filter criteria
+        self.risk_proxy.set_row_filter(lambda risk: self.risk_matches_filter(risk, filter_type, filter_value))
+
+    def risk_matches_filter(self, risk, filter_type, filter_value):
+        """Check whether a risk matches a single filter"""
+        if filter_type == "Device":
+            return filter_value in risk.device_affected
+
+        elif filter_type == "Risk Level":
+            return risk.rpn == filter_value
+
+        elif filter_type == "Approval Status":
+            approval_text = risk.approved_by
+            approval_status = "Pending"  # Default status
+            if approval_text.strip():
+                if "rejected" in approval_text.lower():
+                    approval_status = "Rejected"
+                else:
+                    approval_status = "Approved"
+            
+            return approval_status == filter_value
 
-            elif filter_type == "Department":
-                dept_item = self.table_widget.item(row, 2)  # Department column
-                if dept_item and dept_item.text() == filter_value:
-                    show_row = True
+        elif filter_type == "Department":
+            return risk.department == filter_value
 
-            # Show/hide the row based on filter results
-            self.table_widget.setRowHidden(row, not show_row)
+        return False
 
     def clear_table_filters(self):
         """Clear all table filters and show all rows"""
-        for row in range(self.table_widget.rowCount()):
-            self.table_widget.setRowHidden(row, False)
+        self.risk_proxy.set_row_filter(None)
 
     def open_filter_dialog(self):
         """Open the filter dialog"""
@@ -2132,14 +2146,19 @@ class RiskManagementSystem(QMainWindow, MainUI):
 
     def open_traceability_dialog(self):
         """Open the traceability dialog"""
+        TraceabilityDialog = timed_import('traceability_dialog').TraceabilityDialog
         dialog = TraceabilityDialog(self)
         dialog.exec_()
 
 
 def main():
+    # QtWebEngine is loaded after the application starts, which needs shared OpenGL contexts set beforehand
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     window = RiskManagementSystem()
     window.show()
+    mark_startup_stage("main window shown")
+    print_startup_report()
     sys.exit(app.exec_())
 
 
@@ -0,0 +1,77 @@
+from collections import Counter, defaultdict
+
+
+def get_max_distance(term):
+    """Allowed edit distance for a term: exact for very short terms, more slack for longer ones"""
+    if len(term) <= 2:
+        return 0
+    if len(term) <= 5:
+        return 1
+    return 2
+
+
+def get_trigrams(term):
+    """Get the padded trigrams of a term"""
+    padded = f"$${term}$$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def within_distance(first, second, max_distance):
+    """Check whether two terms are at most max_distance edits apart (banded Levenshtein)"""
+    if abs(len(first) - len(second)) > max_distance:
+        return False
+    previous_row = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current_row = [i]
+        for j, second_char in enumerate(second, 1):
+            current_row.append(min(previous_row[j] + 1, current_row[j - 1] + 1,
+                                   previous_row[j - 1] + (first_char != second_char)))
+        if min(current_row) > max_distance:
+            return False
+        previous_row = current_row
+    return previous_row[-1] <= max_distance
+
+
+class TrigramIndex:
+    """Vocabulary index that finds terms within a small edit distance via shared trigrams"""
+
+    def __init__(self, terms=()):
+        self.postings = defaultdict(set)  # trigram -> terms
+        self.terms = set()
+        for term in terms:
+            self.add(term)
+
+    def add(self, term):
+        if term in self.terms:
+            return
+        self.terms.add(term)
+        for trigram in get_trigrams(term):
+            self.postings[trigram].add(term)
+
+    def discard(self, term):
+        if term not in self.terms:
+            return
+        self.terms.discard(term)
+        for trigram in get_trigrams(term):
+            self.postings[trigram].discard(term)
+            if not self.postings[trigram]:
+                del self.postings[trigram]
+
+    def lookup(self, term, max_distance=None):
+        """Get the indexed terms within max_distance edits of a term"""
+        if max_distance is None:
+            max_distance = get_max_distance(term)
+        if max_distance == 0:
+            return [term] if term in self.terms else []
+
+        # Each edit changes at most 3 trigrams, so a match shares all but 3 * max_distance of them;
+        # counting shared trigrams over the posting lists leaves only a handful of terms to verify
+        query_trigrams = get_trigrams(term)
+        required = len(query_trigrams) - 3 * max_distance
+        shared_counts = Counter()
+        for trigram in query_trigrams:
+            shared_counts.update(self.postings.get(trigram, ()))
+
+        return [candidate for candidate, shared in shared_counts.items()
+                if shared >= required and abs(len(candidate) - len(term)) <= max_distance
+                and within_distance(term, candidate, max_distance)]
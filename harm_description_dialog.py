@@ -4,6 +4,7 @@ from PyQt5.QtGui import QFont, QColor
 import json
 import os
 from search import *
+from rpn_matrix import matrix_registry, get_default_rpn
 from PyQt5.QtWidgets import (QPushButton, QLabel, QApplication, QMainWindow, QWidget, QVBoxLayout, QComboBox, QListWidget,
                              QAbstractItemView, QMenu, QDialog, QHBoxLayout, QScrollArea, QTreeWidget, QTreeWidgetItem,
                              QCheckBox, QGroupBox, QMessageBox, QTableWidgetItem, QTableWidget, QLineEdit, QSpinBox, QAction, QFileDialog)
@@ -153,11 +154,11 @@ class HarmDescriptionDialog(QDialog):
 
         # Search in harm description documents
         results = search_documents(search_terms, harm_description_inverted_index, harm_description_documents)
-        highlighted_results = rank_and_highlight(results, search_terms, harm_description_documents, scores)
+        highlighted_results = rank_and_highlight(results, harm_description_documents, scores, top_k=8)
 
         self.suggestions_list.clear()
         if highlighted_results:
-            for doc_id, content, score in highlighted_results[:8]:
+            for doc_id, content, score in highlighted_results:
                 clean_content = content.replace(" *", " ").replace("* ", " ")
                 self.suggestions_list.addItem(f"ID: {doc_id} - {clean_content}")
 
@@ -198,39 +199,11 @@ class HarmDescriptionDialog(QDialog):
 
     def get_rpn_from_matrix(self, device, severity, probability):
         """Get RPN from device-specific matrix"""
-        matrix_file = os.path.join('Risk Matrix', f"{device.replace(' ', '_')}_matrix.json")
-        
-        try:
-            if os.path.exists(matrix_file):
-                with open(matrix_file, 'r') as f:
-                    matrix_data = json.load(f)
-                
-                row = severity - 1
-                col = probability - 1
-                
-                if 0 <= row <= 4 and 0 <= col <= 4:
-                    key = f"{row},{col}"
-                    if key in matrix_data:
-                        return matrix_data[key]["text"]
-            
-            return self.get_default_rpn(severity, probability)
-            
-        except Exception as e:
-            print(f"Error reading matrix for {device}: {e}")
-            return self.get_default_rpn(severity, probability)
+        return matrix_registry.get_rpn(device, severity, probability)
 
     def get_default_rpn(self, severity, probability):
         """Default RPN calculation logic"""
-        if (severity >= 4 and probability >= 3) or (severity == 3 and probability >= 4):
-            return 'High'
-        elif ((severity >= 4 and probability <= 3) or (severity < 3 and probability == 5)
-              or (severity == 2 and probability >= 3) or (severity == 3 and probability in [2, 3])):
-            return 'Medium'
-        elif ((severity == 1 and probability <= 4) or (severity == 2 and probability in [1, 2]) or
-              (severity == 3 and probability == 1)):
-            return 'Low'
-        else:
-            return 'Unknown'
+        return get_default_rpn(severity, probability)
 
     def add_harm(self):
         """Add a new harm description with RPN data"""
@@ -380,8 +353,7 @@ class HarmDescriptionDialog(QDialog):
     def check_and_add_to_documents(self, harm_text):
         """Check if the harm is new and add it to the dynamic documents"""
         global harm_description_documents
-        if add_new_document(harm_description_documents, harm_text, HARM_FILE, "Harm Description"):
-            refresh_indices()
+        add_new_document(harm_description_documents, harm_text, HARM_FILE, "Harm Description")
 
     def get_harms(self):
         """Get all harms as a list"""
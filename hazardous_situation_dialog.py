@@ -87,11 +87,11 @@ class HazardousSituationDialog(QDialog):
 
         # Search in hazardous situation documents
         results = search_documents(search_terms, hazardous_situation_inverted_index, hazardous_situation_documents)
-        highlighted_results = rank_and_highlight(results, search_terms, hazardous_situation_documents, scores)
+        highlighted_results = rank_and_highlight(results, hazardous_situation_documents, scores, top_k=10)
 
         self.suggestions_list.clear()
         if highlighted_results:
-            for doc_id, content, score in highlighted_results[:10]:
+            for doc_id, content, score in highlighted_results:
                 clean_content = content.replace(" *", " ").replace("* ", " ")
                 self.suggestions_list.addItem(f"ID: {doc_id} - {clean_content}")
 
@@ -188,8 +188,7 @@ class HazardousSituationDialog(QDialog):
     def check_and_add_to_documents(self, situation_text):
         """Check if the situation is new and add it to the dynamic documents"""
         global hazardous_situation_documents
-        if add_new_document(hazardous_situation_documents, situation_text, HAZARDOUS_FILE, "Hazardous Situation"):
-            refresh_indices()
+        add_new_document(hazardous_situation_documents, situation_text, HAZARDOUS_FILE, "Hazardous Situation")
 
     def get_situations(self):
         """Get all situations as a list"""
@@ -153,8 +153,7 @@ class HazardousSituationCardWidget(QWidget):
     def check_and_add_to_documents(self, situation_text):
         """Check if the situation is new and add it to the dynamic documents"""
         global hazardous_situation_documents
-        if add_new_document(hazardous_situation_documents, situation_text, HAZARDOUS_FILE, "Hazardous Situation"):
-            refresh_indices()
+        add_new_document(hazardous_situation_documents, situation_text, HAZARDOUS_FILE, "Hazardous Situation")
 
     def get_situations_list(self):
         """Get the situations as a list"""
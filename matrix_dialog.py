@@ -1,14 +1,15 @@
 import json
 import os
-from PyQt5.QtGui import QColor, QIcon
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import QDateTime, QPropertyAnimation, QEasingCurve, QUrl, QTimer
-from PyQt5.QtWidgets import (QPushButton, QLabel, QApplication, QMainWindow, QWidget, QVBoxLayout, QComboBox,
-                             QAbstractItemView, QMenu, QDialog, QHBoxLayout, QScrollArea, QTreeWidget, QTreeWidgetItem,
-                             QCheckBox, QGroupBox, QMessageBox, QTableWidgetItem, QTableWidget, QLineEdit, QSpinBox, QAction, QFileDialog, QInputDialog)
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import (QPushButton, QLabel, QVBoxLayout, QComboBox, QMenu, QDialog, QHBoxLayout, QGroupBox,
+                             QMessageBox, QTableWidgetItem, QTableWidget, QAction, QInputDialog)
 from PyQt5 import QtCore
+from rpn_matrix import matrix_registry, get_matrix_file, MATRIX_DIR
 
 class MatrixDialog(QDialog):
+    matrix_saved = pyqtSignal(str)  # device
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Device-Specific Risk Matrix")
@@ -16,7 +17,9 @@ class MatrixDialog(QDialog):
         self.parent_window = parent
         self.current_device = None
         self.matrix_data = {}
-        self.matrix_base_path = 'Risk Matrix'
+        self.changed_devices = set()  # Edited matrices, saved and applied once when the dialog is accepted
+        self.matrix_base_path = MATRIX_DIR
+        self.matrix_saved.connect(matrix_registry.invalidate)
         
         # Ensure directory exists
         if not os.path.exists(self.matrix_base_path):
@@ -139,7 +142,24 @@ class MatrixDialog(QDialog):
         test_button.clicked.connect(self.test_rpn_calculation)
         button_layout.addWidget(test_button)
 
-        close_button = QPushButton("Close")
+        cancel_button = QPushButton("Cancel")
+        cancel_button.setStyleSheet("""
+            QPushButton {
+                background-color: #95a5a6;
+                color: white;
+                border: none;
+                padding: 10px 20px;
+                border-radius: 5px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #7f8c8d;
+            }
+        """)
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_button)
+
+        close_button = QPushButton("Save && Close")
         close_button.setStyleSheet("""
             QPushButton {
                 background-color: #95a5a6;
@@ -153,7 +173,7 @@ class MatrixDialog(QDialog):
                 background-color: #7f8c8d;
             }
         """)
-        close_button.clicked.connect(self.close)
+        close_button.clicked.connect(self.accept)
         button_layout.addWidget(close_button)
 
         main_layout.addLayout(button_layout)
@@ -200,7 +220,7 @@ class MatrixDialog(QDialog):
         devices = ["EzVent 101", "EzVent 201", "EzVent 202", "SleepEZ", "Syringe pump", "Oxygen concentrator"]
         
         for device in devices:
-            filename = os.path.join(self.matrix_base_path, f"{device.replace(' ', '_')}_matrix.json")
+            filename = get_matrix_file(device)
             if os.path.exists(filename):
                 try:
                     with open(filename, 'r') as f:
@@ -213,13 +233,30 @@ class MatrixDialog(QDialog):
 
     def save_matrix_for_device(self, device):
         """Save matrix for specific device"""
-        filename = os.path.join(self.matrix_base_path, f"{device.replace(' ', '_')}_matrix.json")
+        filename = get_matrix_file(device)
         try:
             with open(filename, 'w') as f:
                 json.dump(self.matrix_data[device], f, indent=2)
+            self.matrix_saved.emit(device)
         except Exception as e:
             print(f"Error saving matrix for {device}: {e}")
 
+    def apply_changes(self):
+        """Save the edited matrices and notify the parent window, once per edited device"""
+        for device in sorted(self.changed_devices):
+            self.save_matrix_for_device(device)
+            
+            # Notify parent to update RPN calculations
+            if hasattr(self.parent_window, 'on_matrix_updated'):
+                self.parent_window.on_matrix_updated(device)
+        self.changed_devices.clear()
+
+    def done(self, result):
+        """Apply the edits when the dialog is accepted; Cancel, Esc or the window close button discard them"""
+        if result == QDialog.Accepted:
+            self.apply_changes()
+        super().done(result)
+
     def on_device_changed(self):
         """Handle device selection change"""
         self.current_device = self.device_combo.currentText()
@@ -296,13 +333,9 @@ class MatrixDialog(QDialog):
                 "color": color
             }
         
-        # Save changes
-        self.save_matrix_for_device(self.current_device)
+        # Saved when the dialog is accepted, so stored RPNs are recomputed once rather than on every click
+        self.changed_devices.add(self.current_device)
         self.update_selection_info()
-        
-        # Notify parent to update RPN calculations
-        if hasattr(self.parent_window, 'on_matrix_updated'):
-            self.parent_window.on_matrix_updated(self.current_device)
 
     def update_selection_info(self):
         """Update selection information"""
@@ -340,7 +373,7 @@ class MatrixDialog(QDialog):
             
             if reply == QMessageBox.Yes:
                 self.matrix_data[self.current_device] = self.matrix_data[source_device].copy()
-                self.save_matrix_for_device(self.current_device)
+                self.changed_devices.add(self.current_device)
                 self.load_matrix_to_table()
                 QMessageBox.information(self, "Success", f"Matrix copied from {source_device}")
 
@@ -354,7 +387,7 @@ class MatrixDialog(QDialog):
         
         if reply == QMessageBox.Yes:
             self.matrix_data[self.current_device] = self.get_default_matrix()
-            self.save_matrix_for_device(self.current_device)
+            self.changed_devices.add(self.current_device)
             self.load_matrix_to_table()
             QMessageBox.information(self, "Success", "Matrix reset to default values")
 
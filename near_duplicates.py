@@ -0,0 +1,160 @@
+import re
+import zlib
+import numpy as np
+from collections import defaultdict
+from PyQt5.QtCore import QObject
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# 64 MinHash permutations split into 16 LSH bands of 4 rows: pairs around 50% similar start to share a band
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+DUPLICATE_THRESHOLD = 0.6  # Estimated Jaccard similarity from which two risks are flagged as duplicates
+
+# Universal hashing (a * x + b) mod p; with p < 2**31 the products stay within uint64
+HASH_PRIME = (1 << 31) - 1
+random_state = np.random.RandomState(1)
+HASH_A = random_state.randint(1, HASH_PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+HASH_B = random_state.randint(0, HASH_PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+
+def get_shingles(situations, events, harms):
+    """Get the word pairs of every situation, event and harm (single words for one-word entries)"""
+    shingles = set()
+    for entry in [*situations, *events, *harms]:
+        words = WORD_PATTERN.findall(entry.lower())
+        if len(words) == 1:
+            shingles.add(words[0])
+        shingles.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return frozenset(shingles)
+
+
+def compute_signature(shingles):
+    """MinHash signature of a shingle set, or None when there is nothing to compare"""
+    if not shingles:
+        return None
+    hashes = np.array([zlib.crc32(shingle.encode('utf-8')) for shingle in shingles], dtype=np.uint64) % HASH_PRIME
+    return ((np.outer(HASH_A, hashes) + HASH_B[:, None]) % HASH_PRIME).min(axis=1)
+
+
+def get_band_keys(signature):
+    return [(band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()) for band in range(LSH_BANDS)]
+
+
+def estimate_similarity(first_signature, second_signature):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.mean(first_signature == second_signature))
+
+
+class NearDuplicateIndex(QObject):
+    """MinHash/LSH index over the situations, events and harms of every risk, kept in step with a RiskTableModel
+
+    Risks are keyed by record ID, like RiskSearchIndex.
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.risks_by_id = {}
+        self.shingles_by_risk = {}  # record ID -> shingles its signature was computed from
+        self.signatures = {}  # record ID -> MinHash signature
+        self.buckets = defaultdict(set)  # (band, band hash) -> record IDs
+
+        model.rowsInserted.connect(lambda parent, first, last: self.index_rows(first, last))
+        model.rowsAboutToBeRemoved.connect(lambda parent, first, last: self.unindex_rows(first, last))
+        model.dataChanged.connect(lambda top_left, bottom_right: self.index_rows(top_left.row(), bottom_right.row()))
+        model.modelReset.connect(self.rebuild)
+        self.rebuild()
+
+    def rebuild(self):
+        self.risks_by_id.clear()
+        self.shingles_by_risk.clear()
+        self.signatures.clear()
+        self.buckets.clear()
+        self.index_rows(0, len(self.model.store) - 1)
+
+    def index_rows(self, first, last):
+        """Index new or edited rows, recomputing signatures only when their text changed"""
+        for row in range(first, last + 1):
+            risk = self.model.store.get(row)
+            if risk is None:
+                continue
+            shingles = get_shingles(risk.situations, risk.events, risk.harms)
+            if self.shingles_by_risk.get(risk.record_id) == shingles:
+                continue
+            self.remove_risk(risk.record_id)
+            signature = compute_signature(shingles)
+            self.risks_by_id[risk.record_id] = risk
+            self.shingles_by_risk[risk.record_id] = shingles
+            if signature is not None:
+                self.signatures[risk.record_id] = signature
+                for key in get_band_keys(signature):
+                    self.buckets[key].add(risk.record_id)
+
+    def unindex_rows(self, first, last):
+        for row in range(first, last + 1):
+            risk = self.model.store.get(row)
+            if risk is not None:
+                self.remove_risk(risk.record_id)
+
+    def remove_risk(self, risk_id):
+        self.risks_by_id.pop(risk_id, None)
+        self.shingles_by_risk.pop(risk_id, None)
+        signature = self.signatures.pop(risk_id, None)
+        if signature is None:
+            return
+        for key in get_band_keys(signature):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(risk_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def get_candidates(self, signature):
+        """Get the record IDs of the risks sharing at least one LSH band with a signature"""
+        candidates = set()
+        for key in get_band_keys(signature):
+            candidates.update(self.buckets.get(key, ()))
+        return candidates
+
+    def find_similar(self, situations, events, harms, threshold=DUPLICATE_THRESHOLD):
+        """Get [(similarity, Risk)] of the stored risks likely duplicating the given text, most similar first"""
+        signature = compute_signature(get_shingles(situations, events, harms))
+        if signature is None:
+            return []
+        matches = []
+        for risk_id in self.get_candidates(signature):
+            similarity = estimate_similarity(signature, self.signatures[risk_id])
+            if similarity >= threshold:
+                matches.append((similarity, self.risks_by_id[risk_id]))
+        matches.sort(key=lambda match: match[0], reverse=True)
+        return matches
+
+    def find_clusters(self, threshold=DUPLICATE_THRESHOLD):
+        """Group the whole register into clusters of likely duplicates; returns lists of Risks, largest first"""
+        parents = {}
+
+        def find_root(risk_id):
+            parents.setdefault(risk_id, risk_id)
+            while parents[risk_id] != risk_id:
+                parents[risk_id] = parents[parents[risk_id]]
+                risk_id = parents[risk_id]
+            return risk_id
+
+        # Only risks sharing a band are compared, never the whole register pairwise
+        compared = set()
+        for bucket in self.buckets.values():
+            members = sorted(bucket)
+            for i, first_id in enumerate(members):
+                for second_id in members[i + 1:]:
+                    if (first_id, second_id) in compared:
+                        continue
+                    compared.add((first_id, second_id))
+                    if estimate_similarity(self.signatures[first_id], self.signatures[second_id]) >= threshold:
+                        parents[find_root(first_id)] = find_root(second_id)
+
+        clusters = defaultdict(list)
+        for risk_id in parents:
+            clusters[find_root(risk_id)].append(self.risks_by_id[risk_id])
+        return sorted((cluster for cluster in clusters.values() if len(cluster) > 1), key=len, reverse=True)
@@ -0,0 +1,100 @@
+from PyQt5.QtCore import Qt, QRect, QSize
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from notification_model import NOTIFICATION_ROLE, IS_NEW_ROLE
+
+CARD_MARGIN = 5
+CARD_PADDING = 12
+CONTENT_PADDING = 8
+HEADER_SPACING = 8
+
+
+class NotificationDelegate(QStyledItemDelegate):
+    """Paints a notification as a card (NEW badge, field, timestamp and content) without any per-row widget"""
+
+    def get_content_width(self, option):
+        # The view passes its item rect, which is empty while sizes are first computed
+        width = option.rect.width()
+        view = self.parent()
+        if width <= 0 and view is not None:
+            width = view.viewport().width()
+        return max(width - 2 * (CARD_MARGIN + CARD_PADDING + CONTENT_PADDING), 50)
+
+    def get_content_rect(self, option, text, width):
+        return QFontMetrics(option.font).boundingRect(QRect(0, 0, width, 100000), Qt.TextWordWrap, text)
+
+    def paint(self, painter, option, index):
+        notification = index.data(NOTIFICATION_ROLE)
+        if notification is None:
+            return
+        is_new = index.data(IS_NEW_ROLE)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        card_rect = option.rect.adjusted(CARD_MARGIN, CARD_MARGIN, -CARD_MARGIN, -CARD_MARGIN)
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        if is_new:
+            painter.setPen(QPen(QColor('#e74c3c'), 2))
+            painter.setBrush(QColor('#fff5f5'))
+        else:
+            painter.setPen(QPen(QColor('#bdc3c7'), 1))
+            painter.setBrush(QColor('#f8f9fa'))
+        painter.drawRoundedRect(card_rect, 8, 8)
+
+        area = card_rect.adjusted(CARD_PADDING, CARD_PADDING, -CARD_PADDING, -CARD_PADDING)
+        bold_font = QFont(option.font)
+        bold_font.setBold(True)
+        header_height = QFontMetrics(bold_font).height()
+        x = area.left()
+
+        # Header: NEW badge, field type, timestamp on the right
+        if is_new:
+            badge_font = QFont(bold_font)
+            badge_font.setPointSizeF(max(option.font.pointSizeF() - 2, 6))
+            badge_width = QFontMetrics(badge_font).width("NEW") + 16
+            badge_rect = QRect(x, area.top(), badge_width, header_height)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor('#e74c3c'))
+            painter.drawRoundedRect(badge_rect, header_height / 2, header_height / 2)
+            painter.setFont(badge_font)
+            painter.setPen(QColor('white'))
+            painter.drawText(badge_rect, Qt.AlignCenter, "NEW")
+            x += badge_width + HEADER_SPACING
+
+        timestamp = notification.get('timestamp', '')
+        timestamp_width = QFontMetrics(option.font).width(timestamp)
+        painter.setFont(option.font)
+        painter.setPen(QColor('#7f8c8d'))
+        painter.drawText(QRect(area.right() - timestamp_width, area.top(), timestamp_width, header_height),
+                         Qt.AlignRight | Qt.AlignVCenter, timestamp)
+
+        field_rect = QRect(x, area.top(), area.right() - timestamp_width - HEADER_SPACING - x, header_height)
+        painter.setFont(bold_font)
+        painter.setPen(QColor('#2c3e50'))
+        painter.drawText(field_rect, Qt.AlignLeft | Qt.AlignVCenter, QFontMetrics(bold_font).elidedText(
+            f"Field: {notification.get('field_type', '')}", Qt.ElideRight, field_rect.width()))
+
+        # Content box
+        content_box = QRect(area.left(), area.top() + header_height + HEADER_SPACING,
+                            area.width(), area.bottom() - area.top() - header_height - HEADER_SPACING)
+        painter.setPen(QPen(QColor('#ecf0f1')))
+        painter.setBrush(QColor('white'))
+        painter.drawRoundedRect(content_box, 4, 4)
+        painter.setFont(option.font)
+        painter.setPen(QColor('black'))
+        painter.drawText(content_box.adjusted(CONTENT_PADDING, CONTENT_PADDING, -CONTENT_PADDING, -CONTENT_PADDING),
+                         Qt.TextWordWrap, notification.get('content', ''))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        notification = index.data(NOTIFICATION_ROLE)
+        if notification is None:
+            return super().sizeHint(option, index)
+        bold_font = QFont(option.font)
+        bold_font.setBold(True)
+        width = self.get_content_width(option)
+        content_height = self.get_content_rect(option, notification.get('content', ''), width).height()
+        height = (2 * (CARD_MARGIN + CARD_PADDING + CONTENT_PADDING) + QFontMetrics(bold_font).height()
+                  + HEADER_SPACING + content_height)
+        return QSize(width + 2 * (CARD_MARGIN + CARD_PADDING + CONTENT_PADDING), height)
@@ -1,9 +1,10 @@
-from PyQt5.QtWidgets import *
 from PyQt5.QtCore import Qt
-from search import *
-from PyQt5.QtWidgets import (QPushButton, QLabel, QApplication, QMainWindow, QWidget, QVBoxLayout, QComboBox,
-                             QAbstractItemView, QMenu, QDialog, QHBoxLayout, QScrollArea, QTreeWidget, QTreeWidgetItem,
-                             QCheckBox, QGroupBox, QMessageBox, QFileDialog)
+from search import clear_notifications, mark_notifications_as_read
+from notification_service import notification_service
+from notification_model import NotificationListModel
+from notification_delegate import NotificationDelegate
+from PyQt5.QtWidgets import (QPushButton, QLabel, QVBoxLayout, QComboBox, QAbstractItemView, QDialog, QHBoxLayout,
+                             QListView, QMessageBox)
 
 class NotificationDialog(QDialog):
     """Dialog to display notifications of newly added sentences"""
@@ -12,6 +13,8 @@ class NotificationDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("New Additions Notifications")
         self.setGeometry(200, 200, 800, 600)
+        # Dropped when closed, so the model stops following the notification service
+        self.setAttribute(Qt.WA_DeleteOnClose)
         self.setupUI()
         self.load_notifications()
 
@@ -28,13 +31,34 @@ class NotificationDialog(QDialog):
         info_label.setStyleSheet("font-size: 12px; color: #7f8c8d; margin-bottom: 10px;")
         layout.addWidget(info_label)
 
-        # Scroll area for notifications
-        scroll_area = QScrollArea()
-        scroll_widget = QWidget()
-        self.scroll_layout = QVBoxLayout(scroll_widget)
-        scroll_area.setWidget(scroll_widget)
-        scroll_area.setWidgetResizable(True)
-        layout.addWidget(scroll_area)
+        # Field type filter and count
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Field:"))
+        self.field_filter = QComboBox()
+        self.field_filter.currentIndexChanged.connect(self.apply_field_filter)
+        filter_layout.addWidget(self.field_filter)
+        filter_layout.addStretch()
+        self.count_label = QLabel()
+        self.count_label.setStyleSheet("font-size: 11px; color: #7f8c8d;")
+        filter_layout.addWidget(self.count_label)
+        layout.addLayout(filter_layout)
+
+        # Only the visible notifications are painted; older pages are fetched as the list scrolls down
+        self.notification_model = NotificationListModel(parent=self)
+        self.notification_model.modelReset.connect(self.update_count)
+        self.notification_model.rowsInserted.connect(self.update_count)
+        self.notification_list = QListView()
+        self.notification_list.setModel(self.notification_model)
+        self.notification_list.setItemDelegate(NotificationDelegate(self.notification_list))
+        self.notification_list.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.notification_list.setResizeMode(QListView.Adjust)
+        self.notification_list.setSelectionMode(QAbstractItemView.NoSelection)
+        self.notification_list.setStyleSheet("QListView { background-color: white; }")
+        layout.addWidget(self.notification_list)
+
+        self.empty_label = QLabel("No new additions to display.")
+        self.empty_label.setStyleSheet("color: gray; font-style: italic; padding: 20px; text-align: center;")
+        layout.addWidget(self.empty_label)
 
         # Buttons
         button_layout = QHBoxLayout()
@@ -93,92 +117,28 @@ class NotificationDialog(QDialog):
         layout.addLayout(button_layout)
 
     def load_notifications(self):
-        """Load and display notifications"""
-        notifications = load_notifications()
-
-        if not notifications:
-            no_notifications_label = QLabel("No new additions to display.")
-            no_notifications_label.setStyleSheet("color: gray; font-style: italic; padding: 20px; text-align: center;")
-            self.scroll_layout.addWidget(no_notifications_label)
-            return
-
-        # Sort notifications by timestamp (newest first)
-        notifications.sort(key=lambda x: x['timestamp'], reverse=True)
-
-        for notification in notifications:
-            self.add_notification_widget(notification)
-
-    def add_notification_widget(self, notification):
-        """Add a single notification widget"""
-        # Create container widget
-        container = QWidget()
-        is_new = notification.get('is_new', True)
-
-        if is_new:
-            container.setStyleSheet("""
-                QWidget {
-                    border: 2px solid #e74c3c;
-                    border-radius: 8px;
-                    margin: 5px;
-                    padding: 12px;
-                    background-color: #fff5f5;
-                }
-            """)
-        else:
-            container.setStyleSheet("""
-                QWidget {
-                    border: 1px solid #bdc3c7;
-                    border-radius: 8px;
-                    margin: 5px;
-                    padding: 12px;
-                    background-color: #f8f9fa;
-                }
-            """)
-
-        layout = QVBoxLayout(container)
-
-        # Header with field type and timestamp
-        header_layout = QHBoxLayout()
-
-        # New badge
-        if is_new:
-            new_badge = QLabel("NEW")
-            new_badge.setStyleSheet("""
-                background-color: #e74c3c;
-                color: white;
-                padding: 2px 8px;
-                border-radius: 10px;
-                font-size: 10px;
-                font-weight: bold;
-            """)
-            new_badge.setMaximumWidth(40)
-            header_layout.addWidget(new_badge)
-
-        field_label = QLabel(f"Field: {notification['field_type']}")
-        field_label.setStyleSheet("font-weight: bold; color: #2c3e50; background: transparent; border: none;")
-        header_layout.addWidget(field_label)
-
-        header_layout.addStretch()
-
-        timestamp_label = QLabel(notification['timestamp'])
-        timestamp_label.setStyleSheet("color: #7f8c8d; font-size: 11px; background: transparent; border: none;")
-        header_layout.addWidget(timestamp_label)
-
-        layout.addLayout(header_layout)
-
-        # Content
-        content_label = QLabel(notification['content'])
-        content_label.setWordWrap(True)
-        content_label.setStyleSheet("""
-            margin-top: 8px; 
-            padding: 8px; 
-            background-color: white; 
-            border-radius: 4px;
-            border: 1px solid #ecf0f1;
-        """)
-        layout.addWidget(content_label)
-
-        self.scroll_layout.addWidget(container)
+        """Fill the field filter; the list itself follows the notification service"""
+        self.field_filter.blockSignals(True)
+        self.field_filter.clear()
+        self.field_filter.addItem("All fields", None)
+        for field_type in notification_service.get_field_types():
+            self.field_filter.addItem(field_type, field_type)
+        # Keep the current filter while its field type still has notifications
+        self.field_filter.setCurrentIndex(max(self.field_filter.findData(self.notification_model.field_type), 0))
+        self.field_filter.blockSignals(False)
+        self.apply_field_filter()
+        self.update_count()
+
+    def apply_field_filter(self):
+        """Show only the notifications of the selected field type"""
+        self.notification_model.set_field_type(self.field_filter.currentData())
+        self.notification_list.scrollToTop()
+
+    def update_count(self, *args):
+        total_count = self.notification_model.get_total_count()
+        self.count_label.setText(f"Showing {self.notification_model.rowCount()} of {total_count}")
+        self.notification_list.setVisible(total_count > 0)
+        self.empty_label.setVisible(total_count == 0)
 
     def clear_notifications(self):
         """Clear all notifications"""
@@ -189,18 +149,7 @@ class NotificationDialog(QDialog):
 
         if reply == QMessageBox.Yes:
             clear_notifications()
-            # Clear the display
-            for i in reversed(range(self.scroll_layout.count())):
-                self.scroll_layout.itemAt(i).widget().setParent(None)
-
-            # Show empty message
-            no_notifications_label = QLabel("No new additions to display.")
-            no_notifications_label.setStyleSheet("color: gray; font-style: italic; padding: 20px; text-align: center;")
-            self.scroll_layout.addWidget(no_notifications_label)
-
-            # Update parent's notification count
-            if hasattr(self.parent(), 'update_notification_count'):
-                self.parent().update_notification_count()
+            self.load_notifications()
 
     def mark_as_read(self):
         """Mark all notifications as read"""
@@ -211,10 +160,3 @@ class NotificationDialog(QDialog):
 
         if reply == QMessageBox.Yes:
             mark_notifications_as_read()
-            # Update parent's notification count
-            if hasattr(self.parent(), 'update_notification_count'):
-                self.parent().update_notification_count()
-            # Reload the display
-            for i in reversed(range(self.scroll_layout.count())):
-                self.scroll_layout.itemAt(i).widget().setParent(None)
-            self.load_notifications()
@@ -0,0 +1,71 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from notification_service import notification_service
+
+# Notifications handed to the view per page; older pages load as the list is scrolled down
+NOTIFICATION_PAGE_SIZE = 50
+
+# Role returning the notification dict itself, so the delegate paints without copying it
+NOTIFICATION_ROLE = Qt.UserRole + 1
+IS_NEW_ROLE = Qt.UserRole + 2
+
+
+class NotificationListModel(QAbstractListModel):
+    """Newest-first list model over the notification service, exposed to the view one page at a time"""
+
+    def __init__(self, service=notification_service, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self.field_type = None  # None shows every field type
+        self.notifications = []  # matching notifications, newest first
+        self.loaded_count = 0  # rows handed to the view so far
+        self.service.notifications_changed.connect(self.refresh)
+        self.refresh()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded_count
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded_count < len(self.notifications)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(NOTIFICATION_PAGE_SIZE, len(self.notifications) - self.loaded_count)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded_count, self.loaded_count + count - 1)
+        self.loaded_count += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded_count:
+            return None
+
+        notification = self.notifications[index.row()]
+        if role == NOTIFICATION_ROLE:
+            return notification
+        if role == IS_NEW_ROLE:
+            return self.service.is_new(notification)
+        if role == Qt.DisplayRole:
+            return notification.get('content', '')
+        if role == Qt.ToolTipRole:
+            return f"{notification.get('field_type', '')} - {notification.get('timestamp', '')}"
+        return None
+
+    def set_field_type(self, field_type):
+        """Show only the notifications of one field type, or all of them for None"""
+        if field_type != self.field_type:
+            self.field_type = field_type
+            self.refresh(keep_loaded=False)
+
+    def refresh(self, keep_loaded=True):
+        """Re-read the notifications, keeping as many rows loaded as before unless the filter changed"""
+        loaded_count = self.loaded_count if keep_loaded else 0
+        self.beginResetModel()
+        self.notifications = self.service.get_newest_first(self.field_type)
+        self.loaded_count = min(max(loaded_count, NOTIFICATION_PAGE_SIZE), len(self.notifications))
+        self.endResetModel()
+
+    def get_total_count(self):
+        """Number of notifications matching the filter, loaded or not"""
+        return len(self.notifications)
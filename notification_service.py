@@ -0,0 +1,236 @@
+import json
+import os
+from datetime import datetime
+from PyQt5.QtCore import QObject, QFileSystemWatcher, pyqtSignal
+from risk_storage import DATABASE_DIR
+
+# Append-only journal of notification events, one JSON object per line:
+#   {"op": "add", "notification": {...}}   a new notification
+#   {"op": "read", "upto": id}             every notification up to id is read
+#   {"op": "clear", "upto": id}            every notification up to id is gone
+NOTIFICATIONS_JOURNAL = os.path.join(DATABASE_DIR, 'notifications_journal.jsonl')
+# Whole-list JSON file used before the journal; imported into the journal once
+NOTIFICATIONS_FILE = os.path.join(DATABASE_DIR, 'notifications.json')
+
+# Rewrite the journal on load once it holds this many more events than live notifications
+JOURNAL_COMPACT_SLACK = 1000
+
+
+def get_notification_key(content, field_type):
+    """Key of a notification for duplicate checks (field type, case and whitespace insensitive content)"""
+    return (field_type, " ".join(content.lower().split()))
+
+
+class NotificationService(QObject):
+    """Keeps the notifications in memory and tells listeners when they change
+
+    Every change appends one line to the journal, so adding or marking notifications costs the same
+    whatever the history length. The journal is only read at startup and when another process changes it.
+    """
+    notifications_changed = pyqtSignal()
+    count_changed = pyqtSignal(int)  # number of new (unread) notifications
+
+    def __init__(self, journal_file=NOTIFICATIONS_JOURNAL, legacy_file=NOTIFICATIONS_FILE, parent=None):
+        super().__init__(parent)
+        self.journal_file = journal_file
+        self.legacy_file = legacy_file
+        self.notifications = []  # live notifications, oldest first, ids increasing
+        self.notification_keys = set()
+        self.last_id = 0
+        self.read_upto = 0  # notifications with an id up to this are read
+        self.cleared_upto = 0  # notifications with an id up to this are cleared
+        self.journal_events = 0
+        self.saved_stamp = None  # (mtime, size) of the journal as this process last wrote or read it
+        self.watcher = None
+        self.load()
+
+    def get_file_stamp(self):
+        try:
+            stat = os.stat(self.journal_file)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def reset(self):
+        self.notifications = []
+        self.notification_keys = set()
+        self.last_id = 0
+        self.read_upto = 0
+        self.cleared_upto = 0
+        self.journal_events = 0
+
+    def apply_event(self, event):
+        """Apply one journal event to the in-memory state"""
+        op = event.get('op')
+        if op == 'add':
+            notification = event['notification']
+            notification_id = notification['id']  # Checked before anything changes, so a bad event is a no-op
+            self.notifications.append(notification)
+            self.notification_keys.add(get_notification_key(notification.get('content', ''),
+                                                            notification.get('field_type', '')))
+            self.last_id = max(self.last_id, notification_id)
+        elif op == 'read':
+            self.read_upto = max(self.read_upto, event['upto'])
+        elif op == 'clear':
+            self.cleared_upto = max(self.cleared_upto, event['upto'])
+            self.last_id = max(self.last_id, event['upto'])  # A compacted journal may hold no adds after a clear
+            self.notifications = [n for n in self.notifications if n['id'] > event['upto']]
+            self.notification_keys = {get_notification_key(n.get('content', ''), n.get('field_type', ''))
+                                      for n in self.notifications}
+        self.journal_events += 1
+
+    def load(self):
+        """Replay the journal into memory, importing the old notifications file the first time"""
+        self.reset()
+        if not os.path.exists(self.journal_file) and os.path.exists(self.legacy_file):
+            self.import_legacy_file()
+        elif os.path.exists(self.journal_file):
+            try:
+                with open(self.journal_file, 'r', encoding='utf-8') as f:
+                    for line_number, line in enumerate(f, 1):
+                        if not line.strip():
+                            continue
+                        # A bad line (e.g. torn by a crash mid-append) only loses that event
+                        try:
+                            self.apply_event(json.loads(line))
+                        except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+                            print(f"Skipping bad line {line_number} of notification journal: {e}")
+            except OSError as e:
+                print(f"Error reading notification journal: {e}")
+            if self.journal_events > len(self.notifications) + JOURNAL_COMPACT_SLACK:
+                self.compact()
+        self.saved_stamp = self.get_file_stamp()
+        self.emit_changed()
+
+    def import_legacy_file(self):
+        try:
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                legacy_notifications = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Error reading notifications: {e}")
+            return
+        for notification in legacy_notifications:
+            self.apply_event({'op': 'add', 'notification': self.make_notification(
+                notification.get('content', ''), notification.get('field_type', ''), notification.get('timestamp'))})
+            if not notification.get('is_new', True):
+                self.read_upto = self.last_id
+        self.compact()
+        print(f"🔔 Imported {len(self.notifications)} notifications into {self.journal_file}")
+
+    def compact(self):
+        """Rewrite the journal as just the live notifications and the read mark"""
+        events = [{'op': 'add', 'notification': notification} for notification in self.notifications]
+        if self.cleared_upto:
+            events.insert(0, {'op': 'clear', 'upto': self.cleared_upto})
+        if self.read_upto:
+            events.append({'op': 'read', 'upto': self.read_upto})
+        try:
+            os.makedirs(os.path.dirname(self.journal_file) or '.', exist_ok=True)
+            temp_file = self.journal_file + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(event, ensure_ascii=False) + '\n' for event in events)
+            os.replace(temp_file, self.journal_file)
+            self.journal_events = len(events)
+            self.saved_stamp = self.get_file_stamp()
+        except OSError as e:
+            print(f"Error compacting notification journal: {e}")
+
+    def append_event(self, event):
+        """Apply an event and append it to the journal"""
+        self.apply_event(event)
+        try:
+            os.makedirs(os.path.dirname(self.journal_file) or '.', exist_ok=True)
+            with open(self.journal_file, 'a+b') as f:
+                line = (json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8')
+                # Start on a fresh line when the journal ends in a torn line, so the event isn't glued onto it
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line
+                f.write(line)
+            self.saved_stamp = self.get_file_stamp()
+        except OSError as e:
+            print(f"Error saving notifications: {e}")
+        self.emit_changed()
+
+    def emit_changed(self):
+        self.notifications_changed.emit()
+        self.count_changed.emit(self.get_new_count())
+
+    def make_notification(self, content, field_type, timestamp=None):
+        return {
+            'content': content,
+            'field_type': field_type,
+            'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'id': self.last_id + 1
+        }
+
+    def get_notifications(self):
+        """Get copies of the notifications, with their is_new flag"""
+        return [dict(notification, is_new=notification['id'] > self.read_upto) for notification in self.notifications]
+
+    def get_newest_first(self, field_type=None):
+        """Get the stored notifications newest first, optionally of one field type; callers must not modify them"""
+        return [notification for notification in reversed(self.notifications)
+                if field_type is None or notification.get('field_type') == field_type]
+
+    def get_field_types(self):
+        return sorted({notification.get('field_type', '') for notification in self.notifications})
+
+    def is_new(self, notification):
+        return notification['id'] > self.read_upto
+
+    def get_new_count(self):
+        # Count the loaded entries; ids can have gaps where a malformed journal line was skipped
+        seen_upto = max(self.read_upto, self.cleared_upto)
+        return sum(1 for notification in self.notifications if notification['id'] > seen_upto)
+
+    def set_notifications(self, notifications):
+        """Replace every notification"""
+        self.append_event({'op': 'clear', 'upto': self.last_id})
+        for notification in notifications:
+            self.append_event({'op': 'add', 'notification': self.make_notification(
+                notification.get('content', ''), notification.get('field_type', ''), notification.get('timestamp'))})
+            if not notification.get('is_new', True):
+                self.append_event({'op': 'read', 'upto': self.last_id})
+
+    def add(self, content, field_type):
+        """Add a notification for truly new content; returns False for a duplicate"""
+        if get_notification_key(content, field_type) in self.notification_keys:
+            return False  # Don't add duplicate notifications
+        self.append_event({'op': 'add', 'notification': self.make_notification(content, field_type)})
+        return True
+
+    def mark_all_read(self):
+        """Mark all notifications as read (not new)"""
+        if self.read_upto < self.last_id:
+            self.append_event({'op': 'read', 'upto': self.last_id})
+
+    def clear(self):
+        """Clear all notifications"""
+        if self.notifications:
+            self.append_event({'op': 'clear', 'upto': self.last_id})
+
+    def start_watching(self):
+        """Reload when another process changes the journal; needs the QApplication to exist"""
+        if self.watcher is not None:
+            return
+        self.watcher = QFileSystemWatcher(self)
+        # The folder is watched too, as a file replaced on disk drops out of the file watch
+        directory = os.path.dirname(self.journal_file) or '.'
+        os.makedirs(directory, exist_ok=True)
+        self.watcher.addPath(directory)
+        if os.path.exists(self.journal_file):
+            self.watcher.addPath(self.journal_file)
+        self.watcher.fileChanged.connect(self.on_file_changed)
+        self.watcher.directoryChanged.connect(self.on_file_changed)
+
+    def on_file_changed(self, path=None):
+        if os.path.exists(self.journal_file) and self.journal_file not in self.watcher.files():
+            self.watcher.addPath(self.journal_file)
+        if self.get_file_stamp() != self.saved_stamp:
+            print("🔔 Notifications changed on disk, reloading")
+            self.load()
+
+
+notification_service = NotificationService()
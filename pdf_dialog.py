@@ -80,14 +80,7 @@ class PDFDialog(QDialog):
             self.filter_options.addItems(approval_statuses)
 
     def get_unique_devices(self):
-        devices = set()
-        table = self.parent_window.table_widget
-        for row in range(table.rowCount()):
-            device_item = table.item(row, 3)  # Device Affected column
-            if device_item and device_item.text().strip():
-                device_list = [d.strip() for d in device_item.text().split(',')]
-                devices.update(device_list)
-        return sorted(list(devices))
+        return sorted(self.parent_window.risk_store.get_devices())
 
     def generate_pdf(self):
         filter_type = self.filter_type.currentText()
@@ -0,0 +1,50 @@
+END = ''  # Marks a node where an indexed term ends; never clashes with a one-character edge
+
+
+class PrefixTrie:
+    """Indexed terms by prefix, for completing the word being typed"""
+
+    def __init__(self, terms=()):
+        self.root = {}
+        for term in terms:
+            self.add(term)
+
+    def add(self, term):
+        node = self.root
+        for char in term:
+            node = node.setdefault(char, {})
+        node[END] = True
+
+    def discard(self, term):
+        path = [self.root]
+        for char in term:
+            node = path[-1].get(char)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].pop(END, None)
+
+        # Prune the branches left without any term
+        for char, node, parent in zip(reversed(term), reversed(path[1:]), reversed(path[:-1])):
+            if node:
+                break
+            del parent[char]
+
+    def complete(self, prefix):
+        """Get every indexed term starting with a prefix"""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        completions = []
+        stack = [(prefix, node)]
+        while stack:
+            term, node = stack.pop()
+            for char, child in node.items():
+                if char == END:
+                    completions.append(term)
+                else:
+                    stack.append((term + char, child))
+        return completions
@@ -0,0 +1,210 @@
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from risk_storage import DATABASE_DIR
+
+HISTORY_FIELDS = ('timestamp', 'user', 'field', 'previous_value', 'new_value')
+HISTORY_PAGE_SIZE = 100
+HISTORY_CACHE_SIZE = 16  # Recently viewed risks whose loaded history pages are kept in memory
+
+
+def make_history_entry(user_name, field, previous_value, new_value, timestamp=None):
+    """Build one history entry stamped with the given or the current time"""
+    return {
+        'timestamp': timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'user': user_name,
+        'field': field,
+        'previous_value': previous_value,
+        'new_value': new_value
+    }
+
+
+class RiskHistoryLog:
+    """Append-only SQLite log of risk edits, indexed by risk ID
+
+    Recording an edit inserts one row, and reading a risk's history only touches that risk's rows.
+    Nothing is read at startup; history is loaded a page at a time when it is viewed.
+    Edits recorded between begin() and commit() share one timestamp and are written in a single transaction.
+    """
+
+    def __init__(self, db_file=os.path.join(DATABASE_DIR, "risk_history.db"), legacy_json_file=None):
+        self.db_file = db_file
+        self.legacy_json_file = legacy_json_file
+        self.history_cache = OrderedDict()  # risk_id -> {'count': n, 'pages': {(page, page size): entries}}, LRU order
+        self.transaction_depth = 0
+        self.transaction_timestamp = None
+        self.pending_entries = []  # (risk_id, entry) recorded since begin()
+
+        os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+
+        self.connection = sqlite3.connect(self.db_file)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+        self.migrate_legacy_json()
+
+    def create_tables(self):
+        """Create the history table if it doesn't exist"""
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS risk_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    risk_id TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    user TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    previous_value TEXT NOT NULL,
+                    new_value TEXT NOT NULL
+                )
+            """)
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_risk_history_risk ON risk_history(risk_id, id)")
+
+    def migrate_legacy_json(self):
+        """Import the old whole-file JSON history once, when the log is still empty"""
+        if not self.legacy_json_file or not os.path.exists(self.legacy_json_file):
+            return
+        if self.count_entries() > 0:
+            return
+
+        try:
+            with open(self.legacy_json_file, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+            with self.connection:
+                self.insert_entries([(risk_id, entry) for risk_id, entries in history.items() for entry in entries])
+            if history:
+                print(f"📦 Migrated the history of {len(history)} risks from {self.legacy_json_file}")
+        except Exception as e:
+            print(f"❌ Error migrating legacy risk history file: {e}")
+
+    def insert_entries(self, risk_entries):
+        """Insert (risk_id, entry) pairs; the caller owns the transaction"""
+        self.connection.executemany(
+            "INSERT INTO risk_history (risk_id, timestamp, user, field, previous_value, new_value) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(risk_id, *(str(entry.get(field, '') or '') for field in HISTORY_FIELDS)) for risk_id, entry in risk_entries]
+        )
+
+    def write_entries(self, risk_entries):
+        """Write (risk_id, entry) pairs in one transaction"""
+        for risk_id, entry in risk_entries:
+            self.history_cache.pop(risk_id, None)
+        try:
+            with self.connection:
+                self.insert_entries(risk_entries)
+            return True
+        except Exception as e:
+            print(f"❌ Error recording risk history: {e}")
+            return False
+
+    def add_entry(self, risk_id, entry):
+        """Append one history entry for a risk"""
+        return self.add_entries(risk_id, [entry])
+
+    def add_entries(self, risk_id, entries):
+        """Append several history entries for a risk, held back until commit() inside a transaction"""
+        if not risk_id or not entries:
+            return False
+        if self.transaction_depth:
+            self.pending_entries.extend((risk_id, entry) for entry in entries)
+            return True
+        return self.write_entries([(risk_id, entry) for entry in entries])
+
+    def record(self, risk_id, user_name, field, previous_value, new_value):
+        """Record one field change, stamped with the transaction's time when inside one"""
+        return self.add_entry(risk_id, make_history_entry(user_name, field, previous_value, new_value,
+                                                          self.transaction_timestamp))
+
+    def begin(self):
+        """Start grouping recorded changes; a nested begin() joins the outer group"""
+        if self.transaction_depth == 0:
+            self.pending_entries = []
+            self.transaction_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.transaction_depth += 1
+
+    def commit(self):
+        """End a group, writing everything recorded in it at once when the outermost group ends"""
+        if self.transaction_depth == 0:
+            return False
+        self.transaction_depth -= 1
+        if self.transaction_depth:
+            return True
+        risk_entries, self.pending_entries = self.pending_entries, []
+        self.transaction_timestamp = None
+        return self.write_entries(risk_entries) if risk_entries else True
+
+    @contextmanager
+    def transaction(self):
+        """Group the changes recorded in a with block into one write
+
+        The write also happens when the block raises, as the edits it describes were already made.
+        """
+        self.begin()
+        try:
+            yield self
+        finally:
+            self.commit()
+
+    def load_history(self, risk_id):
+        """Load the history entries of one risk, oldest first"""
+        try:
+            cursor = self.connection.execute(
+                f"SELECT {', '.join(HISTORY_FIELDS)} FROM risk_history WHERE risk_id = ? ORDER BY id", (risk_id,))
+            return [dict(zip(HISTORY_FIELDS, row)) for row in cursor]
+        except Exception as e:
+            print(f"❌ Error loading history of risk {risk_id}: {e}")
+            return []
+
+    def get_cached_history(self, risk_id):
+        """Get the cache entry of a risk, making it the most recently viewed"""
+        cached = self.history_cache.get(risk_id)
+        if cached is None:
+            cached = {'count': self.count_entries(risk_id), 'pages': {}}
+            self.history_cache[risk_id] = cached
+            while len(self.history_cache) > HISTORY_CACHE_SIZE:
+                self.history_cache.popitem(last=False)
+        else:
+            self.history_cache.move_to_end(risk_id)
+        return cached
+
+    def get_page_count(self, risk_id, page_size=HISTORY_PAGE_SIZE):
+        """Get the number of history pages of a risk (at least one, even when empty)"""
+        return max((self.get_cached_history(risk_id)['count'] + page_size - 1) // page_size, 1)
+
+    def load_history_page(self, risk_id, page, page_size=HISTORY_PAGE_SIZE):
+        """Load one page of the history of a risk, oldest entries on the first page"""
+        cached = self.get_cached_history(risk_id)
+        key = (page, page_size)
+        if key not in cached['pages']:
+            try:
+                cursor = self.connection.execute(
+                    f"SELECT {', '.join(HISTORY_FIELDS)} FROM risk_history WHERE risk_id = ? ORDER BY id "
+                    "LIMIT ? OFFSET ?", (risk_id, page_size, page * page_size))
+                cached['pages'][key] = [dict(zip(HISTORY_FIELDS, row)) for row in cursor]
+            except Exception as e:
+                print(f"❌ Error loading history of risk {risk_id}: {e}")
+                return []
+        return cached['pages'][key]
+
+    def delete_history(self, risk_id):
+        """Delete every history entry of a risk"""
+        self.history_cache.pop(risk_id, None)
+        try:
+            with self.connection:
+                self.connection.execute("DELETE FROM risk_history WHERE risk_id = ?", (risk_id,))
+            return True
+        except Exception as e:
+            print(f"❌ Error deleting history of risk {risk_id}: {e}")
+            return False
+
+    def count_entries(self, risk_id=None):
+        """Get the number of history entries, of one risk or of all of them"""
+        if risk_id is None:
+            return self.connection.execute("SELECT COUNT(*) FROM risk_history").fetchone()[0]
+        return self.connection.execute("SELECT COUNT(*) FROM risk_history WHERE risk_id = ?", (risk_id,)).fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
@@ -1,16 +1,21 @@
-from PyQt5.QtWidgets import *
-from PyQt5.QtWidgets import (QPushButton, QLabel, QApplication, QMainWindow, QWidget, QVBoxLayout, QComboBox,
-                             QAbstractItemView, QMenu, QDialog, QHBoxLayout, QScrollArea, QTreeWidget, QTreeWidgetItem,
-                             QCheckBox, QGroupBox, QMessageBox, QFileDialog, QLineEdit, QDialogButtonBox, QTableWidget, QTableWidgetItem)
+from PyQt5.QtWidgets import QPushButton, QLabel, QVBoxLayout, QDialog, QHBoxLayout, QTableWidget, QTableWidgetItem
+from risk_history import HISTORY_PAGE_SIZE
 
 class RiskHistoryDialog(QDialog):
-    def __init__(self, risk_id, history_data, parent=None):
+    """Shows the history of one risk a page at a time, read from a RiskHistoryLog on demand"""
+
+    def __init__(self, risk_id, history_log, parent=None):
         super().__init__(parent)
+        self.risk_id = risk_id
+        self.history_log = history_log
+        self.page = 0
+        self.page_count = history_log.get_page_count(risk_id)
         self.setWindowTitle(f"Risk History - {risk_id}")
         self.setGeometry(200, 200, 800, 600)
-        self.setupUI(history_data)
+        self.setupUI()
+        self.show_page(0)
 
-    def setupUI(self, history_data):
+    def setupUI(self):
         layout = QVBoxLayout(self)
 
         # Title
@@ -24,8 +29,33 @@ class RiskHistoryDialog(QDialog):
         self.history_table.setHorizontalHeaderLabels([
             "Timestamp", "User", "Field", "Previous Value", "New Value"
         ])
-        
-        # Populate history
+        layout.addWidget(self.history_table)
+
+        # Page navigation
+        page_layout = QHBoxLayout()
+        self.previous_button = QPushButton("◀ Previous")
+        self.previous_button.clicked.connect(lambda: self.show_page(self.page - 1))
+        page_layout.addWidget(self.previous_button)
+        page_layout.addStretch()
+        self.page_label = QLabel()
+        page_layout.addWidget(self.page_label)
+        page_layout.addStretch()
+        self.next_button = QPushButton("Next ▶")
+        self.next_button.clicked.connect(lambda: self.show_page(self.page + 1))
+        page_layout.addWidget(self.next_button)
+        layout.addLayout(page_layout)
+
+        # Close button
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+    def show_page(self, page):
+        """Fill the table with one page of history entries"""
+        self.page = min(max(page, 0), self.page_count - 1)
+        history_data = self.history_log.load_history_page(self.risk_id, self.page)
+
+        self.history_table.clearSpans()
         if history_data:
             self.history_table.setRowCount(len(history_data))
             for row, entry in enumerate(history_data):
@@ -41,9 +71,10 @@ class RiskHistoryDialog(QDialog):
 
         # Adjust column widths
         self.history_table.resizeColumnsToContents()
-        layout.addWidget(self.history_table)
+        self.history_table.scrollToTop()
 
-        # Close button
-        close_button = QPushButton("Close")
-        close_button.clicked.connect(self.close)
-        layout.addWidget(close_button)
+        first_entry = self.page * HISTORY_PAGE_SIZE
+        self.page_label.setText(f"Page {self.page + 1} of {self.page_count} "
+                                f"(entries {first_entry + 1 if history_data else 0}-{first_entry + len(history_data)})")
+        self.previous_button.setEnabled(self.page > 0)
+        self.next_button.setEnabled(self.page < self.page_count - 1)
@@ -0,0 +1,37 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from risk_store import Risk
+from risk_sort import sort_risks
+
+LOAD_BATCH_SIZE = 200
+
+
+class RiskLoadWorker(QThread):
+    """Reads, parses and sorts the stored register off the UI thread, then hands it over in batches"""
+    batch_loaded = pyqtSignal(list)  # list of Risk
+    progress = pyqtSignal(int, int)  # loaded, total
+    load_finished = pyqtSignal(int)  # total risks loaded
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, db_manager, batch_size=LOAD_BATCH_SIZE, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+
+    def run(self):
+        try:
+            records = self.db_manager.read_risk_records()
+            risks = [Risk.from_record(record) for record in records]
+            sort_risks(risks)
+
+            total = len(risks)
+            for start in range(0, total, self.batch_size):
+                if self.isInterruptionRequested():
+                    return
+                batch = risks[start:start + self.batch_size]
+                self.batch_loaded.emit(batch)
+                self.progress.emit(start + len(batch), total)
+
+            self.load_finished.emit(total)
+        except Exception as e:
+            print(f"❌ Error loading risks in background: {e}")
+            self.load_failed.emit(str(e))
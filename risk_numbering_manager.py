@@ -1,12 +1,13 @@
 import json
 import os
 from datetime import datetime
+from risk_storage import DATABASE_DIR
 
 class RiskNumberingManager:
     """Manages the comprehensive risk numbering system - UPDATED VERSION"""
     
     def __init__(self):
-        self.numbering_file = "Database/risk_numbering.json"
+        self.numbering_file = os.path.join(DATABASE_DIR, "risk_numbering.json")
         self.component_numbers = {}  # component_name -> number
         self.sequence_counters = {}  # component_name -> current_sequence_count
         self.hazardous_situation_counts = {}  # component_name -> current_count
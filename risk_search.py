@@ -0,0 +1,107 @@
+import re
+from collections import defaultdict
+from PyQt5.QtCore import QObject
+from prefix_index import PrefixTrie
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def get_control_texts(controls):
+    """Get the text of every control and child requirement"""
+    texts = []
+    for control in controls:
+        texts.append(control.get('text', ''))
+        texts.extend(child.get('text', '') for child in control.get('children', []))
+    return texts
+
+
+def get_risk_tokens(risk):
+    """Get the searchable words of a risk: its number, components, situations, events, harms and controls"""
+    text = " ".join([risk.risk_no, risk.components, *risk.situations, *risk.events, *risk.harms,
+                     *get_control_texts(risk.controls)])
+    tokens = set(TOKEN_PATTERN.findall(text.lower()))
+    if risk.risk_no.strip():
+        tokens.add(risk.risk_no.strip().lower())  # So a full risk number matches as one word too
+    return tokens
+
+
+class RiskSearchIndex(QObject):
+    """Register-wide inverted index over the text of every risk, kept in step with a RiskTableModel
+
+    Risks are keyed by record ID, since stored rows move when risks are removed, and an id() can be reused by a
+    new risk once the old one is gone.
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.postings = defaultdict(set)  # word -> record IDs of the risks containing it
+        self.tokens_by_risk = {}  # record ID -> words indexed for it
+        self.words = PrefixTrie()
+
+        model.rowsInserted.connect(lambda parent, first, last: self.index_rows(first, last))
+        model.rowsAboutToBeRemoved.connect(lambda parent, first, last: self.unindex_rows(first, last))
+        model.dataChanged.connect(lambda top_left, bottom_right: self.index_rows(top_left.row(), bottom_right.row()))
+        model.modelReset.connect(self.rebuild)
+        self.rebuild()
+
+    def rebuild(self):
+        self.postings.clear()
+        self.tokens_by_risk.clear()
+        self.words = PrefixTrie()
+        self.index_rows(0, len(self.model.store) - 1)
+
+    def index_rows(self, first, last):
+        """Index new or edited rows, touching only the words that changed"""
+        for row in range(first, last + 1):
+            risk = self.model.store.get(row)
+            if risk is None:
+                continue
+            old_tokens = self.tokens_by_risk.get(risk.record_id, set())
+            new_tokens = get_risk_tokens(risk)
+            self.remove_tokens(risk.record_id, old_tokens - new_tokens)
+            for token in new_tokens - old_tokens:
+                if not self.postings[token]:
+                    self.words.add(token)
+                self.postings[token].add(risk.record_id)
+            self.tokens_by_risk[risk.record_id] = new_tokens
+
+    def unindex_rows(self, first, last):
+        for row in range(first, last + 1):
+            risk = self.model.store.get(row)
+            if risk is not None:
+                self.remove_tokens(risk.record_id, self.tokens_by_risk.pop(risk.record_id, set()))
+
+    def remove_tokens(self, risk_id, tokens):
+        for token in tokens:
+            risk_ids = self.postings.get(token)
+            if risk_ids is None:
+                continue
+            risk_ids.discard(risk_id)
+            if not risk_ids:
+                del self.postings[token]
+                self.words.discard(token)
+
+    def search(self, query):
+        """Get the record IDs of the risks containing every word of a query, or None for an empty query
+
+        The last word is completed while it is still being typed.
+        """
+        words = TOKEN_PATTERN.findall(query.lower())
+        if not words:
+            return None
+
+        word_matches = [self.postings.get(word, set()) for word in words]
+        if query[-1:].isalnum() or query[-1:] == '_':
+            completed = set()
+            for word in self.words.complete(words[-1]):
+                completed.update(self.postings[word])
+            word_matches[-1] = completed
+
+        word_matches.sort(key=len)
+        matches = set(word_matches[0])
+        for risk_ids in word_matches[1:]:
+            if not matches:
+                break
+            matches &= risk_ids
+        return matches
@@ -0,0 +1,127 @@
+import re
+from PyQt5.QtCore import QSortFilterProxyModel
+from risk_table_model import RISK_ROLE
+
+RISK_NUMBER_PATTERN = re.compile(r'^(\w+)-RSK-(\d+)-(\d+)-(\d+)-(\d+)$')
+UNNUMBERED = 10 ** 6  # Sorts risks with an unparseable number after every numbered one
+
+RPN_PRIORITIES = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2}
+
+COMPONENT_SORT_KEYS = ('component', 'rpn', 'date')
+
+
+def parse_risk_number(risk_no):
+    """Parse a risk number into (department, component, sequence, situation, harm)"""
+    match = RISK_NUMBER_PATTERN.match((risk_no or '').strip())
+    if not match:
+        return (risk_no or '', UNNUMBERED, UNNUMBERED, UNNUMBERED, UNNUMBERED)
+    department, component, sequence, situation, harm = match.groups()
+    return (department, int(component), int(sequence), int(situation), int(harm))
+
+
+def risk_number_key(risk):
+    return parse_risk_number(risk.risk_no)
+
+
+def component_key(risk):
+    department, component, sequence, situation, harm = parse_risk_number(risk.risk_no)
+    return (component, sequence, department, situation, harm)
+
+
+def rpn_key(risk):
+    return RPN_PRIORITIES.get(risk.rpn.strip().upper(), len(RPN_PRIORITIES))
+
+
+def date_key(risk):
+    # Dates are stored as yyyy-MM-dd HH:mm:ss, so text order is date order
+    return risk.date
+
+
+def department_key(risk):
+    return risk.department
+
+
+SORT_KEYS = {
+    'risk_number': risk_number_key,
+    'component': component_key,
+    'rpn': rpn_key,
+    'date': date_key,
+    'department': department_key
+}
+
+
+def build_sort_key(key_names):
+    """Combine named sort keys into one key function over a Risk"""
+    key_functions = [SORT_KEYS[name] for name in key_names]
+    return lambda risk: tuple(key(risk) for key in key_functions)
+
+
+def sort_risks(risks, key_names=COMPONENT_SORT_KEYS):
+    """Sort a list of Risks in place by the named keys"""
+    risks.sort(key=build_sort_key(key_names))
+    return risks
+
+
+class RiskSortProxyModel(QSortFilterProxyModel):
+    """Orders and filters the register view without touching the stored rows"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sort_key = build_sort_key(COMPONENT_SORT_KEYS)
+        self.sort_keys = {}  # record ID -> sort key, computed once per risk until its data changes
+        self.row_filter = None
+        self.search_matches = None  # record IDs of the risks a register search matched, None when not searching
+
+    def sort_by(self, key_names):
+        """Sort the view by the named keys, e.g. ('component', 'rpn', 'date')"""
+        self.sort_key = build_sort_key(key_names)
+        self.sort_keys.clear()
+        self.invalidate()
+        self.sort(0)
+
+    def setSourceModel(self, model):
+        # Connected before the proxy's own handlers, so a changed row is re-sorted with its new key
+        model.dataChanged.connect(lambda top_left, bottom_right, roles=None:
+                                  self.drop_sort_keys(top_left.row(), bottom_right.row()))
+        model.rowsAboutToBeRemoved.connect(lambda parent, first, last: self.drop_sort_keys(first, last))
+        model.modelReset.connect(self.sort_keys.clear)
+        super().setSourceModel(model)
+
+    def drop_sort_keys(self, first_row, last_row):
+        """Forget the sort keys of source rows, so they are computed again from the new data"""
+        for row in range(first_row, last_row + 1):
+            risk = self.get_risk(row)
+            if risk is not None:
+                self.sort_keys.pop(risk.record_id, None)
+
+    def get_sort_key(self, risk):
+        sort_key = self.sort_keys.get(risk.record_id)
+        if sort_key is None:
+            sort_key = self.sort_keys[risk.record_id] = self.sort_key(risk)
+        return sort_key
+
+    def set_row_filter(self, row_filter):
+        """Only show risks the filter accepts; None shows every risk"""
+        self.row_filter = row_filter
+        self.invalidateFilter()
+
+    def set_search_matches(self, risk_ids):
+        """Only show the risks a register search matched, on top of the row filter; None shows every risk"""
+        self.search_matches = risk_ids
+        self.invalidateFilter()
+
+    def get_risk(self, source_row):
+        return self.sourceModel().index(source_row, 0).data(RISK_ROLE)
+
+    def lessThan(self, left, right):
+        return self.get_sort_key(left.data(RISK_ROLE)) < self.get_sort_key(right.data(RISK_ROLE))
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.row_filter is None and self.search_matches is None:
+            return True
+        risk = self.get_risk(source_row)
+        if risk is None:
+            return False
+        if self.search_matches is not None and risk.record_id not in self.search_matches:
+            return False
+        return self.row_filter is None or self.row_filter(risk)
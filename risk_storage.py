@@ -0,0 +1,230 @@
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+
+# Folder of the database files, next to the application whatever the launch directory
+DATABASE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "Database")
+
+
+def new_record_id():
+    """Get a new stable storage ID for a risk record"""
+    return uuid.uuid4().hex
+
+
+class RiskStorage:
+    """SQLite-backed risk register where every risk is one record keyed by a stable record ID
+
+    Risk numbers change when risks are renumbered and are not guaranteed to be unique,
+    so they are only stored as an indexed column next to the record.
+    """
+
+    def __init__(self, db_file=os.path.join(DATABASE_DIR, "risks_database.db"), legacy_json_file=None):
+        self.db_file = db_file
+        self.legacy_json_file = legacy_json_file
+
+        os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+
+        self.connection = sqlite3.connect(self.db_file)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+        self.migrate_legacy_json()
+
+    def create_tables(self):
+        """Create the risks table if it doesn't exist, upgrading a table keyed by risk number"""
+        with self.connection:
+            # sqlite3 doesn't open transactions for DDL itself; the upgrade must be all or nothing
+            self.connection.execute("BEGIN")
+            columns = [row[1] for row in self.connection.execute("PRAGMA table_info(risks)")]
+            upgrade = bool(columns) and 'record_id' not in columns
+            if upgrade:
+                self.connection.execute("ALTER TABLE risks RENAME TO risks_by_number")
+                self.connection.execute("DROP INDEX IF EXISTS idx_risks_position")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS risks (
+                    record_id TEXT PRIMARY KEY,
+                    risk_number TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    last_modified TEXT NOT NULL
+                )
+            """)
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_risks_position ON risks(position)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_risks_number ON risks(risk_number)")
+            if upgrade:
+                self.upgrade_number_keyed_table()
+
+    def upgrade_number_keyed_table(self):
+        """Give every record of the old risk-number keyed table its own record ID; the caller owns the transaction"""
+        rows = self.connection.execute(
+            "SELECT position, data, last_modified FROM risks_by_number ORDER BY position").fetchall()
+        for position, data, last_modified in rows:
+            risk_data = json.loads(data)
+            risk_data['record_id'] = new_record_id()
+            self.insert_risk(risk_data, position, last_modified)
+        self.connection.execute("DROP TABLE risks_by_number")
+        print(f"📦 Upgraded {len(rows)} stored risks to record IDs")
+
+    def migrate_legacy_json(self):
+        """Import the old whole-file JSON register once, when the SQLite store is still empty"""
+        if not self.legacy_json_file or not os.path.exists(self.legacy_json_file):
+            return
+        if self.count_risks() > 0:
+            return
+
+        try:
+            with open(self.legacy_json_file, 'r', encoding='utf-8') as f:
+                risks_data = json.load(f)
+            if risks_data and self.replace_all_risks(risks_data):
+                print(f"📦 Migrated {self.count_risks()} risks from {self.legacy_json_file}")
+                self.warn_duplicate_numbers()
+        except Exception as e:
+            print(f"❌ Error migrating legacy risks file: {e}")
+
+    def get_record_id(self, risk_data):
+        """Get the record ID of a risk entry, giving entries saved before record IDs existed a new one"""
+        if not risk_data.get('record_id'):
+            risk_data['record_id'] = new_record_id()
+        return risk_data['record_id']
+
+    def get_risk_number(self, risk_data):
+        return str(risk_data.get('risk_no', '') or '').strip()
+
+    def save_risk(self, risk_data):
+        """Insert or update a single risk record"""
+        return self.save_risks([risk_data])
+
+    def save_risks(self, risks_data):
+        """Insert or update several risk records in one transaction"""
+        try:
+            with self.connection:
+                for risk_data in risks_data:
+                    self.upsert_risk(risk_data)
+            return True
+        except Exception as e:
+            print(f"❌ Error saving risks: {e}")
+            return False
+
+    def insert_risk(self, risk_data, position, last_modified):
+        self.connection.execute(
+            "INSERT INTO risks (record_id, risk_number, position, data, last_modified) VALUES (?, ?, ?, ?, ?)",
+            (self.get_record_id(risk_data), self.get_risk_number(risk_data), position,
+             json.dumps(risk_data, ensure_ascii=False), last_modified))
+
+    def upsert_risk(self, risk_data):
+        """Write one record, keeping its position if it already exists; a new risk number rewrites it in place"""
+        self.connection.execute("""
+            INSERT INTO risks (record_id, risk_number, position, data, last_modified)
+            VALUES (?, ?, (SELECT IFNULL(MAX(position), 0) + 1 FROM risks), ?, ?)
+            ON CONFLICT(record_id) DO UPDATE SET
+                risk_number = excluded.risk_number,
+                data = excluded.data,
+                last_modified = excluded.last_modified
+        """, (self.get_record_id(risk_data), self.get_risk_number(risk_data),
+              json.dumps(risk_data, ensure_ascii=False), datetime.now().isoformat()))
+
+    def delete_risk(self, record_id):
+        """Delete a single risk record"""
+        return self.delete_risks([record_id])
+
+    def delete_risks(self, record_ids):
+        """Delete several risk records in one transaction"""
+        try:
+            with self.connection:
+                self.connection.executemany("DELETE FROM risks WHERE record_id = ?",
+                                            [(record_id,) for record_id in record_ids])
+            return True
+        except Exception as e:
+            print(f"❌ Error deleting risks: {e}")
+            return False
+
+    def replace_all_risks(self, risks_data):
+        """Replace the whole register in one transaction"""
+        try:
+            now = datetime.now().isoformat()
+            with self.connection:
+                self.connection.execute("DELETE FROM risks")
+                for position, risk_data in enumerate(risks_data, 1):
+                    self.insert_risk(risk_data, position, now)
+            return True
+        except Exception as e:
+            print(f"❌ Error replacing risks: {e}")
+            return False
+
+    def find_duplicate_numbers(self):
+        """Get {risk number: record count} for the risk numbers shared by several records"""
+        return dict(self.connection.execute(
+            "SELECT risk_number, COUNT(*) FROM risks WHERE risk_number != '' "
+            "GROUP BY risk_number HAVING COUNT(*) > 1"))
+
+    def load_all_risks(self):
+        """Load all risk records in register order"""
+        try:
+            cursor = self.connection.execute("SELECT data FROM risks ORDER BY position")
+            return [json.loads(data) for (data,) in cursor]
+        except Exception as e:
+            print(f"❌ Error loading risks: {e}")
+            return []
+
+    def read_all_risks(self):
+        """Load all risk records over a separate connection, so it can run on a worker thread"""
+        connection = sqlite3.connect(self.db_file)
+        try:
+            cursor = connection.execute("SELECT data FROM risks ORDER BY position")
+            return [json.loads(data) for (data,) in cursor]
+        finally:
+            connection.close()
+
+    def warn_duplicate_numbers(self):
+        duplicates = self.find_duplicate_numbers()
+        if duplicates:
+            print(f"⚠️ {len(duplicates)} risk numbers are shared by several risks: "
+                  + ", ".join(f"{number} (x{count})" for number, count in sorted(duplicates.items())))
+
+    def load_risk(self, record_id):
+        """Load a single risk record, or None if it doesn't exist"""
+        row = self.connection.execute("SELECT data FROM risks WHERE record_id = ?", (record_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count_risks(self):
+        """Get the number of stored risks"""
+        return self.connection.execute("SELECT COUNT(*) FROM risks").fetchone()[0]
+
+    def count_by_field(self, field_name, missing_value=None):
+        """Count the stored risks by the value of one record field, without loading the records"""
+        cursor = self.connection.execute(
+            "SELECT COALESCE(json_extract(data, ?), ?), COUNT(*) FROM risks GROUP BY 1",
+            ('$.' + field_name, missing_value))
+        return dict(cursor.fetchall())
+
+    def get_last_modified(self):
+        """Get the most recent modification timestamp in the register"""
+        return self.connection.execute("SELECT MAX(last_modified) FROM risks").fetchone()[0]
+
+    def export_to_json(self, file_path):
+        """Export the whole register to a JSON file"""
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(self.load_all_risks(), f, indent=2, ensure_ascii=False)
+            return True
+        except Exception as e:
+            print(f"❌ Error exporting risks to {file_path}: {e}")
+            return False
+
+    def backup_to(self, backup_file):
+        """Copy the SQLite database to a backup file"""
+        try:
+            backup_connection = sqlite3.connect(backup_file)
+            with backup_connection:
+                self.connection.backup(backup_connection)
+            backup_connection.close()
+            return True
+        except Exception as e:
+            print(f"❌ Error backing up risks database: {e}")
+            return False
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
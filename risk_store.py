@@ -0,0 +1,205 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from risk_storage import new_record_id
+
+
+def current_timestamp():
+    """Get the current time as an ISO timestamp"""
+    return datetime.now().isoformat()
+
+
+def clean_entries(entries):
+    """Strip entries and drop the empty ones"""
+    return [str(entry).strip() for entry in entries or [] if str(entry).strip()]
+
+
+def split_entries(text):
+    """Split a comma separated cell into its stripped entries"""
+    return [entry.strip() for entry in (text or '').split(',') if entry.strip()]
+
+
+def format_situations_text(situations):
+    """Format situations the same way HazardousSituationCardWidget does"""
+    return " | ".join([f"{i+1}. {sit}" for i, sit in enumerate(situations)])
+
+
+def format_sequence_text(events):
+    """Format events the same way SequenceEventWidget does"""
+    return " → ".join([f"Seq {i + 1}: {event}" for i, event in enumerate(events)])
+
+
+def format_harms_text(harms):
+    """Format harms the same way HarmDescriptionCardWidget does"""
+    return " | ".join([f"{i+1}. {harm}" for i, harm in enumerate(harms)])
+
+
+def format_controls_text(controls):
+    """Format the control tree as one line of text"""
+    return "; ".join([f"{control.get('text', '')} ({control.get('type', '')})" for control in controls])
+
+
+@dataclass(slots=True)
+class Risk:
+    """One risk of the register, in the shape every view reads it"""
+    date: str = ''
+    risk_no: str = ''
+    department: str = ''
+    device_affected: str = ''
+    components: str = ''
+    lifecycle: str = ''
+    hazard_category: str = ''
+    hazard_source: str = ''
+    situations: list = field(default_factory=list)
+    events: list = field(default_factory=list)
+    harm_influenced: str = ''
+    harms: list = field(default_factory=list)
+    rpn_data: dict = field(default_factory=dict)
+    severity: str = ''
+    probability: str = ''
+    rpn: str = ''
+    controls: list = field(default_factory=list)
+    approved_by: str = ''
+    row_id: object = None
+    record_id: str = field(default_factory=new_record_id)  # Stable storage key; risk numbers change and may repeat
+    created_timestamp: str = field(default_factory=current_timestamp)
+    last_modified: str = field(default_factory=current_timestamp)
+
+    @classmethod
+    def from_record(cls, record):
+        """Build a risk from a stored record dict"""
+        situations = clean_entries((record.get('hazardous_situation') or {}).get('situations'))
+        events = clean_entries((record.get('sequence_of_events') or {}).get('events'))
+        harm_description = record.get('harm_description') or {}
+        harms = clean_entries(harm_description.get('harms'))
+        rpn_data = {harm: info for harm, info in (harm_description.get('rpn_data') or {}).items() if harm in harms}
+
+        risk = cls(situations=situations, events=events, harms=harms, rpn_data=rpn_data,
+                   controls=list((record.get('risk_control_actions') or {}).get('controls') or []),
+                   row_id=record.get('row_id'), record_id=record.get('record_id') or new_record_id())
+        for name in TEXT_FIELDS:
+            setattr(risk, name, str(record.get(name, '') or ''))
+        for name in ('created_timestamp', 'last_modified'):
+            if record.get(name):
+                setattr(risk, name, record[name])
+        return risk
+
+    def to_record(self):
+        """Get the record dict the database stores for this risk"""
+        record = {name: getattr(self, name) for name in TEXT_FIELDS}
+        record.update({
+            'row_id': self.row_id,
+            'record_id': self.record_id,
+            'hazardous_situation': {'situations': list(self.situations), 'formatted_text': self.situations_text},
+            'sequence_of_events': {'events': list(self.events), 'formatted_text': self.sequence_text},
+            'harm_description': {'harms': list(self.harms), 'rpn_data': dict(self.rpn_data),
+                                 'formatted_text': self.harms_text},
+            'risk_control_actions': {'controls': list(self.controls)},
+            'created_timestamp': self.created_timestamp,
+            'last_modified': self.last_modified
+        })
+        return record
+
+    @property
+    def situations_text(self):
+        return format_situations_text(self.situations)
+
+    @property
+    def sequence_text(self):
+        return format_sequence_text(self.events)
+
+    @property
+    def harms_text(self):
+        return format_harms_text(self.harms)
+
+    @property
+    def controls_text(self):
+        return format_controls_text(self.controls)
+
+    @property
+    def device_list(self):
+        return split_entries(self.device_affected)
+
+    @property
+    def component_list(self):
+        return split_entries(self.components)
+
+
+# Plain text fields of a risk, stored as-is in its record
+TEXT_FIELDS = ('date', 'risk_no', 'department', 'device_affected', 'components', 'lifecycle', 'hazard_category',
+               'hazard_source', 'harm_influenced', 'severity', 'probability', 'rpn', 'approved_by')
+
+
+class RiskStore:
+    """In-memory risk register, indexed by record ID (risk numbers may repeat)"""
+
+    def __init__(self):
+        self.risks = []
+        self.rows_by_record_id = {}
+
+    def __len__(self):
+        return len(self.risks)
+
+    def __iter__(self):
+        return iter(self.risks)
+
+    def __getitem__(self, row):
+        return self.risks[row]
+
+    def get(self, row):
+        """Get the risk of a row, or None"""
+        if 0 <= row < len(self.risks):
+            return self.risks[row]
+        return None
+
+    def reindex(self):
+        """Rebuild the record ID index after rows moved"""
+        self.rows_by_record_id = {risk.record_id: row for row, risk in enumerate(self.risks)}
+
+    def set_risks(self, risks):
+        """Replace the whole register"""
+        self.risks = list(risks)
+        self.reindex()
+
+    def append(self, risk):
+        """Append a risk and return its row"""
+        self.risks.append(risk)
+        self.rows_by_record_id[risk.record_id] = len(self.risks) - 1
+        return len(self.risks) - 1
+
+    def pop(self, row):
+        """Remove and return the risk of a row"""
+        risk = self.risks.pop(row)
+        self.reindex()
+        return risk
+
+    def find_row(self, record_id):
+        """Get the row of a record ID, or -1"""
+        return self.rows_by_record_id.get(record_id, -1)
+
+    def find(self, record_id):
+        """Get the risk with a record ID, or None"""
+        row = self.find_row(record_id)
+        return self.risks[row] if row >= 0 else None
+
+    def update(self, row, **values):
+        """Change fields of a risk; returns False when nothing actually changed"""
+        risk = self.risks[row]
+        changed = {name: value for name, value in values.items() if getattr(risk, name) != value}
+        if not changed:
+            return False
+
+        for name, value in changed.items():
+            setattr(risk, name, value)
+        risk.last_modified = current_timestamp()
+        return True
+
+    def to_records(self, record_ids=None):
+        """Get stored record dicts, optionally only for some record IDs"""
+        return [risk.to_record() for risk in self.risks if record_ids is None or risk.record_id in record_ids]
+
+    def get_devices(self):
+        """Get every device named by a risk"""
+        devices = set()
+        for risk in self.risks:
+            devices.update(risk.device_list)
+        return devices
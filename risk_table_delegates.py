@@ -0,0 +1,207 @@
+from PyQt5.QtCore import Qt, QRect, QSize
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPen
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from sequence_widget import SequenceEventWidget
+from ControlAndRequirement import AddControlClass
+from harm_description_widget import HarmDescriptionCardWidget
+from hazardous_situation_widget import HazardousSituationCardWidget
+from risk_table_model import RISK_ROLE
+
+CARD_SPACING = 2
+CARD_PADDING = 4
+
+
+class RiskCardDelegate(QStyledItemDelegate):
+    """Paints a list column as numbered cards; the card widget is only created while the cell is edited
+
+    Column delegates define create_card_widget(parent, index) to build the editor, load_editor(editor, value)
+    to fill it from the stored cell value and read_editor(editor) to read that value back.
+    """
+    card_color = '#f5f5f5'
+    border_color = '#bdbdbd'
+    label_color = '#2c3e50'
+
+    def get_cards(self, index):
+        """Get the (label, text, background, border) tuples to paint for a cell"""
+        return []
+
+    def get_change_signals(self, editor):
+        """Get the editor signals that mean its content changed"""
+        return []
+
+    def paint(self, painter, option, index):
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+
+        font = QFont(option.font)
+        metrics = QFontMetrics(font)
+        card_height = metrics.height() + 2 * CARD_PADDING
+        area = option.rect.adjusted(3, 3, -3, -3)
+        cards = self.get_cards(index)
+
+        y = area.top()
+        for card_index, (label, text, background, border) in enumerate(cards):
+            if y + card_height > area.bottom() and card_index > 0:
+                painter.setPen(QColor('#7f8c8d'))
+                painter.drawText(QRect(area.left(), y - CARD_SPACING, area.width(), metrics.height()),
+                                 Qt.AlignRight | Qt.AlignVCenter, f"+{len(cards) - card_index} more")
+                break
+
+            card_rect = QRect(area.left(), y, area.width(), card_height)
+            painter.setPen(QPen(QColor(border)))
+            painter.setBrush(QColor(background))
+            painter.drawRoundedRect(card_rect, 4, 4)
+
+            bold_font = QFont(font)
+            bold_font.setBold(True)
+            painter.setFont(bold_font)
+            painter.setPen(QColor(self.label_color))
+            label_width = QFontMetrics(bold_font).width(label) + CARD_PADDING
+            text_rect = card_rect.adjusted(CARD_PADDING, 0, -CARD_PADDING, 0)
+            painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, label)
+
+            painter.setFont(font)
+            painter.setPen(QColor('black'))
+            text_rect = text_rect.adjusted(label_width, 0, 0, 0)
+            painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                             metrics.elidedText(text, Qt.ElideRight, text_rect.width()))
+            y += card_height + CARD_SPACING
+
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        card_height = QFontMetrics(option.font).height() + 2 * CARD_PADDING
+        cards = max(len(self.get_cards(index)), 1)
+        return QSize(super().sizeHint(option, index).width(), cards * (card_height + CARD_SPACING) + 6)
+
+    def createEditor(self, parent, option, index):
+        editor = self.create_card_widget(parent, index)
+        # Management dialogs are parented to the editor, so opening one doesn't count as leaving the cell
+        editor.parent_window = editor
+        editor.setAutoFillBackground(True)
+        editor.setFocusPolicy(Qt.StrongFocus)
+        for signal in self.get_change_signals(editor):
+            signal.connect(lambda *args, e=editor: self.commitData.emit(e))
+        return editor
+
+    def setEditorData(self, editor, index):
+        # Loading the editor re-emits its change signals; block them so commit and reload don't loop
+        editor.blockSignals(True)
+        try:
+            self.load_editor(editor, index.data(Qt.EditRole) or {})
+        finally:
+            editor.blockSignals(False)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, self.read_editor(editor), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        rect = option.rect
+        editor.setGeometry(rect.x(), rect.y(), rect.width(), max(rect.height(), editor.sizeHint().height()))
+
+
+class HazardousSituationDelegate(RiskCardDelegate):
+    """Hazardous situation cards (S1, S2, ...)"""
+    card_color = '#fff3cd'
+    border_color = '#ffeaa7'
+    label_color = '#856404'
+
+    def get_cards(self, index):
+        risk = index.data(RISK_ROLE)
+        return [(f"S{i + 1}:", situation, self.card_color, self.border_color)
+                for i, situation in enumerate(risk.situations if risk else [])]
+
+    def create_card_widget(self, parent, index):
+        return HazardousSituationCardWidget([], parent)
+
+    def get_change_signals(self, editor):
+        return [editor.situations_updated]
+
+    def load_editor(self, editor, value):
+        editor.set_situations(list(value.get('situations', [])))
+
+    def read_editor(self, editor):
+        return {'situations': editor.get_situations_list()}
+
+
+class SequenceOfEventsDelegate(RiskCardDelegate):
+    """Sequence of events cards (Seq 1 → Seq 2 ...)"""
+    card_color = '#e3f2fd'
+    border_color = '#90caf9'
+    label_color = '#1565c0'
+
+    def get_cards(self, index):
+        risk = index.data(RISK_ROLE)
+        return [(f"{'↓ ' if i else ''}Seq {i + 1}:", event, self.card_color, self.border_color)
+                for i, event in enumerate(risk.events if risk else [])]
+
+    def create_card_widget(self, parent, index):
+        return SequenceEventWidget("", parent)
+
+    def get_change_signals(self, editor):
+        return [editor.sequence_updated]
+
+    def load_editor(self, editor, value):
+        editor.set_sequence(list(value.get('events', [])))
+
+    def read_editor(self, editor):
+        return {'events': editor.get_sequence_list()}
+
+
+class HarmDescriptionDelegate(RiskCardDelegate):
+    """Harm description cards (H1, H2, ...) coloured by their RPN"""
+    rpn_colors = {'High': ('#ffebee', '#f44336'), 'Medium': ('#fff8e1', '#ff9800'), 'Low': ('#e8f5e8', '#4caf50')}
+
+    def get_cards(self, index):
+        risk = index.data(RISK_ROLE)
+        cards = []
+        for i, harm in enumerate(risk.harms if risk else []):
+            rpn_info = risk.rpn_data.get(harm, {})
+            background, border = self.rpn_colors.get(rpn_info.get('rpn'), (self.card_color, self.border_color))
+            text = f"{harm} [S:{rpn_info['severity']} P:{rpn_info['probability']} {rpn_info['rpn']}]" if rpn_info else harm
+            cards.append((f"H{i + 1}:", text, background, border))
+        return cards
+
+    def create_card_widget(self, parent, index):
+        risk = index.data(RISK_ROLE)
+        selected_device = risk.device_list[0] if risk and risk.device_list else None
+        return HarmDescriptionCardWidget([], {}, selected_device, parent)
+
+    def get_change_signals(self, editor):
+        return [editor.harms_updated]
+
+    def load_editor(self, editor, value):
+        editor.set_harms_and_rpn(list(value.get('harms', [])), dict(value.get('rpn_data', {})))
+
+    def read_editor(self, editor):
+        return {'harms': editor.get_harms_list(), 'rpn_data': editor.get_rpn_data()}
+
+
+class RiskControlDelegate(RiskCardDelegate):
+    """Risk control cards, with the requirements of each control indented under it"""
+    card_color = '#e8f5e9'
+    border_color = '#a5d6a7'
+    label_color = '#2e7d32'
+
+    def get_cards(self, index):
+        risk = index.data(RISK_ROLE)
+        cards = []
+        for i, control in enumerate(risk.controls if risk else []):
+            cards.append((f"C{i + 1}:", f"{control.get('text', '')} ({control.get('type', '')})",
+                          self.card_color, self.border_color))
+            for child in control.get('children', []):
+                cards.append(("   ↳", f"{child.get('text', '')} ({child.get('type', '')})", '#ffffff', self.border_color))
+        return cards
+
+    def create_card_widget(self, parent, index):
+        return AddControlClass(parent)
+
+    def get_change_signals(self, editor):
+        return [editor.controls_updated]
+
+    def load_editor(self, editor, value):
+        editor.set_controls(value.get('controls', []))
+
+    def read_editor(self, editor):
+        return {'controls': editor.get_controls()}
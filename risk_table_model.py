@@ -0,0 +1,182 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor
+from risk_store import RiskStore, clean_entries
+
+RISK_TABLE_HEADERS = [
+    "Date", "Risk No.", "Department", "Device Affected", "Components", "Lifecycle", "Hazard Category",
+    "Hazard Source", "Hazardous Situation", "Sequence of Events", "Harm Influenced", "Harm Description",
+    "Severity", "Probability", "RPN", "Risk Control Actions", "Approved By"
+]
+
+# Risk attribute shown in each plain column
+RISK_TABLE_FIELDS = [
+    'date', 'risk_no', 'department', 'device_affected', 'components', 'lifecycle', 'hazard_category',
+    'hazard_source', 'situations', 'events', 'harm_influenced', 'harms',
+    'severity', 'probability', 'rpn', 'controls', 'approved_by'
+]
+
+HAZARDOUS_SITUATION_COLUMN = 8
+SEQUENCE_OF_EVENTS_COLUMN = 9
+HARM_DESCRIPTION_COLUMN = 11
+RPN_COLUMN = 14
+RISK_CONTROL_COLUMN = 15
+CARD_COLUMNS = (HAZARDOUS_SITUATION_COLUMN, SEQUENCE_OF_EVENTS_COLUMN, HARM_DESCRIPTION_COLUMN, RISK_CONTROL_COLUMN)
+
+# Role returning the Risk itself, so delegates paint without copying its lists
+RISK_ROLE = Qt.UserRole + 1
+
+
+class RiskTableModel(QAbstractTableModel):
+    """Table model over a RiskStore; card columns are painted by delegates"""
+    risk_changed = pyqtSignal(int, int, str, str)  # row, column, previous text, new text
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else RiskStore()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(RISK_TABLE_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return RISK_TABLE_HEADERS[section]
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row, column = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            return self.get_text(row, column)
+        if role == Qt.EditRole:
+            return self.get_value(row, column)
+        if role == RISK_ROLE:
+            return self.store.get(row)
+        if role == Qt.ToolTipRole and column in CARD_COLUMNS:
+            return self.get_text(row, column)
+        if role == Qt.BackgroundRole and column not in CARD_COLUMNS:
+            # Same missing-cell highlighting the table used to apply item by item
+            if not self.get_text(row, column).strip():
+                return QColor('yellow')
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        return self.set_value(index.row(), index.column(), value)
+
+    def set_risks(self, risks):
+        """Replace the whole register with Risk objects"""
+        self.beginResetModel()
+        self.store.set_risks(risks)
+        self.endResetModel()
+
+    def append_risk(self, risk):
+        """Append a Risk and return its row"""
+        row = len(self.store)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.store.append(risk)
+        self.endInsertRows()
+        return row
+
+    def append_risks(self, risks):
+        """Append a batch of Risks with a single insert notification"""
+        if not risks:
+            return
+        first_row = len(self.store)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(risks) - 1)
+        for risk in risks:
+            self.store.append(risk)
+        self.endInsertRows()
+
+    def remove_risk(self, row):
+        """Remove the risk in a row and return it"""
+        if self.store.get(row) is None:
+            return None
+        self.beginRemoveRows(QModelIndex(), row, row)
+        risk = self.store.pop(row)
+        self.endRemoveRows()
+        return risk
+
+    def get_value(self, row, column):
+        """Get the editable value of a cell (text, or a dict for a card column)"""
+        risk = self.store.get(row)
+        if risk is None:
+            return None
+        if column == HAZARDOUS_SITUATION_COLUMN:
+            return {'situations': list(risk.situations)}
+        if column == SEQUENCE_OF_EVENTS_COLUMN:
+            return {'events': list(risk.events)}
+        if column == HARM_DESCRIPTION_COLUMN:
+            return {'harms': list(risk.harms), 'rpn_data': dict(risk.rpn_data)}
+        if column == RISK_CONTROL_COLUMN:
+            return {'controls': list(risk.controls)}
+        return getattr(risk, RISK_TABLE_FIELDS[column])
+
+    def get_text(self, row, column):
+        """Get the display text of a cell"""
+        risk = self.store.get(row)
+        if risk is None:
+            return ''
+        if column == HAZARDOUS_SITUATION_COLUMN:
+            return risk.situations_text
+        if column == SEQUENCE_OF_EVENTS_COLUMN:
+            return risk.sequence_text
+        if column == HARM_DESCRIPTION_COLUMN:
+            return risk.harms_text
+        if column == RISK_CONTROL_COLUMN:
+            return risk.controls_text
+        return getattr(risk, RISK_TABLE_FIELDS[column])
+
+    def get_field_values(self, column, value):
+        """Translate an edited cell value into Risk field values"""
+        if column not in CARD_COLUMNS:
+            return {RISK_TABLE_FIELDS[column]: str(value if value is not None else '').strip()}
+
+        value = value or {}
+        if column == HAZARDOUS_SITUATION_COLUMN:
+            return {'situations': clean_entries(value.get('situations'))}
+        if column == SEQUENCE_OF_EVENTS_COLUMN:
+            return {'events': clean_entries(value.get('events'))}
+        if column == HARM_DESCRIPTION_COLUMN:
+            harms = clean_entries(value.get('harms'))
+            rpn_data = {harm: info for harm, info in (value.get('rpn_data') or {}).items() if harm in harms}
+            return {'harms': harms, 'rpn_data': rpn_data}
+        return {'controls': list(value.get('controls') or [])}
+
+    def set_value(self, row, column, value):
+        """Store a cell value, emitting risk_changed only if it actually changed"""
+        if self.store.get(row) is None:
+            return False
+
+        previous_text = self.get_text(row, column)
+        if not self.store.update(row, **self.get_field_values(column, value)):
+            return True
+
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index)
+        self.risk_changed.emit(row, column, previous_text, self.get_text(row, column))
+        return True
+
+    def update_risks(self, updates):
+        """Apply {row: {Risk field: value}} with one dataChanged for the whole range; returns the changed rows"""
+        changed_rows = [row for row, values in updates.items() if self.store.update(row, **values)]
+        if changed_rows:
+            self.dataChanged.emit(self.index(min(changed_rows), 0),
+                                  self.index(max(changed_rows), self.columnCount() - 1))
+        return changed_rows
+
+    def set_text(self, row, column, text):
+        """Store the text of a plain column"""
+        return self.set_value(row, column, text)
@@ -0,0 +1,155 @@
+import json
+import os
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+MATRIX_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'Risk Matrix')
+MATRIX_SIZE = 5
+
+
+def get_matrix_file(device):
+    """Get the JSON file holding a device's risk matrix"""
+    return os.path.join(MATRIX_DIR, f"{device.replace(' ', '_')}_matrix.json")
+
+
+def get_default_rpn(severity, probability):
+    """Default RPN calculation logic, used when a device has no matrix entry"""
+    if (severity >= 4 and probability >= 3) or (severity == 3 and probability >= 4):
+        return 'High'
+    elif ((severity >= 4 and probability <= 3) or (severity < 3 and probability == 5)
+          or (severity == 2 and probability >= 3) or (severity == 3 and probability in [2, 3])):
+        return 'Medium'
+    elif ((severity == 1 and probability <= 4) or (severity == 2 and probability in [1, 2]) or
+          (severity == 3 and probability == 1)):
+        return 'Low'
+    else:
+        return 'Unknown'
+
+
+def to_level(value):
+    """Convert a stored severity/probability to an int level, 0 when it isn't a number"""
+    text = str(value).strip()
+    return int(text) if text.isdigit() else 0
+
+
+def build_lookup(matrix_data):
+    """Turn the saved {"row,col": {"text": ...}} matrix into a 5x5 list of RPN texts (None where unset)"""
+    lookup = [[None] * MATRIX_SIZE for _ in range(MATRIX_SIZE)]
+    for row in range(MATRIX_SIZE):
+        for col in range(MATRIX_SIZE):
+            cell = matrix_data.get(f"{row},{col}")
+            if cell and cell.get("text"):
+                lookup[row][col] = cell["text"]
+    return lookup
+
+
+class RpnMatrixRegistry(QObject):
+    """Parses each device matrix once and serves RPN lookups from memory"""
+    matrix_changed = pyqtSignal(str)  # device
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lookups = {}  # device -> (file mtime, 5x5 lookup)
+
+    def get_file_mtime(self, device):
+        try:
+            return os.path.getmtime(get_matrix_file(device))
+        except OSError:
+            return None
+
+    def get_lookup(self, device):
+        """Get the 5x5 lookup of a device, reloading it only if its file changed"""
+        mtime = self.get_file_mtime(device)
+        cached = self.lookups.get(device)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        lookup = None
+        if mtime is not None:
+            try:
+                with open(get_matrix_file(device), 'r') as f:
+                    lookup = build_lookup(json.load(f))
+            except Exception as e:
+                print(f"Error reading matrix for {device}: {e}")
+        self.lookups[device] = (mtime, lookup)
+        return lookup
+
+    def get_rpn(self, device, severity, probability):
+        """Get the RPN of a severity/probability pair from a device's matrix"""
+        row = severity - 1
+        col = probability - 1
+        if device and 0 <= row < MATRIX_SIZE and 0 <= col < MATRIX_SIZE:
+            lookup = self.get_lookup(device)
+            if lookup and lookup[row][col]:
+                return lookup[row][col]
+        return get_default_rpn(severity, probability)
+
+    def get_lookup_array(self, device):
+        """Get a device matrix as a 5x5 NumPy array with the default RPN filled in where unset"""
+        lookup = self.get_lookup(device)
+        table = np.empty((MATRIX_SIZE, MATRIX_SIZE), dtype=object)
+        for row in range(MATRIX_SIZE):
+            for col in range(MATRIX_SIZE):
+                table[row, col] = (lookup and lookup[row][col]) or get_default_rpn(row + 1, col + 1)
+        return table
+
+    def invalidate(self, device=None):
+        """Drop the cached matrix of a device (or of every device) and tell listeners"""
+        if device is None:
+            self.lookups.clear()
+        else:
+            self.lookups.pop(device, None)
+        self.matrix_changed.emit(device or '')
+
+
+matrix_registry = RpnMatrixRegistry()
+
+
+def lookup_levels(table, severities, probabilities):
+    """Look up many (severity, probability) pairs at once; pairs outside the matrix give None"""
+    severities = np.asarray(severities, dtype=np.int64)
+    probabilities = np.asarray(probabilities, dtype=np.int64)
+    valid = (severities >= 1) & (severities <= MATRIX_SIZE) & (probabilities >= 1) & (probabilities <= MATRIX_SIZE)
+    levels = np.full(len(severities), None, dtype=object)
+    levels[valid] = table[severities[valid] - 1, probabilities[valid] - 1]
+    return levels, valid
+
+
+def recompute_rpns(risks, device, registry=matrix_registry):
+    """Re-evaluate the RPNs of every risk whose first device is `device` against its current matrix
+
+    Returns ({index in risks: changed Risk fields}, number of risks whose RPN level changed).
+    """
+    indexes = [i for i, risk in enumerate(risks) if risk.device_list[:1] == [device]]
+    if not indexes:
+        return {}, 0
+    table = registry.get_lookup_array(device)
+    updates = {}
+
+    # Risk level RPN, from the severity and probability columns
+    new_levels, valid = lookup_levels(table, [to_level(risks[i].severity) for i in indexes],
+                                      [to_level(risks[i].probability) for i in indexes])
+    old_levels = np.array([risks[i].rpn for i in indexes], dtype=object)
+    level_changed = valid & (new_levels != old_levels)
+    for position in np.flatnonzero(level_changed):
+        updates[indexes[position]] = {'rpn': new_levels[position]}
+
+    # Per-harm RPNs of the harm cards, flattened across all risks
+    harm_owners, harm_names, harm_severities, harm_probabilities = [], [], [], []
+    for i in indexes:
+        for harm, info in risks[i].rpn_data.items():
+            harm_owners.append(i)
+            harm_names.append(harm)
+            harm_severities.append(to_level(info.get('severity', 0)))
+            harm_probabilities.append(to_level(info.get('probability', 0)))
+
+    if harm_owners:
+        new_harm_levels, harm_valid = lookup_levels(table, harm_severities, harm_probabilities)
+        old_harm_levels = np.array([risks[i].rpn_data[harm].get('rpn') for i, harm in zip(harm_owners, harm_names)],
+                                   dtype=object)
+        for position in np.flatnonzero(harm_valid & (new_harm_levels != old_harm_levels)):
+            i = harm_owners[position]
+            rpn_data = updates.setdefault(i, {}).setdefault('rpn_data', {h: dict(info) for h, info in risks[i].rpn_data.items()})
+            rpn_data[harm_names[position]]['rpn'] = new_harm_levels[position]
+
+    return updates, int(level_changed.sum())
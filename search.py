@@ -1,41 +1,98 @@
 import sys
 from PyQt5 import QtWidgets, QtCore
-import nltk
-from nltk.stem import PorterStemmer
-from nltk.corpus import wordnet
-import difflib
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 import json
 import os
+import hashlib
+import heapq
+import threading
+from functools import lru_cache
 from datetime import datetime
+from startup_timing import timed_import
+from fuzzy_index import TrigramIndex
+from prefix_index import PrefixTrie
+from bm25 import Bm25Stats
+from notification_service import notification_service, NOTIFICATIONS_FILE
+from risk_storage import DATABASE_DIR
 
 # # Download necessary NLTK data
 # nltk.download('wordnet')
 # nltk.download('punkt')
 
 # File paths for persistent storage
-SEQUENCE_FILE = 'Database/sequence_documents.json'
-HAZARDOUS_FILE = 'Database/hazardous_documents.json'
-CONTROL_FILE = 'Database/control_documents.json'
-HARM_FILE = 'Database/harm_documents.json'
-NOTIFICATIONS_FILE = 'Database/notifications.json'
+SEQUENCE_FILE = os.path.join(DATABASE_DIR, 'sequence_documents.json')
+HAZARDOUS_FILE = os.path.join(DATABASE_DIR, 'hazardous_documents.json')
+CONTROL_FILE = os.path.join(DATABASE_DIR, 'control_documents.json')
+HARM_FILE = os.path.join(DATABASE_DIR, 'harm_documents.json')
+SYNONYMS_FILE = os.path.join(DATABASE_DIR, 'synonyms.json')
+
+# Most WordNet lookups kept in memory; each synsets call is slow
+SYNONYM_CACHE_SIZE = 4096
+
+# Bump when normalize_terms changes, so cached indexes built the old way are rebuilt
+INDEX_FORMAT_VERSION = 1
+
+# Completions of the word being typed: shortest prefix completed, and most completions used per query
+MIN_PREFIX_LENGTH = 2
+PREFIX_COMPLETION_LIMIT = 10
+
+# Held only while an index, its caches or the synonym map are read or changed, never while a query is tokenized
+# or results are highlighted: type-ahead searches read them from worker threads while the UI thread adds documents
+search_lock = threading.RLock()
+
+# Trigram term index of each inverted index, keyed by id(inverted_index) -> (inverted_index, TrigramIndex)
+fuzzy_indexes = {}
+# Prefix trie over the terms of each inverted index, keyed the same way -> (inverted_index, PrefixTrie)
+prefix_indexes = {}
+# BM25 statistics of each inverted index, keyed the same way -> (inverted_index, Bm25Stats)
+bm25_stats = {}
+
+# Content hashes are the sum of per-document digests, so adding a document only hashes that document
+DIGEST_MODULUS = 2 ** 256
+# Sum of the document digests of each documents file, kept up to date as documents are added
+document_digests = {}
+# Id the next added document of each documents file gets; saved with its cached index
+next_document_ids = {}
+
+# Added documents are written in batches: pending writes are flushed this long after the last add, and at exit
+SEARCH_FLUSH_DELAY_MS = 2000
+dirty_collections = {}  # file_path -> documents changed since the last flush
+synonym_map_dirty = False
+flush_timer = None
+
+
+# NLTK is only imported once text has to be tokenized; cached indexes and synonym maps load without it
+def word_tokenize(text):
+    return timed_import('nltk').word_tokenize(text)
+
+
+@lru_cache(maxsize=1)
+def get_stemmer():
+    return timed_import('nltk.stem').PorterStemmer()
 
 
 # Functions for the search algorithm
 def normalize_terms(search_terms):
-    tokens = nltk.word_tokenize(search_terms)
+    tokens = word_tokenize(search_terms)
     tokens = [token.lower() for token in tokens]
-    stemmer = PorterStemmer()
+    stemmer = get_stemmer()
     normalized_tokens = [stemmer.stem(token) for token in tokens]
     return normalized_tokens
 
 
+@lru_cache(maxsize=SYNONYM_CACHE_SIZE)
+def lookup_synonyms(term):
+    """Get the WordNet synonyms of a word, cached"""
+    wordnet = timed_import('nltk.corpus').wordnet
+    return frozenset(lemma.name().lower() for syn in wordnet.synsets(term) for lemma in syn.lemmas())
+
+
 def get_synonyms(term):
-    synonyms = set()
-    for syn in wordnet.synsets(term):
-        for lemma in syn.lemmas():
-            synonyms.add(lemma.name().lower())
-    return synonyms
+    # The precomputed map answers without touching WordNet; it is None only when it couldn't be built
+    if synonym_map is not None:
+        with search_lock:
+            return set(synonym_map.get(term, ()))
+    return set(lookup_synonyms(term))
 
 
 def expand_terms(tokens):
@@ -45,6 +102,94 @@ def expand_terms(tokens):
     return expanded_terms
 
 
+def add_synonyms_of_text(synonyms, content, stemmer):
+    """Map the stems of every synonym of the words in a text to the indexed terms they stand for"""
+    for word in word_tokenize(content):
+        word = word.lower()
+        term = stemmer.stem(word)
+        for synonym in lookup_synonyms(word):
+            if '_' in synonym:
+                continue  # Multi-word lemmas never match a single query token
+            key = stemmer.stem(synonym)
+            if key != term:
+                synonyms[key].add(term)
+                synonyms[term].add(key)
+
+
+def build_synonym_map(document_sets):
+    """Precompute the synonyms of the indexed vocabulary, keyed by stemmed query term
+
+    Keys are indexed terms and the stemmed WordNet synonyms of their words; a synonym key maps back to the
+    indexed terms it stands for, so expanding a query only yields terms that can match the index.
+    """
+    stemmer = get_stemmer()
+    synonyms = defaultdict(set)
+    for documents in document_sets:
+        for content in documents.values():
+            add_synonyms_of_text(synonyms, content, stemmer)
+    return synonyms
+
+
+def compute_vocabulary_hash(collections):
+    """Hash the content hashes of every documents file together, so a cached synonym map can tell whether it is
+    still current"""
+    return hashlib.sha256(":".join(format_content_hash(document_digests[file_path]) for file_path in collections)
+                          .encode('utf-8')).hexdigest()
+
+
+def save_synonym_map(synonyms, content_hash):
+    """Save a synonym map with the hash of the documents it was built from"""
+    try:
+        os.makedirs(os.path.dirname(SYNONYMS_FILE) or '.', exist_ok=True)
+        temp_file = SYNONYMS_FILE + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'content_hash': content_hash,
+                       'synonyms': {term: sorted(values) for term, values in synonyms.items()}}, f, ensure_ascii=False)
+        os.replace(temp_file, SYNONYMS_FILE)
+    except OSError as e:
+        print(f"Error saving synonym map {SYNONYMS_FILE}: {e}")
+
+
+def load_or_create_synonym_map(collections):
+    """Load the cached synonym map of the indexed documents files, rebuilding it from WordNet only when the
+    documents changed"""
+    content_hash = compute_vocabulary_hash(collections)
+    if os.path.exists(SYNONYMS_FILE):
+        try:
+            with open(SYNONYMS_FILE, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('content_hash') == content_hash:
+                return defaultdict(set, {term: set(values) for term, values in cached.get('synonyms', {}).items()})
+        except (json.JSONDecodeError, OSError, AttributeError):
+            pass
+
+    try:
+        synonyms = build_synonym_map(collections.values())
+    except LookupError as e:
+        print(f"WordNet unavailable, synonyms will be looked up per query: {e}")
+        return None
+    save_synonym_map(synonyms, content_hash)
+    return synonyms
+
+
+def update_synonym_map(content):
+    """Add the synonyms of a new document's words to the synonym map; it is saved with the next flush"""
+    global synonym_map_dirty
+    if synonym_map is None:
+        return
+    new_synonyms = defaultdict(set)
+    try:
+        add_synonyms_of_text(new_synonyms, content, get_stemmer())
+    except LookupError as e:
+        print(f"WordNet unavailable, synonyms of the new document were skipped: {e}")
+        return
+    # Looked up outside the lock, merged under it
+    with search_lock:
+        for term, values in new_synonyms.items():
+            synonym_map[term].update(values)
+    synonym_map_dirty = True
+
+
 def create_inverted_index(documents):
     inverted_index = defaultdict(list)
     for doc_id, content in documents.items():
@@ -54,31 +199,192 @@ def create_inverted_index(documents):
     return inverted_index
 
 
+def get_cached(cache, inverted_index):
+    """Get what a cache holds for an inverted index, or None if it hasn't been built yet"""
+    cached = cache.get(id(inverted_index))
+    if cached is None or cached[0] is not inverted_index:
+        return None
+    return cached[1]
+
+
+def get_fuzzy_index(inverted_index):
+    """Get the trigram index over the terms of an inverted index, building it on first use"""
+    with search_lock:
+        fuzzy_index = get_cached(fuzzy_indexes, inverted_index)
+        if fuzzy_index is None:
+            fuzzy_index = TrigramIndex(inverted_index.keys())
+            fuzzy_indexes[id(inverted_index)] = (inverted_index, fuzzy_index)
+        return fuzzy_index
+
+
+def get_prefix_index(inverted_index):
+    """Get the prefix trie over the terms of an inverted index, building it on first use"""
+    with search_lock:
+        prefix_index = get_cached(prefix_indexes, inverted_index)
+        if prefix_index is None:
+            prefix_index = PrefixTrie(inverted_index.keys())
+            prefix_indexes[id(inverted_index)] = (inverted_index, prefix_index)
+        return prefix_index
+
+
+def get_bm25_stats(inverted_index):
+    """Get the BM25 statistics of an inverted index, building them on first use"""
+    with search_lock:
+        stats = get_cached(bm25_stats, inverted_index)
+        if stats is None:
+            stats = Bm25Stats(inverted_index)
+            bm25_stats[id(inverted_index)] = (inverted_index, stats)
+        return stats
+
+
+def index_document(inverted_index, doc_id, content):
+    """Add one document to an inverted index"""
+    tokens = normalize_terms(content)
+    with search_lock:
+        for token in tokens:
+            inverted_index[token].append(doc_id)
+
+        for term_index in (get_cached(fuzzy_indexes, inverted_index), get_cached(prefix_indexes, inverted_index)):
+            if term_index is not None:
+                for token in tokens:
+                    term_index.add(token)
+        stats = get_cached(bm25_stats, inverted_index)
+        if stats is not None:
+            stats.add_document(doc_id, tokens)
+
+
+def get_index_file(file_path):
+    """Get the cached inverted index file stored next to a documents file"""
+    return os.path.splitext(file_path)[0] + '_index.json'
+
+
+def get_document_digest(doc_id, content):
+    """Digest of one document, added into the content hash of its set"""
+    return int.from_bytes(hashlib.sha256(f"{doc_id}\0{content}".encode('utf-8')).digest(), 'big')
+
+
+def get_documents_digest(documents):
+    """Sum of the digests of a document set, independent of document order"""
+    return sum(get_document_digest(doc_id, content) for doc_id, content in documents.items()) % DIGEST_MODULUS
+
+
+def format_content_hash(digest):
+    """Content hash stored with a cached index, so it can tell whether it is still current"""
+    return f"{INDEX_FORMAT_VERSION}:{digest:064x}"
+
+
+def load_cached_index(index_file, content_hash):
+    """Load a cached inverted index and its next document id, or (None, None) if it is missing or was built
+    from other documents"""
+    if not os.path.exists(index_file):
+        return None, None
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('content_hash') != content_hash:
+            return None, None
+        return defaultdict(list, cached.get('index', {})), cached.get('next_id')
+    except (json.JSONDecodeError, OSError, AttributeError):
+        return None, None
+
+
+def get_next_document_id(documents):
+    """Get the id after the highest one of a document set; only needed when no cached index has it"""
+    return max((int(doc_id) for doc_id in documents), default=0) + 1
+
+
+def save_cached_index(inverted_index, index_file, content_hash, next_id):
+    """Save an inverted index with the hash of the documents it was built from and the next document id"""
+    try:
+        os.makedirs(os.path.dirname(index_file) or '.', exist_ok=True)
+        temp_file = index_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'content_hash': content_hash, 'next_id': next_id, 'index': inverted_index}, f,
+                      ensure_ascii=False)
+        os.replace(temp_file, index_file)
+    except OSError as e:
+        print(f"Error saving search index {index_file}: {e}")
+
+
+def load_or_create_inverted_index(documents, file_path):
+    """Load the cached index of a document set, rebuilding it only when the documents changed"""
+    index_file = get_index_file(file_path)
+    document_digests[file_path] = get_documents_digest(documents)
+    content_hash = format_content_hash(document_digests[file_path])
+    inverted_index, next_id = load_cached_index(index_file, content_hash)
+    next_document_ids[file_path] = next_id or get_next_document_id(documents)
+    if inverted_index is None:
+        inverted_index = create_inverted_index(documents)
+        save_cached_index(inverted_index, index_file, content_hash, next_document_ids[file_path])
+    return inverted_index
+
+
+def complete_prefix(prefix, inverted_index, limit=PREFIX_COMPLETION_LIMIT):
+    """Get the indexed terms starting with a prefix, those in the most documents first"""
+    if len(prefix) < MIN_PREFIX_LENGTH:
+        return []
+    with search_lock:
+        term_frequencies = get_bm25_stats(inverted_index).term_frequencies
+        completions = get_prefix_index(inverted_index).complete(prefix)
+        return heapq.nlargest(limit, completions, key=lambda term: len(term_frequencies.get(term, ())))
+
+
+def get_completions(search_terms, tokens, inverted_index):
+    """Complete the last word of a query while it is still being typed"""
+    if not tokens or not search_terms or search_terms[-1].isspace():
+        return set()
+    # The partial word may not stem to a prefix of its full word's stem, so complete both spellings
+    partial_word = search_terms.split()[-1].lower()
+    completions = set()
+    for prefix in {partial_word, tokens[-1]}:
+        completions.update(complete_prefix(prefix, inverted_index))
+    return completions
+
+
+def get_match_terms(search_terms, tokens, inverted_index):
+    """Get the indexed terms a query matches: its terms, their synonyms, completions or near spellings"""
+    completions = get_completions(search_terms, tokens, inverted_index)
+    match_terms = set(completions)
+    expanded_terms = expand_terms(tokens)
+    with search_lock:
+        for term in expanded_terms:
+            if term in inverted_index:
+                match_terms.add(term)
+            elif completions and term == tokens[-1]:
+                continue  # Partial word, already matched by its completions
+            else:
+                # Misspelled term: match indexed terms within a small edit distance
+                match_terms.update(get_fuzzy_index(inverted_index).lookup(term))
+    return match_terms
+
+
+# What search_documents found: the matching document ids, the query's normalized tokens, the indexed terms
+# they matched and the index searched, so ranking reuses them instead of analysing the query again
+SearchMatches = namedtuple('SearchMatches', ['doc_ids', 'tokens', 'match_terms', 'inverted_index'])
+
+
 def search_documents(search_terms, inverted_index, documents):
     tokens = normalize_terms(search_terms)
-    expanded_terms = expand_terms(tokens)
+    match_terms = get_match_terms(search_terms, tokens, inverted_index)
     results = set()
-    for term in expanded_terms:
-        if term in inverted_index:
-            results.update(inverted_index[term])
-        else:
-            for word in inverted_index.keys():
-                if difflib.get_close_matches(term, [word]):
-                    results.update(inverted_index[word])
-    return results
+    with search_lock:
+        for term in match_terms:
+            results.update(inverted_index.get(term, ()))
+    return SearchMatches(results, tokens, match_terms, inverted_index)
+
 
+def rank_and_highlight(matches, documents, scores, top_k=None):
+    """Rank matching documents by BM25 (plus their stored score) and highlight only the top_k returned"""
+    with search_lock:
+        stats = get_bm25_stats(matches.inverted_index)
+        ranked_results = [(scores.get(doc_id, 0) + stats.score(doc_id, matches.match_terms), doc_id)
+                          for doc_id in matches.doc_ids if doc_id in documents]
+    if top_k is None:
+        ranked_results.sort(reverse=True, key=lambda x: x[0])
+    else:
+        ranked_results = heapq.nlargest(top_k, ranked_results, key=lambda x: x[0])
 
-def rank_and_highlight(results, search_terms, documents, scores):
-    search_terms = normalize_terms(search_terms)
-    ranked_results = []
-    for doc_id in results:
-        content = documents[doc_id]
-        score = scores.get(doc_id, 0) + sum(content.lower().count(term) for term in search_terms)
-        ranked_results.append((score, doc_id, content))
-    ranked_results.sort(reverse=True, key=lambda x: x[0])
-    highlighted_results = [(doc_id, highlight_terms(content, search_terms), score) for score, doc_id, content in
-                           ranked_results]
-    return highlighted_results
+    return [(doc_id, highlight_terms(documents[doc_id], matches.tokens), score) for score, doc_id in ranked_results]
 
 
 def highlight_terms(content, search_terms):
@@ -111,23 +417,81 @@ def save_documents_to_file(documents, file_path):
         json.dump(documents_str_keys, f, ensure_ascii=False, indent=2)
 
 
+def normalize_content(content):
+    """Normalize document text for duplicate checks (case and whitespace insensitive)"""
+    return " ".join(content.lower().split())
+
+
+def get_content_keys(documents, file_path):
+    """Get the set of normalized contents of a document collection, built once per collection"""
+    if file_path not in content_key_sets:
+        content_key_sets[file_path] = {normalize_content(content) for content in documents.values()}
+    return content_key_sets[file_path]
+
+
+def save_collection(documents, file_path):
+    """Save a document collection and the index kept for it"""
+    save_documents_to_file(documents, file_path)
+    if file_path in inverted_indexes:
+        save_cached_index(inverted_indexes[file_path], get_index_file(file_path),
+                          format_content_hash(document_digests[file_path]), next_document_ids[file_path])
+
+
+def flush_search_data():
+    """Write the document collections, indexes and synonym map changed since the last flush"""
+    global synonym_map_dirty
+    pending_collections = list(dirty_collections.items())
+    dirty_collections.clear()
+    for file_path, documents in pending_collections:
+        try:
+            save_collection(documents, file_path)
+        except OSError as e:
+            print(f"Error saving documents {file_path}: {e}")
+    if synonym_map_dirty and synonym_map is not None:
+        save_synonym_map(synonym_map, compute_vocabulary_hash(document_collections))
+    synonym_map_dirty = False
+
+
+def schedule_flush():
+    """Flush pending writes shortly, so a burst of added documents is written once"""
+    global flush_timer
+    if flush_timer is None:
+        app = QtCore.QCoreApplication.instance()
+        if app is None:
+            # No event loop to batch on
+            flush_search_data()
+            return
+        flush_timer = QtCore.QTimer()
+        flush_timer.setSingleShot(True)
+        flush_timer.timeout.connect(flush_search_data)
+        app.aboutToQuit.connect(flush_search_data)
+    flush_timer.start(SEARCH_FLUSH_DELAY_MS)
+
+
 def add_new_document(documents, new_content, file_path, field_type):
     """Add new document to the collection and save to file - Only add notification if truly new"""
     # Check if content already exists (case-insensitive comparison)
-    new_content_clean = new_content.strip().lower()
-    for doc_id, content in documents.items():
-        if content.strip().lower() == new_content_clean:
-            return False  # Already exists, no notification needed
+    content_keys = get_content_keys(documents, file_path)
+    new_content_key = normalize_content(new_content)
+    if not new_content_key or new_content_key in content_keys:
+        return False  # Already exists, no notification needed
 
-    # Find next available ID
-    max_id = max([int(k) for k in documents.keys()]) if documents else 0
-    new_id = max_id + 1
+    # Take the collection's next id; only collections without an index are scanned for it
+    new_id = next_document_ids.get(file_path) or get_next_document_id(documents)
+    next_document_ids[file_path] = new_id + 1
 
-    # Add new document
+    # Add new document, indexing only its own terms; index_document tokenizes before taking the search lock
     documents[new_id] = new_content.strip()
+    content_keys.add(new_content_key)
+    if file_path in inverted_indexes:
+        index_document(inverted_indexes[file_path], new_id, documents[new_id])
+        document_digests[file_path] = (document_digests[file_path] +
+                                       get_document_digest(new_id, documents[new_id])) % DIGEST_MODULUS
 
-    # Save to file
-    save_documents_to_file(documents, file_path)
+    # Save to file with the next flush
+    dirty_collections[file_path] = documents
+    update_synonym_map(documents[new_id])
+    schedule_flush()
 
     # Add to notifications - ONLY for truly new content
     add_notification(new_content.strip(), field_type)
@@ -135,61 +499,35 @@ def add_new_document(documents, new_content, file_path, field_type):
     return True
 
 
+# Notifications live in memory in notification_service, which signals every change
 def load_notifications():
-    """Load notifications from file"""
-    if os.path.exists(NOTIFICATIONS_FILE):
-        try:
-            with open(NOTIFICATIONS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
-    return []
+    """Get a copy of the notifications"""
+    return notification_service.get_notifications()
 
 
 def save_notifications(notifications):
-    """Save notifications to file"""
-    with open(NOTIFICATIONS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(notifications, f, ensure_ascii=False, indent=2)
+    """Replace and save the notifications"""
+    notification_service.set_notifications(notifications)
 
 
 def add_notification(content, field_type):
     """Add a new notification for truly new content only"""
-    notifications = load_notifications()
-
-    # Check if this exact content and field type combination already exists in notifications
-    for existing_notification in notifications:
-        if (existing_notification.get('content', '').strip().lower() == content.strip().lower() and
-                existing_notification.get('field_type', '') == field_type):
-            return  # Don't add duplicate notifications
-
-    notification = {
-        'content': content,
-        'field_type': field_type,
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'id': len(notifications) + 1,
-        'is_new': True  # Mark as new notification
-    }
-    notifications.append(notification)
-    save_notifications(notifications)
+    notification_service.add(content, field_type)
 
 
 def get_notification_count():
     """Get the count of new notifications"""
-    notifications = load_notifications()
-    return len([n for n in notifications if n.get('is_new', True)])
+    return notification_service.get_new_count()
 
 
 def clear_notifications():
     """Clear all notifications"""
-    save_notifications([])
+    notification_service.clear()
 
 
 def mark_notifications_as_read():
     """Mark all notifications as read (not new)"""
-    notifications = load_notifications()
-    for notification in notifications:
-        notification['is_new'] = False
-    save_notifications(notifications)
+    notification_service.mark_all_read()
 
 
 # Default documents (original data)
@@ -332,20 +670,46 @@ hazardous_situation_documents = {int(k): v for k, v in hazardous_situation_docum
 control_documents = {int(k): v for k, v in control_documents.items()}
 harm_description_documents = {int(k): v for k, v in harm_description_documents.items()}
 
-# Create separate inverted indices for each set of documents
-sequence_of_event_inverted_index = create_inverted_index(sequence_of_event_documents)
-hazardous_situation_inverted_index = create_inverted_index(hazardous_situation_documents)
-control_inverted_index = create_inverted_index(control_documents)
-harm_description_inverted_index = create_inverted_index(harm_description_documents)
+# Load separate inverted indices for each set of documents, rebuilt only when the documents changed
+sequence_of_event_inverted_index = load_or_create_inverted_index(sequence_of_event_documents, SEQUENCE_FILE)
+hazardous_situation_inverted_index = load_or_create_inverted_index(hazardous_situation_documents, HAZARDOUS_FILE)
+control_inverted_index = load_or_create_inverted_index(control_documents, CONTROL_FILE)
+harm_description_inverted_index = load_or_create_inverted_index(harm_description_documents, HARM_FILE)
+
+# Index and document collection of each documents file; add_new_document keeps them in step
+inverted_indexes = {
+    SEQUENCE_FILE: sequence_of_event_inverted_index,
+    HAZARDOUS_FILE: hazardous_situation_inverted_index,
+    CONTROL_FILE: control_inverted_index,
+    HARM_FILE: harm_description_inverted_index
+}
+document_collections = {
+    SEQUENCE_FILE: sequence_of_event_documents,
+    HAZARDOUS_FILE: hazardous_situation_documents,
+    CONTROL_FILE: control_documents,
+    HARM_FILE: harm_description_documents
+}
+content_key_sets = {}
+
+# Synonyms of the indexed vocabulary, so query expansion never waits on WordNet
+synonym_map = load_or_create_synonym_map(document_collections)
 
 # Scores for ranking
 scores = defaultdict(int)
 
 
-# Function to refresh indices after adding new documents
+# Function to rebuild indices from scratch; single documents are indexed as they are added
 def refresh_indices():
-    global sequence_of_event_inverted_index, hazardous_situation_inverted_index, control_inverted_index, harm_description_inverted_index
-    sequence_of_event_inverted_index = create_inverted_index(sequence_of_event_documents)
-    hazardous_situation_inverted_index = create_inverted_index(hazardous_situation_documents)
-    control_inverted_index = create_inverted_index(control_documents)
-    harm_description_inverted_index = create_inverted_index(harm_description_documents)
\ No newline at end of file
+    global synonym_map
+    # Rebuilt in place, so modules that did `from search import *` keep seeing the current index
+    with search_lock:
+        content_key_sets.clear()
+        fuzzy_indexes.clear()
+        prefix_indexes.clear()
+        bm25_stats.clear()
+        for file_path, documents in document_collections.items():
+            inverted_index = inverted_indexes[file_path]
+            rebuilt_index = load_or_create_inverted_index(documents, file_path)
+            inverted_index.clear()
+            inverted_index.update(rebuilt_index)
+    synonym_map = load_or_create_synonym_map(document_collections)
\ No newline at end of file
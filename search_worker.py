@@ -0,0 +1,92 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from search import search_documents, rank_and_highlight, scores
+
+SEARCH_DEBOUNCE_MS = 250  # Wait for a pause in typing before searching
+
+# Searches run here rather than in the global pool, so they never queue behind other background work
+search_pool = QThreadPool()
+search_pool.setMaxThreadCount(2)
+
+
+class SearchSignals(QObject):
+    finished = pyqtSignal(int, list)  # generation, highlighted results
+    failed = pyqtSignal(int, str)  # generation, error message
+
+
+class SearchTask(QRunnable):
+    """Runs one type-ahead search off the UI thread"""
+
+    def __init__(self, generation, search_terms, inverted_index, documents):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.generation = generation
+        self.search_terms = search_terms
+        self.inverted_index = inverted_index
+        self.documents = documents
+        self.cancelled = False
+        self.signals = SearchSignals()
+
+    def run(self):
+        highlighted_results = []
+        try:
+            # search.py locks each read of the shared index, so searches run side by side and never hold up adds
+            if not self.cancelled:
+                results = search_documents(self.search_terms, self.inverted_index, self.documents)
+                if not self.cancelled:
+                    highlighted_results = rank_and_highlight(results, self.documents, scores)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+        finally:
+            # Always reported, even when cancelled, so the owner can release the task
+            self.signals.finished.emit(self.generation, highlighted_results)
+
+
+class DebouncedSearch(QObject):
+    """Type-ahead search of one field: debounced, run in the background, and only the latest query is delivered"""
+    results_ready = pyqtSignal(list)  # [(doc_id, highlighted content, score)]
+    search_failed = pyqtSignal(str)  # error message of the latest query
+
+    def __init__(self, inverted_index, documents, delay=SEARCH_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.inverted_index = inverted_index
+        self.documents = documents
+        self.generation = 0
+        self.pending_terms = ''
+        self.running_tasks = {}  # generation -> SearchTask, kept alive until the pool is done with it
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(delay)
+        self.debounce_timer.timeout.connect(self.start_search)
+
+    def request(self, search_terms):
+        """Search for the text once typing pauses, superseding any earlier query"""
+        self.cancel()
+        self.pending_terms = search_terms
+        self.debounce_timer.start()
+
+    def cancel(self):
+        """Drop the pending and the running query; their results will never be delivered"""
+        self.debounce_timer.stop()
+        self.generation += 1
+        for generation, task in list(self.running_tasks.items()):
+            task.cancelled = True
+            if search_pool.tryTake(task):
+                del self.running_tasks[generation]  # Never started, so it will never report back
+
+    def start_search(self):
+        task = SearchTask(self.generation, self.pending_terms, self.inverted_index, self.documents)
+        task.signals.finished.connect(self.on_search_finished)
+        task.signals.failed.connect(self.on_search_failed)
+        self.running_tasks[self.generation] = task
+        search_pool.start(task)
+
+    def on_search_finished(self, generation, highlighted_results):
+        task = self.running_tasks.pop(generation, None)
+        if task is None or task.cancelled or generation != self.generation:
+            return  # Superseded while it ran
+        self.results_ready.emit(highlighted_results)
+
+    def on_search_failed(self, generation, message):
+        if generation == self.generation:
+            self.search_failed.emit(message)
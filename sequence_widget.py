@@ -189,8 +189,7 @@ class SequenceEventWidget(QWidget):
     def check_and_add_to_documents(self, event_text):
         """Check if the event is new and add it to the dynamic documents"""
         global sequence_of_event_documents
-        if add_new_document(sequence_of_event_documents, event_text, SEQUENCE_FILE, "Sequence of Event"):
-            refresh_indices()
+        add_new_document(sequence_of_event_documents, event_text, SEQUENCE_FILE, "Sequence of Event")
 
     def get_sequence_text(self):
         """Get the complete sequence as formatted text"""
@@ -276,11 +275,12 @@ class SequenceEventDialog(QDialog):
 
         # Search in sequence documents
         results = search_documents(search_terms, sequence_of_event_inverted_index, sequence_of_event_documents)
-        highlighted_results = rank_and_highlight(results, search_terms, sequence_of_event_documents, scores)
+        highlighted_results = rank_and_highlight(results, sequence_of_event_documents, scores,
+                                                 top_k=10)  # Limit to top 10 results
 
         self.suggestions_list.clear()
         if highlighted_results:
-            for doc_id, content, score in highlighted_results[:10]:  # Limit to top 10 results
+            for doc_id, content, score in highlighted_results:
                 # Clean up the content (remove highlighting for display)
                 clean_content = content.replace(" *", " ").replace("* ", " ")
                 self.suggestions_list.addItem(f"ID: {doc_id} - {clean_content}")
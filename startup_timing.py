@@ -0,0 +1,71 @@
+import importlib
+import re
+import subprocess
+import sys
+import time
+
+# Cold start budget, from launching Python to the main window being shown
+STARTUP_TARGET_SECONDS = 3.0
+
+process_started = time.perf_counter()
+startup_stages = []  # (stage, seconds since start)
+import_timings = {}  # module -> seconds its first import took
+
+
+def timed_import(module_name):
+    """Import a module on first use of its feature, recording how long the first import took"""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_timings[module_name] = time.perf_counter() - started
+    print(f"⏱️ Loaded {module_name} in {import_timings[module_name] * 1000:.0f} ms")
+    return module
+
+
+def mark_startup_stage(stage):
+    """Record how long after launch a startup stage was reached"""
+    startup_stages.append((stage, time.perf_counter() - process_started))
+
+
+def print_startup_report():
+    """Print the time to each startup stage and the lazy imports made so far"""
+    print("⏱️ Startup timing:")
+    for stage, elapsed in startup_stages:
+        print(f"   {elapsed:7.3f}s  {stage}")
+    for module_name, elapsed in sorted(import_timings.items(), key=lambda item: item[1], reverse=True):
+        print(f"   {elapsed:7.3f}s  import {module_name} (on first use)")
+    if startup_stages and startup_stages[-1][1] > STARTUP_TARGET_SECONDS:
+        print(f"⚠️ Startup took {startup_stages[-1][1]:.2f}s, over the {STARTUP_TARGET_SECONDS:.1f}s target")
+
+
+def get_import_times(module_name):
+    """Import a module in a fresh interpreter with -X importtime; returns {module: cumulative seconds}"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                            capture_output=True, text=True)
+    import_times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+\s+\|\s+(\d+)\s+\|(\s*)(\S+)', line)
+        if match:
+            import_times[match.group(3)] = int(match.group(1)) / 1e6
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1])
+    return import_times
+
+
+def print_import_report(module_name='enhanced_rm_system', limit=25):
+    """Per-import cold start report of a module: the slowest top-level imports and the total against the target"""
+    import_times = get_import_times(module_name)
+    if not import_times:
+        print(f"❌ Could not time the imports of {module_name}")
+        return False
+
+    total = import_times.get(module_name, max(import_times.values()))
+    print(f"⏱️ Importing {module_name} took {total:.3f}s (target {STARTUP_TARGET_SECONDS:.1f}s for the whole startup)")
+    for name, elapsed in sorted(import_times.items(), key=lambda item: item[1], reverse=True)[:limit]:
+        print(f"   {elapsed:7.3f}s  {name}")
+    return total <= STARTUP_TARGET_SECONDS
+
+
+if __name__ == '__main__':
+    sys.exit(0 if print_import_report(*sys.argv[1:2]) else 1)
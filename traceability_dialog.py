@@ -147,43 +147,38 @@ class TraceabilityDialog(QDialog):
             self.preview_label.setText(preview_text)
             self.preview_label.setStyleSheet("color: #27ae60; font-weight: normal;")
 
-    def get_column_index(self, field_type):
-        """Get the column index for a given field type"""
-        column_mapping = {
-            "Risk Level": 14,  # RPN column
-            "Department": 2,
-            "Device": 3,
-            "Component": 4,
-            "Life Cycle": 5,
-            "Severity": 12,
-            "Probability": 13
+    def get_field_name(self, field_type):
+        """Get the Risk attribute for a given field type"""
+        field_mapping = {
+            "Risk Level": 'rpn',
+            "Department": 'department',
+            "Device": 'device_affected',
+            "Component": 'components',
+            "Life Cycle": 'lifecycle',
+            "Severity": 'severity',
+            "Probability": 'probability'
         }
-        return column_mapping.get(field_type, 0)
+        return field_mapping.get(field_type, 'date')
 
     def extract_data_for_traceability(self):
-        """Extract data from the table for traceability analysis"""
+        """Extract data from the risk store for traceability analysis"""
         root_type = self.root_combo.currentText()
         child_type = self.child_combo.currentText()
         
-        root_col = self.get_column_index(root_type)
-        child_col = self.get_column_index(child_type)
-        risk_no_col = 1  # Risk No. column
+        root_field = self.get_field_name(root_type)
+        child_field = self.get_field_name(child_type)
         
         data = defaultdict(list)
-        table = self.parent_window.table_widget
         
-        for row in range(table.rowCount()):
+        for risk in self.parent_window.risk_store:
             # Get root value
-            root_item = table.item(row, root_col)
-            root_value = root_item.text().strip() if root_item else "Unknown"
+            root_value = getattr(risk, root_field).strip() or "Unknown"
             
             # Get child value
-            child_item = table.item(row, child_col)
-            child_value = child_item.text().strip() if child_item else "Unknown"
+            child_value = getattr(risk, child_field).strip() or "Unknown"
             
             # Get risk number
-            risk_no_item = table.item(row, risk_no_col)
-            risk_no = risk_no_item.text().strip() if risk_no_item else "Unknown"
+            risk_no = risk.risk_no.strip() or "Unknown"
             
             # Handle multiple values (comma-separated)
             if child_type in ["Device", "Component"]:
@@ -95,8 +95,8 @@ class TraceabilityGraphWidget(QWidget):
             
         self.nodes.clear()
         
-        table_widget = self.parent_window.table_widget
-        if not table_widget:
+        risk_store = self.parent_window.risk_store
+        if risk_store is None:
             return
         
         # Create root node - "Risks"
@@ -112,18 +112,13 @@ class TraceabilityGraphWidget(QWidget):
         self.root_node.data = {'description': 'Main risks container'}
         self.nodes['root'] = self.root_node
         
-        # Group risks by component
+        # Group risks by component; the store is read once and each risk is passed down with its row
         component_groups = {}
-        for row in range(table_widget.rowCount()):
-            components = self.get_cell_text(table_widget, row, 4)
-            if not components:
-                components = "Unassigned"
-                
-            for component in components.split(','):
-                component = component.strip()
+        for row, risk in enumerate(risk_store):
+            for component in risk.component_list or ["Unassigned"]:
                 if component not in component_groups:
                     component_groups[component] = []
-                component_groups[component].append(row)
+                component_groups[component].append((row, risk))
         
         # Create component nodes (Level 1)
         comp_start_y = self.root_node.y + self.root_node.height + self.VERTICAL_SPACING
@@ -148,17 +143,15 @@ class TraceabilityGraphWidget(QWidget):
             self.root_node.add_child(comp_node)
             
             # Create sequence of events for each risk in this component
-            for risk_index, row in enumerate(risk_rows):
-                self.create_sequence_structure(row, comp_node, comp_x, comp_start_y, comp_index, risk_index)
+            for risk_index, (row, risk) in enumerate(risk_rows):
+                self.create_sequence_structure(row, risk, comp_node, comp_x, comp_start_y, comp_index, risk_index)
     
-    def create_sequence_structure(self, row, parent_comp, base_x, base_y, comp_index, risk_index):
+    def create_sequence_structure(self, row, risk, parent_comp, base_x, base_y, comp_index, risk_index):
         """Create the complete sequence structure for a risk"""
-        table_widget = self.parent_window.table_widget
-        
-        risk_no = self.get_cell_text(table_widget, row, 1)
-        rpn = self.get_cell_text(table_widget, row, 14)
-        severity = self.get_cell_text(table_widget, row, 12)
-        probability = self.get_cell_text(table_widget, row, 13)
+        risk_no = risk.risk_no
+        rpn = risk.rpn
+        severity = risk.severity
+        probability = risk.probability
         
         # Sequence of Events node (Level 2)
         seq_y = base_y + self.VERTICAL_SPACING + (risk_index * 400)  # More spacing between sequences
@@ -193,7 +186,7 @@ class TraceabilityGraphWidget(QWidget):
             self.NODE_WIDTH,
             self.NODE_HEIGHT
         )
-        hazard_node.data = self.get_hazardous_situations_data(row)
+        hazard_node.data = self.get_hazardous_situations_data(risk)
         self.nodes[hazard_node.id] = hazard_node
         sequence_node.add_child(hazard_node)
         
@@ -207,7 +200,7 @@ class TraceabilityGraphWidget(QWidget):
             self.NODE_WIDTH,
             self.NODE_HEIGHT
         )
-        harm_node.data = self.get_harm_description_data(row)
+        harm_node.data = self.get_harm_description_data(risk)
         self.nodes[harm_node.id] = harm_node
         sequence_node.add_child(harm_node)
         
@@ -276,38 +269,14 @@ class TraceabilityGraphWidget(QWidget):
         harm_node.update_children_visibility()
         control_node.update_children_visibility()
     
-    def get_hazardous_situations_data(self, row):
-        """Get hazardous situations data from the table"""
-        table_widget = self.parent_window.table_widget
-        hazardous_widget = table_widget.cellWidget(row, 8)
-        
-        if hazardous_widget and hasattr(hazardous_widget, 'get_situations_list'):
-            situations = hazardous_widget.get_situations_list()
-            return {'situations': situations, 'count': len(situations)}
-        
-        return {'situations': [], 'count': 0}
-    
-    def get_harm_description_data(self, row):
-        """Get harm description data from the table"""
-        table_widget = self.parent_window.table_widget
-        harm_widget = table_widget.cellWidget(row, 11)
-        
-        data = {'harms': [], 'count': 0, 'rpn_data': {}}
-        
-        if harm_widget and hasattr(harm_widget, 'get_harms_list'):
-            harms = harm_widget.get_harms_list()
-            data['harms'] = harms
-            data['count'] = len(harms)
-            
-            if hasattr(harm_widget, 'get_rpn_data'):
-                data['rpn_data'] = harm_widget.get_rpn_data()
-        
-        return data
+    def get_hazardous_situations_data(self, risk):
+        """Get the hazardous situations data of a risk"""
+        situations = risk.situations
+        return {'situations': situations, 'count': len(situations)}
     
-    def get_cell_text(self, table_widget, row, col):
-        """Safely get text from table cell"""
-        item = table_widget.item(row, col)
-        return item.text() if item else ""
+    def get_harm_description_data(self, risk):
+        """Get the harm description data of a risk"""
+        return {'harms': risk.harms, 'count': len(risk.harms), 'rpn_data': risk.rpn_data}
     
     def paintEvent(self, event):
         """Paint the organized graph"""
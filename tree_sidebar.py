@@ -130,9 +130,9 @@ class TreeSidebar(QWidget):
             
         self.tree_widget.clear()
         
-        # Get data from main table
-        table_widget = self.parent_window.table_widget
-        if not table_widget:
+        # Get data from the main risk store
+        risk_store = self.parent_window.risk_store
+        if risk_store is None:
             return
             
         # Create root node
@@ -145,15 +145,8 @@ class TreeSidebar(QWidget):
         component_groups = {}
         risk_stats = {'total': 0, 'high': 0, 'medium': 0, 'low': 0}
         
-        for row in range(table_widget.rowCount()):
-            # Get risk data
-            risk_no = self.get_cell_text(table_widget, row, 1)
-            department = self.get_cell_text(table_widget, row, 2)
-            components = self.get_cell_text(table_widget, row, 4)
-            rpn = self.get_cell_text(table_widget, row, 14)
-            
-            if not components:
-                components = "Unassigned"
+        for row, risk in enumerate(risk_store):
+            rpn = risk.rpn
                 
             # Update statistics
             risk_stats['total'] += 1
@@ -165,14 +158,14 @@ class TreeSidebar(QWidget):
                 risk_stats['low'] += 1
             
             # Group by component
-            for component in components.split(','):
-                component = component.strip()
+            for component in risk.component_list or ["Unassigned"]:
                 if component not in component_groups:
                     component_groups[component] = []
                 component_groups[component].append({
                     'row': row,
-                    'risk_no': risk_no,
-                    'department': department,
+                    'risk': risk,
+                    'risk_no': risk.risk_no,
+                    'department': risk.department,
                     'rpn': rpn
                 })
         
@@ -199,7 +192,7 @@ class TreeSidebar(QWidget):
                     risk_item.setForeground(0, risk_item.foreground(0).color().darker(150))
                 
                 # Add risk details
-                self.add_risk_details(risk_item, risk_data['row'])
+                self.add_risk_details(risk_item, risk_data['risk'])
         
         # Update statistics
         self.update_statistics(risk_stats)
@@ -207,76 +200,65 @@ class TreeSidebar(QWidget):
         # Expand root by default
         root_item.setExpanded(True)
         
-    def add_risk_details(self, parent_item, row):
+    def add_risk_details(self, parent_item, risk):
         """Add detailed risk information as child nodes"""
-        table_widget = self.parent_window.table_widget
-        
         # Hazardous Situations
-        hazardous_widget = table_widget.cellWidget(row, 8)
-        if hazardous_widget and hasattr(hazardous_widget, 'get_situations_list'):
-            situations = hazardous_widget.get_situations_list()
-            if situations:
-                hazardous_item = QTreeWidgetItem(parent_item)
-                hazardous_item.setText(0, f"⚠️ Hazardous Situations ({len(situations)})")
-                hazardous_item.setFont(0, QFont("Arial", 9, QFont.Bold))
-                
-                for i, situation in enumerate(situations):
-                    situation_item = QTreeWidgetItem(hazardous_item)
-                    situation_item.setText(0, f"S{i+1}: {situation[:50]}{'...' if len(situation) > 50 else ''}")
-                    situation_item.setToolTip(0, situation)
+        situations = risk.situations
+        if situations:
+            hazardous_item = QTreeWidgetItem(parent_item)
+            hazardous_item.setText(0, f"⚠️ Hazardous Situations ({len(situations)})")
+            hazardous_item.setFont(0, QFont("Arial", 9, QFont.Bold))
+            
+            for i, situation in enumerate(situations):
+                situation_item = QTreeWidgetItem(hazardous_item)
+                situation_item.setText(0, f"S{i+1}: {situation[:50]}{'...' if len(situation) > 50 else ''}")
+                situation_item.setToolTip(0, situation)
         
         # Harm Descriptions
-        harm_widget = table_widget.cellWidget(row, 11)
-        if harm_widget and hasattr(harm_widget, 'get_harms_list'):
-            harms = harm_widget.get_harms_list()
-            rpn_data = harm_widget.get_rpn_data() if hasattr(harm_widget, 'get_rpn_data') else {}
+        harms = risk.harms
+        rpn_data = risk.rpn_data
+        
+        if harms:
+            harm_item = QTreeWidgetItem(parent_item)
+            harm_item.setText(0, f"💔 Harm Descriptions ({len(harms)})")
+            harm_item.setFont(0, QFont("Arial", 9, QFont.Bold))
             
-            if harms:
-                harm_item = QTreeWidgetItem(parent_item)
-                harm_item.setText(0, f"💔 Harm Descriptions ({len(harms)})")
-                harm_item.setFont(0, QFont("Arial", 9, QFont.Bold))
+            for i, harm in enumerate(harms):
+                harm_detail_item = QTreeWidgetItem(harm_item)
+                harm_text = f"H{i+1}: {harm[:50]}{'...' if len(harm) > 50 else ''}"
+                
+                # Add RPN info if available
+                if harm in rpn_data:
+                    rpn_info = rpn_data[harm]
+                    harm_text += f" [S:{rpn_info.get('severity', '?')} P:{rpn_info.get('probability', '?')} RPN:{rpn_info.get('rpn', '?')}]"
                 
-                for i, harm in enumerate(harms):
-                    harm_detail_item = QTreeWidgetItem(harm_item)
-                    harm_text = f"H{i+1}: {harm[:50]}{'...' if len(harm) > 50 else ''}"
-                    
-                    # Add RPN info if available
-                    if harm in rpn_data:
-                        rpn_info = rpn_data[harm]
-                        harm_text += f" [S:{rpn_info.get('severity', '?')} P:{rpn_info.get('probability', '?')} RPN:{rpn_info.get('rpn', '?')}]"
-                    
-                    harm_detail_item.setText(0, harm_text)
-                    harm_detail_item.setToolTip(0, harm)
+                harm_detail_item.setText(0, harm_text)
+                harm_detail_item.setToolTip(0, harm)
         
         # Risk Controls
-        control_widget = table_widget.cellWidget(row, 15)
-        if control_widget:
-            control_item = QTreeWidgetItem(parent_item)
-            control_item.setText(0, "🛡️ Risk Controls")
-            control_item.setFont(0, QFont("Arial", 9, QFont.Bold))
-            
-            # Add placeholder for controls (you can expand this based on your control widget structure)
+        controls = risk.controls
+        control_item = QTreeWidgetItem(parent_item)
+        control_item.setText(0, f"🛡️ Risk Controls ({len(controls)})")
+        control_item.setFont(0, QFont("Arial", 9, QFont.Bold))
+        
+        for i, control in enumerate(controls):
             control_detail = QTreeWidgetItem(control_item)
-            control_detail.setText(0, "Control measures defined")
+            control_detail.setText(0, f"C{i+1}: {control.get('text', '')} [{control.get('type', '')}]")
+            for child in control.get('children', []):
+                child_item = QTreeWidgetItem(control_detail)
+                child_item.setText(0, f"{child.get('text', '')} [{child.get('type', '')}]")
         
         # Sequence of Events
-        sequence_widget = table_widget.cellWidget(row, 9)
-        if sequence_widget and hasattr(sequence_widget, 'get_sequence_list'):
-            sequences = sequence_widget.get_sequence_list()
-            if sequences:
-                sequence_item = QTreeWidgetItem(parent_item)
-                sequence_item.setText(0, f"🔄 Sequence of Events ({len(sequences)})")
-                sequence_item.setFont(0, QFont("Arial", 9, QFont.Bold))
-                
-                for i, sequence in enumerate(sequences):
-                    seq_item = QTreeWidgetItem(sequence_item)
-                    seq_item.setText(0, f"E{i+1}: {sequence[:50]}{'...' if len(sequence) > 50 else ''}")
-                    seq_item.setToolTip(0, sequence)
-    
-    def get_cell_text(self, table_widget, row, col):
-        """Safely get text from table cell"""
-        item = table_widget.item(row, col)
-        return item.text() if item else ""
+        sequences = risk.events
+        if sequences:
+            sequence_item = QTreeWidgetItem(parent_item)
+            sequence_item.setText(0, f"🔄 Sequence of Events ({len(sequences)})")
+            sequence_item.setFont(0, QFont("Arial", 9, QFont.Bold))
+            
+            for i, sequence in enumerate(sequences):
+                seq_item = QTreeWidgetItem(sequence_item)
+                seq_item.setText(0, f"E{i+1}: {sequence[:50]}{'...' if len(sequence) > 50 else ''}")
+                seq_item.setToolTip(0, sequence)
     
     def update_statistics(self, stats):
         """Update the statistics panel"""
@@ -328,10 +310,7 @@ class TreeSidebar(QWidget):
             # Highlight corresponding row in main table
             row = data.get('row')
             if row is not None and self.parent_window:
-                self.parent_window.table_widget.selectRow(row)
-                self.parent_window.table_widget.scrollToItem(
-                    self.parent_window.table_widget.item(row, 0)
-                )
+                self.parent_window.select_risk_row(row)
     
     def on_item_double_clicked(self, item, column):
         """Handle item double click"""
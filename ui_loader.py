@@ -0,0 +1,66 @@
+import glob
+import hashlib
+import importlib.util
+import os
+import sys
+from PyQt5.QtCore import PYQT_VERSION_STR
+
+# Generated form modules, named <ui name>_<hash of the .ui file and PyQt version>.py
+UI_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'UI')
+GENERATED_UI_DIR = os.path.join(UI_DIR, 'generated')
+
+
+def get_ui_hash(ui_file):
+    """Hash a .ui file together with the PyQt version whose uic generates its code"""
+    with open(ui_file, 'rb') as f:
+        content = f.read()
+    return hashlib.sha256(PYQT_VERSION_STR.encode('utf-8') + b':' + content).hexdigest()[:16]
+
+
+def get_ui_module_file(ui_file):
+    ui_name = os.path.splitext(os.path.basename(ui_file))[0]
+    return os.path.join(GENERATED_UI_DIR, f"{ui_name}_{get_ui_hash(ui_file)}.py")
+
+
+def compile_ui(ui_file):
+    """Generate the Python form module of a .ui file, unless the current one already exists"""
+    module_file = get_ui_module_file(ui_file)
+    if os.path.exists(module_file):
+        return module_file
+
+    from PyQt5 import uic
+    os.makedirs(GENERATED_UI_DIR, exist_ok=True)
+    temp_file = module_file + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        uic.compileUi(ui_file, f)
+    os.replace(temp_file, module_file)
+
+    # Drop the modules generated from earlier versions of the same .ui file
+    ui_name = os.path.splitext(os.path.basename(ui_file))[0]
+    for stale_file in glob.glob(os.path.join(GENERATED_UI_DIR, f"{ui_name}_*.py")):
+        if stale_file != module_file:
+            os.remove(stale_file)
+    print(f"🛠️ Compiled {ui_file} to {module_file}")
+    return module_file
+
+
+def load_ui_class(ui_file):
+    """Get the form class of a .ui file from its generated module, generating it first if the .ui changed
+
+    Drop-in for loadUiType(ui_file)[0], without parsing the XML on every launch.
+    """
+    module_file = compile_ui(ui_file)
+    module_name = os.path.splitext(os.path.basename(module_file))[0]
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[module_name] = module
+    return next(value for name, value in vars(module).items() if name.startswith('Ui_') and isinstance(value, type))
+
+
+if __name__ == '__main__':
+    # Build step: generate the form modules of every .ui file ahead of the first launch
+    for ui_file in sorted(glob.glob(os.path.join(UI_DIR, '*.ui'))):
+        compile_ui(ui_file)